@@ -0,0 +1,537 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Dict, List, Any, Tuple
+from aws_session import load_profile_credentials
+from aws_rate_limiter import DEFAULT_RATES, AdaptiveRateLimiter, AsyncRateLimitedClient, RateLimitExceeded
+from aws_pagination import PaginationStats, acollect_items, aiter_pages
+from aws_budget import AWSBudgetReader
+from aws_cost_explorer import AWSCostExplorer, MAX_GROUP_BY
+from aws_cost_cache import CostCache, caller_scope
+from aws_metrics import MetricsRegistry, get_registry
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.credentials import AioRefreshableCredentials
+    from aiobotocore.session import get_session as get_aio_session
+except ImportError:
+    AioConfig = None
+
+class AsyncSessionManager:
+    """
+    AWSSessionManager의 asyncio 버전입니다.
+
+    하나의 이벤트 루프에서 aiobotocore 클라이언트를 (역할, 서비스, 리전) 별로 한 번만 생성하여
+    공유하고, 모든 클라이언트의 동시 요청 수를 max_in_flight로 제한합니다. 스레드 대신 코루틴으로
+    동시성을 얻으므로 수천 개의 요청을 동시에 진행해도 메모리 사용량이 작습니다.
+
+    async with 블록 안에서 사용하거나, 사용이 끝나면 close()를 호출해야 합니다.
+    """
+
+    def __init__(
+        self,
+        region: str = 'ap-northeast-2',
+        profile_name: str = 'cmp-sts-user',
+        duration_seconds: int = 3600,
+        max_pool_connections: int = 100,
+        max_in_flight: int = 1000,
+        rates: Dict[str, float] = None,
+        metrics: MetricsRegistry = None
+    ):
+        """
+        Args:
+            region (str): 기본 리전
+            profile_name (str): .aws/credentials의 프로필 이름
+            duration_seconds (int): AssumeRole 자격 증명 유효 시간(초)
+            max_pool_connections (int): 클라이언트별 HTTP 연결 풀 크기
+            max_in_flight (int): 모든 클라이언트에 걸쳐 동시에 진행할 최대 요청 수
+            rates (Dict[str, float]): 서비스별 초당 요청 수 (DEFAULT_RATES를 덮어씀)
+            metrics (MetricsRegistry): 클라이언트 생성/API 호출 시간 통계 (기본값: 프로세스 공유 레지스트리)
+        """
+        if AioConfig is None:
+            raise ImportError("비동기 리더를 사용하려면 aiobotocore 패키지를 설치해야 합니다: pip install aiobotocore")
+
+        self._access_key_id, self._secret_access_key = load_profile_credentials(profile_name)
+
+        self.region = region
+        self.profile_name = profile_name
+        self.duration_seconds = duration_seconds
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.metrics = metrics or get_registry()
+
+        self._config = AioConfig(max_pool_connections=max_pool_connections, retries={'mode': 'standard', 'total_max_attempts': 1})
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._exit_stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+        self._sts_client = None
+        self._role_locks: Dict[Tuple[str, str, str], asyncio.Lock] = {}
+        self._sessions: Dict[Tuple[str, str, str], Any] = {}
+        self._clients: Dict[Tuple[str, str, str, str, str], AsyncRateLimitedClient] = {}
+        self._limiters: Dict[Tuple[str, str, str], AdaptiveRateLimiter] = {}
+        self.assume_role_count = 0
+
+    async def _create_client(self, session, service_name: str, region: str, **kwargs):
+        """클라이언트를 생성하고 close()에서 함께 닫히도록 등록합니다."""
+        with self.metrics.timed(f'{service_name}.create_client'):
+            return await self._exit_stack.enter_async_context(
+                session.create_client(service_name, region_name=region, config=self._config, **kwargs)
+            )
+
+    async def _get_sts_client(self) -> AsyncRateLimitedClient:
+        """프로필의 장기 자격 증명으로 STS 클라이언트를 생성합니다. (한 번만 생성)"""
+        async with self._lock:
+            if self._sts_client is None:
+                client = await self._create_client(
+                    get_aio_session(),
+                    'sts',
+                    self.region,
+                    aws_access_key_id=self._access_key_id,
+                    aws_secret_access_key=self._secret_access_key
+                )
+                self._sts_client = AsyncRateLimitedClient(client, self.get_rate_limiter('sts', self.region, self.profile_name), self._semaphore, self.metrics)
+            return self._sts_client
+
+    def get_rate_limiter(self, service_name: str, region: str, scope: str) -> AdaptiveRateLimiter:
+        """서비스/리전/범위(역할 ARN 등)별 속도 제한기를 반환합니다."""
+        key = (service_name, region, scope)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(service_name, self.rates.get(service_name, 10.0))
+            self._limiters[key] = limiter
+        return limiter
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """서비스별로 합산한 호출/재시도/스로틀링 횟수와 대기 시간을 반환합니다."""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for limiter in list(self._limiters.values()):
+            stats = limiter.stats()
+            entry = summary.setdefault(limiter.service_name, {'calls': 0, 'retries': 0, 'throttles': 0, 'errors': 0, 'wait_seconds': 0.0})
+            for key in entry:
+                entry[key] += stats[key]
+        for entry in summary.values():
+            entry['wait_seconds'] = round(entry['wait_seconds'], 3)
+        return summary
+
+    async def _assume_role(self, role_arn: str, session_name: str, external_id: str) -> Dict[str, str]:
+        """역할을 가정하고 AioRefreshableCredentials가 사용하는 형식으로 자격 증명을 반환합니다."""
+        sts_client = await self._get_sts_client()
+        assumed_role = await sts_client.assume_role(
+            RoleArn=role_arn,
+            RoleSessionName=session_name,
+            ExternalId=external_id,
+            DurationSeconds=self.duration_seconds
+        )
+        self.assume_role_count += 1
+
+        credentials = assumed_role['Credentials']
+        return {
+            'access_key': credentials['AccessKeyId'],
+            'secret_key': credentials['SecretAccessKey'],
+            'token': credentials['SessionToken'],
+            'expiry_time': credentials['Expiration'].isoformat()
+        }
+
+    def _role_lock(self, key: Tuple[str, str, str]) -> asyncio.Lock:
+        """역할별 잠금을 반환합니다. (서로 다른 역할의 AssumeRole은 동시에 진행)"""
+        lock = self._role_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._role_locks[key] = lock
+        return lock
+
+    async def _get_session_locked(self, key: Tuple[str, str, str]):
+        session = self._sessions.get(key)
+        if session is None:
+            role_arn, external_id, session_name = key
+            credentials = AioRefreshableCredentials.create_from_metadata(
+                metadata=await self._assume_role(role_arn, session_name, external_id),
+                refresh_using=lambda: self._assume_role(role_arn, session_name, external_id),
+                method='sts-assume-role'
+            )
+            session = get_aio_session()
+            session._credentials = credentials
+            self._sessions[key] = session
+        return session
+
+    async def get_client(self, service_name: str, role_arn: str, session_name: str, external_id: str, region: str = None) -> AsyncRateLimitedClient:
+        """가정한 역할로 생성한 aiobotocore 클라이언트를 반환합니다. (역할/서비스/리전 별로 캐시)"""
+        region = region or self.region
+        role_key = (role_arn, external_id, session_name)
+        key = (service_name, region) + role_key
+        async with self._role_lock(role_key):
+            client = self._clients.get(key)
+            if client is None:
+                session = await self._get_session_locked(role_key)
+                client = AsyncRateLimitedClient(
+                    await self._create_client(session, service_name, region),
+                    self.get_rate_limiter(service_name, region, role_arn),
+                    self._semaphore,
+                    self.metrics
+                )
+                self._clients[key] = client
+            return client
+
+    async def close(self) -> None:
+        """생성한 모든 클라이언트와 연결 풀을 닫습니다."""
+        await self._exit_stack.aclose()
+        self._sts_client = None
+        self._sessions.clear()
+        self._clients.clear()
+
+    async def __aenter__(self) -> 'AsyncSessionManager':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+class _AsyncReader:
+    """비동기 리더 공통 생성 로직입니다. 생성자 대신 await Reader.create(...)를 사용합니다."""
+
+    SERVICE_NAME = ''
+
+    def __init__(self, client: AsyncRateLimitedClient):
+        self.client = client
+        # API 작업별 페이지/항목 수 통계
+        self.pagination_stats = PaginationStats()
+
+    @classmethod
+    async def create(cls, role_arn: str, session_name: str, external_id: str, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user', session_manager: AsyncSessionManager = None, **kwargs):
+        # 세션 매니저는 이벤트 루프에 묶이므로 공유 레지스트리 대신 호출한 쪽에서 넘겨받음
+        if session_manager is None:
+            session_manager = AsyncSessionManager(region=region, profile_name=profile_name)
+
+        client = await session_manager.get_client(
+            cls.SERVICE_NAME,
+            role_arn=role_arn,
+            session_name=session_name,
+            external_id=external_id,
+            region=region
+        )
+        reader = cls(client, **kwargs)
+        # 직접 만든 세션 매니저도 호출한 쪽에서 닫을 수 있도록 보관
+        reader.session_manager = session_manager
+        return reader
+
+class AsyncAWSOrgReader(_AsyncReader):
+    """AWSOrgReader의 asyncio 버전입니다."""
+
+    SERVICE_NAME = 'organizations'
+
+    async def get_roots(self) -> List[Dict[str, Any]]:
+        """조직의 루트 정보를 가져옵니다."""
+        try:
+            return await acollect_items(self.client.list_roots, 'Roots', stats=self.pagination_stats)
+        except RateLimitExceeded:
+            # 스로틀링으로 데이터가 누락된 것을 빈 결과로 숨기지 않음
+            raise
+        except Exception as e:
+            print(f"루트 정보 조회 중 오류 발생: {str(e)}")
+            return []
+
+    async def get_ous_for_parent(self, parent_id: str) -> List[Dict[str, Any]]:
+        """특정 부모 ID에 속한 OU 목록을 가져옵니다."""
+        try:
+            return await acollect_items(
+                self.client.list_organizational_units_for_parent,
+                'OrganizationalUnits',
+                stats=self.pagination_stats,
+                ParentId=parent_id
+            )
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"OU 목록 조회 중 오류 발생: {str(e)}")
+            return []
+
+    async def get_accounts_for_parent(self, parent_id: str) -> List[Dict[str, Any]]:
+        """특정 부모 ID에 속한 계정 목록을 가져옵니다."""
+        try:
+            return await acollect_items(
+                self.client.list_accounts_for_parent,
+                'Accounts',
+                stats=self.pagination_stats,
+                ParentId=parent_id
+            )
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"계정 목록 조회 중 오류 발생: {str(e)}")
+            return []
+
+    async def get_org_structure(self) -> Dict[str, Any]:
+        """
+        전체 조직 구조를 레벨 단위(BFS)로 가져옵니다.
+
+        각 레벨에 속한 모든 부모의 OU/계정 목록을 동시에 조회합니다. (동시 요청 수는 세션 매니저와
+        속도 제한기가 제한)
+
+        Returns:
+            Dict[str, Any]: {'roots': [...], 'ous': {parent_id: [...]}, 'accounts': {parent_id: [...]}}
+        """
+        org_structure = {
+            'roots': [],
+            'ous': {},
+            'accounts': {}
+        }
+
+        roots = await self.get_roots()
+        org_structure['roots'] = roots
+
+        frontier = [root['Id'] for root in roots]
+        while frontier:
+            ous_list, accounts_list = await asyncio.gather(
+                asyncio.gather(*(self.get_ous_for_parent(parent_id) for parent_id in frontier)),
+                asyncio.gather(*(self.get_accounts_for_parent(parent_id) for parent_id in frontier))
+            )
+
+            next_frontier = []
+            for parent_id, ous, accounts in zip(frontier, ous_list, accounts_list):
+                org_structure['ous'][parent_id] = ous
+                org_structure['accounts'][parent_id] = accounts
+                next_frontier.extend(ou['Id'] for ou in ous)
+            frontier = next_frontier
+
+        return org_structure
+
+class AsyncAWSBudgetReader(_AsyncReader):
+    """AWSBudgetReader의 asyncio 버전입니다."""
+
+    SERVICE_NAME = 'budgets'
+
+    async def describe_budgets(self, account_id: str) -> List[Dict[str, Any]]:
+        """예산 목록을 조회합니다."""
+        try:
+            return await acollect_items(self.client.describe_budgets, 'Budgets', stats=self.pagination_stats, AccountId=account_id)
+        except RateLimitExceeded:
+            # 스로틀링으로 데이터가 누락된 것을 빈 결과로 숨기지 않음
+            raise
+        except Exception as e:
+            print(f"예산 목록 조회 중 오류 발생: {str(e)}")
+            return []
+
+    async def describe_budget(self, budget_name: str, account_id: str = None) -> Dict[str, Any]:
+        """특정 예산의 상세 정보를 조회합니다."""
+        try:
+            response = await self.client.describe_budget(**AWSBudgetReader._budget_params(budget_name, account_id))
+            return response.get('Budget', {})
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"예산 상세 정보 조회 중 오류 발생: {str(e)}")
+            return {}
+
+    async def get_budget_notifications(self, budget_name: str, account_id: str = None) -> List[Dict[str, Any]]:
+        """특정 예산의 알림 설정을 조회합니다."""
+        try:
+            return await acollect_items(
+                self.client.describe_notifications_for_budget,
+                'Notifications',
+                stats=self.pagination_stats,
+                **AWSBudgetReader._budget_params(budget_name, account_id)
+            )
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"예산 알림 설정 조회 중 오류 발생: {str(e)}")
+            return []
+
+    async def get_budget_actions(self, budget_name: str, account_id: str = None) -> List[Dict[str, Any]]:
+        """특정 예산의 액션을 조회합니다."""
+        try:
+            return await acollect_items(
+                self.client.describe_budget_actions_for_budget,
+                'Actions',
+                stats=self.pagination_stats,
+                **AWSBudgetReader._budget_params(budget_name, account_id)
+            )
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"예산 액션 조회 중 오류 발생: {str(e)}")
+            return []
+
+    async def get_complete_budget_info(self, budget_name: str, account_id: str = None) -> Dict[str, Any]:
+        """특정 예산의 모든 정보를 종합적으로 조회합니다. (세 API를 동시에 호출)"""
+        budget, notifications, actions = await asyncio.gather(
+            self.describe_budget(budget_name, account_id),
+            self.get_budget_notifications(budget_name, account_id),
+            self.get_budget_actions(budget_name, account_id)
+        )
+        return {
+            'budget': budget,
+            'notifications': notifications,
+            'actions': actions
+        }
+
+    async def get_all_budget_details(self, account_id: str, budgets: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        계정의 모든 예산을 알림 설정, 구독자, 액션과 함께 조회합니다.
+
+        AWSBudgetReader.get_all_budget_details와 같은 형식의 결과를 반환하며, 알림별 구독자는
+        모두 동시에 조회합니다.
+        """
+        async def list_budgets() -> List[Dict[str, Any]]:
+            if budgets is not None:
+                return budgets
+            return await acollect_items(self.client.describe_budgets, 'Budgets', stats=self.pagination_stats, AccountId=account_id)
+
+        budget_list, notification_entries, action_list = await asyncio.gather(
+            list_budgets(),
+            acollect_items(
+                self.client.describe_budget_notifications_for_account,
+                'BudgetNotificationsForAccount',
+                stats=self.pagination_stats,
+                AccountId=account_id
+            ),
+            acollect_items(
+                self.client.describe_budget_actions_for_account,
+                'Actions',
+                stats=self.pagination_stats,
+                AccountId=account_id
+            )
+        )
+
+        notifications_by_budget: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in notification_entries:
+            notifications_by_budget.setdefault(entry['BudgetName'], []).extend(entry.get('Notifications', []))
+
+        actions_by_budget: Dict[str, List[Dict[str, Any]]] = {}
+        for action in action_list:
+            actions_by_budget.setdefault(action['BudgetName'], []).append({
+                key: action[key] for key in ('ActionId', 'ActionType', 'ActionThreshold', 'NotificationType', 'ApprovalModel', 'Status') if key in action
+            })
+
+        records = []
+        pending = []
+        for budget in budget_list:
+            record = AWSBudgetReader._compact_budget(budget)
+            record['Notifications'] = []
+            for notification in notifications_by_budget.get(budget['BudgetName'], []):
+                record['Notifications'].append(dict(notification, Subscribers=[]))
+                pending.append((record['Notifications'][-1], acollect_items(
+                    self.client.describe_subscribers_for_notification,
+                    'Subscribers',
+                    stats=self.pagination_stats,
+                    AccountId=account_id,
+                    BudgetName=budget['BudgetName'],
+                    Notification=notification
+                )))
+            record['Actions'] = actions_by_budget.get(budget['BudgetName'], [])
+            records.append(record)
+
+        subscribers = await asyncio.gather(*(coroutine for _, coroutine in pending))
+        for (notification, _), items in zip(pending, subscribers):
+            notification['Subscribers'] = items
+
+        return records
+
+class AsyncAWSCostExplorer(_AsyncReader):
+    """AWSCostExplorer의 asyncio 버전입니다. 기간 분할/병합과 캐시는 동기 버전과 같습니다."""
+
+    SERVICE_NAME = 'ce'
+
+    def __init__(self, client: AsyncRateLimitedClient, cache: CostCache = None, cache_scope: str = None):
+        super().__init__(client)
+        if cache is not None and cache_scope is None:
+            raise ValueError("캐시를 사용하려면 cache_scope(caller_scope(role_arn, external_id))가 필요합니다.")
+        # 응답 캐시 (None이면 항상 API 호출, 항목은 Role ARN/External ID별로 분리)
+        self.cache = cache
+        self.cache_scope = cache_scope
+
+    @classmethod
+    async def create(cls, role_arn: str, session_name: str, external_id: str, *args, **kwargs):
+        kwargs.setdefault('cache_scope', caller_scope(role_arn, external_id))
+        return await super().create(role_arn, session_name, external_id, *args, **kwargs)
+
+    async def _fetch_cost_and_usage(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str,
+        metrics: List[str],
+        group_by: List[Dict[str, str]] = None,
+        filter: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """한 구간의 비용 데이터를 모든 페이지에 걸쳐 조회합니다. (구간 단위로 캐시)"""
+        params = AWSCostExplorer._cost_and_usage_params(start_date, end_date, granularity, metrics, group_by, filter)
+        if self.cache:
+            cached = self.cache.get(self.cache_scope, 'GetCostAndUsage', params)
+            if cached is not None:
+                return cached
+
+        pages = [page async for page in aiter_pages(
+            self.client.get_cost_and_usage,
+            result_key='ResultsByTime',
+            stats=self.pagination_stats,
+            input_token='NextPageToken',
+            output_token='NextPageToken',
+            **params
+        )]
+        response = AWSCostExplorer.merge_cost_pages(pages)
+
+        if self.cache:
+            self.cache.put(self.cache_scope, 'GetCostAndUsage', params, response)
+        return response
+
+    async def get_cost_and_usage(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'MONTHLY',
+        metrics: List[str] = ['UnblendedCost'],
+        group_by: List[Dict[str, str]] = None,
+        filter: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        AWS Cost Explorer API를 통해 비용 데이터를 조회합니다.
+
+        인자와 반환값은 AWSCostExplorer.get_cost_and_usage와 같으며, 나눈 구간을 모두 동시에 조회합니다.
+        """
+        try:
+            if group_by and len(group_by) > MAX_GROUP_BY:
+                raise ValueError(f"GroupBy는 최대 {MAX_GROUP_BY}개까지 지정할 수 있습니다.")
+
+            chunks = AWSCostExplorer.split_time_period(start_date, end_date, granularity, group_by)
+            responses = await asyncio.gather(*(
+                self._fetch_cost_and_usage(chunk_start, chunk_end, granularity, metrics, group_by, filter)
+                for chunk_start, chunk_end in chunks
+            ))
+            return AWSCostExplorer.stitch_cost_results(list(responses))
+
+        except Exception as e:
+            print(f"비용 데이터 조회 중 오류 발생: {str(e)}")
+            raise
+
+    async def get_cost_forecast(
+        self,
+        start_date: str,
+        end_date: str,
+        metric: str = 'UNBLENDED_COST',
+        granularity: str = 'MONTHLY',
+        filter: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """AWS Cost Explorer API를 통해 비용 예측 데이터를 조회합니다."""
+        try:
+            params = {
+                'TimePeriod': {
+                    'Start': start_date,
+                    'End': end_date
+                },
+                'Metric': metric,
+                'Granularity': granularity
+            }
+            if filter:
+                params['Filter'] = filter
+            if self.cache:
+                cached = self.cache.get(self.cache_scope, 'GetCostForecast', params)
+                if cached is not None:
+                    return cached
+
+            response = await self.client.get_cost_forecast(**params)
+
+            if self.cache:
+                self.cache.put(self.cache_scope, 'GetCostForecast', params, response)
+            return response
+
+        except Exception as e:
+            print(f"비용 예측 데이터 조회 중 오류 발생: {str(e)}")
+            raise
@@ -1,62 +1,103 @@
-import boto3
 import json
-from typing import Dict, List, Any
-import configparser
-import os
+from typing import Dict, List, Any, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from aws_session import AWSSessionManager, get_session_manager
+from aws_rate_limiter import RateLimitExceeded
+from aws_pagination import PaginationStats, iter_items
+from aws_records import Record, Budget, to_records
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, datetime):
             return obj.isoformat()
+        if isinstance(obj, Record):
+            return obj.to_dict()
         return super().default(obj)
 
 class AWSBudgetReader:
-    def __init__(self, role_arn: str, session_name: str, external_id: str, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user'):
-        # AWS 자격 증명 파일에서 프로필 읽기
-        config = configparser.ConfigParser()
-        credentials_path = os.path.join(os.getcwd(), '.aws', 'credentials')
-        
-        if not os.path.exists(credentials_path):
-            raise ValueError(f"자격 증명 파일을 찾을 수 없습니다: {credentials_path}")
-            
-        config.read(credentials_path)
-        
-        if profile_name not in config:
-            raise ValueError(f"프로필 '{profile_name}'을(를) .aws/credentials 파일에서 찾을 수 없습니다.")
-            
-        # STS 클라이언트 생성
-        sts_client = boto3.client(
-            'sts',
-            aws_access_key_id=config[profile_name]['aws_access_key_id'],
-            aws_secret_access_key=config[profile_name]['aws_secret_access_key'],
-            region_name=region
-        )
-        
-        # 역할 가정
-        assumed_role = sts_client.assume_role(
-            RoleArn=role_arn,
-            RoleSessionName=session_name,
-            ExternalId=external_id
+    def __init__(self, role_arn: str, session_name: str, external_id: str, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user', session_manager: AWSSessionManager = None):
+        # 세션 매니저와 클라이언트는 첫 API 호출 시점에 준비 (캐시 적중/인자 오류 시 boto3 import와 AssumeRole 생략)
+        self.session_manager = session_manager
+        self._profile_name = profile_name
+        self._client_kwargs = {
+            'role_arn': role_arn,
+            'session_name': session_name,
+            'external_id': external_id,
+            'region': region
+        }
+        self._client = None
+
+        # API 작업별 페이지/항목 수 통계
+        self.pagination_stats = PaginationStats()
+
+    @property
+    def client(self):
+        """캐시된 임시 자격 증명으로 만든 budgets 클라이언트 (처음 사용할 때 생성, 만료 전 자동 갱신)"""
+        if self._client is None:
+            # 세션 매니저를 지정하지 않으면 (region, profile) 별로 공유되는 매니저 사용
+            if self.session_manager is None:
+                self.session_manager = get_session_manager(region=self._client_kwargs['region'], profile_name=self._profile_name)
+            self._client = self.session_manager.get_client('budgets', **self._client_kwargs)
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    def iter_budgets(self, account_id: str) -> Iterator[Dict[str, Any]]:
+        """예산 목록을 페이지 단위로 가져오는 제너레이터입니다."""
+        return iter_items(
+            self.client.describe_budgets,
+            'Budgets',
+            stats=self.pagination_stats,
+            AccountId=account_id
         )
 
-        credentials = assumed_role['Credentials']
+    @staticmethod
+    def _budget_params(budget_name: str, account_id: str = None) -> Dict[str, str]:
+        """예산 단위 API 호출 파라미터를 구성합니다. (account_id가 없으면 생략)"""
+        params = {'BudgetName': budget_name}
+        if account_id:
+            params['AccountId'] = account_id
+        return params
+
+    def iter_budget_notifications(self, budget_name: str, account_id: str = None) -> Iterator[Dict[str, Any]]:
+        """특정 예산의 알림 설정을 페이지 단위로 가져오는 제너레이터입니다."""
+        return iter_items(
+            self.client.describe_notifications_for_budget,
+            'Notifications',
+            stats=self.pagination_stats,
+            **self._budget_params(budget_name, account_id)
+        )
 
-        # 임시 자격 증명으로 budgets 클라이언트 생성
-        self.client = boto3.client(
-            'budgets',
-            aws_access_key_id=credentials['AccessKeyId'],
-            aws_secret_access_key=credentials['SecretAccessKey'],
-            aws_session_token=credentials['SessionToken'],
-            region_name=region
+    def iter_budget_actions(self, budget_name: str, account_id: str = None) -> Iterator[Dict[str, Any]]:
+        """특정 예산의 액션을 페이지 단위로 가져오는 제너레이터입니다."""
+        return iter_items(
+            self.client.describe_budget_actions_for_budget,
+            'Actions',
+            stats=self.pagination_stats,
+            **self._budget_params(budget_name, account_id)
         )
 
-    def describe_budgets(self, account_id: str) -> List[Dict[str, Any]]:
-        """예산 목록을 조회합니다."""
+    def describe_budgets(self, account_id: str, compact: bool = False, fields: Iterable[str] = None, strict: bool = False) -> List[Dict[str, Any]]:
+        """
+        예산 목록을 조회합니다.
+
+        compact이면 응답 dict 대신 Budget 레코드(금액은 원본 문자열과 float 속성, 시각은 epoch 초)로 반환하며, fields를 지정하면
+        그 키만 남깁니다. (지정하면 compact 사용, 예: ['BudgetName', 'BudgetLimit', 'CalculatedSpend'])
+        strict이면 조회 오류를 빈 목록으로 바꾸지 않고 그대로 전파합니다.
+        """
         try:
-            response = self.client.describe_budgets(AccountId=account_id)
-            return response.get('Budgets', [])
+            if compact or fields is not None:
+                return to_records(Budget, self.iter_budgets(account_id), fields)
+            return list(self.iter_budgets(account_id))
+        except RateLimitExceeded:
+            # 스로틀링으로 데이터가 누락된 것을 빈 결과로 숨기지 않음
+            raise
         except Exception as e:
+            if strict:
+                raise
             print(f"예산 목록 조회 중 오류 발생: {str(e)}")
             return []
 
@@ -74,6 +115,8 @@ class AWSBudgetReader:
                 )
             
             return response.get('Budget', {})
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"예산 상세 정보 조회 중 오류 발생: {str(e)}")
             return {}
@@ -81,17 +124,9 @@ class AWSBudgetReader:
     def get_budget_notifications(self, budget_name: str, account_id: str = None) -> List[Dict[str, Any]]:
         """특정 예산의 알림 설정을 조회합니다."""
         try:
-            if account_id:
-                response = self.client.describe_notifications_for_budget(
-                    AccountId=account_id,
-                    BudgetName=budget_name
-                )
-            else:
-                response = self.client.describe_notifications_for_budget(
-                    BudgetName=budget_name
-                )
-            
-            return response.get('Notifications', [])
+            return list(self.iter_budget_notifications(budget_name, account_id))
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"예산 알림 설정 조회 중 오류 발생: {str(e)}")
             return []
@@ -99,17 +134,9 @@ class AWSBudgetReader:
     def get_budget_actions(self, budget_name: str, account_id: str = None) -> List[Dict[str, Any]]:
         """특정 예산의 액션을 조회합니다."""
         try:
-            if account_id:
-                response = self.client.describe_budget_actions_for_budget(
-                    AccountId=account_id,
-                    BudgetName=budget_name
-                )
-            else:
-                response = self.client.describe_budget_actions_for_budget(
-                    BudgetName=budget_name
-                )
-            
-            return response.get('Actions', [])
+            return list(self.iter_budget_actions(budget_name, account_id))
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"예산 액션 조회 중 오류 발생: {str(e)}")
             return []
@@ -131,4 +158,73 @@ class AWSBudgetReader:
         # 액션 정보
         budget_info['actions'] = self.get_budget_actions(budget_name, account_id)
 
-        return budget_info 
\ No newline at end of file
+        return budget_info
+
+    @staticmethod
+    def _compact_budget(budget: Dict[str, Any]) -> Dict[str, Any]:
+        """describe_budgets 항목에서 감사에 필요한 필드만 남깁니다."""
+        return {key: budget[key] for key in ('BudgetName', 'BudgetType', 'TimeUnit', 'TimePeriod', 'BudgetLimit', 'CalculatedSpend') if key in budget}
+
+    def get_all_budget_details(self, account_id: str, budgets: List[Dict[str, Any]] = None, max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        계정의 모든 예산을 알림 설정, 구독자, 액션과 함께 조회합니다.
+
+        describe_budgets 결과를 그대로 사용하여 예산별 describe_budget 호출을 생략하고, 알림 설정과
+        액션은 계정 단위 API로 한 번에 조회합니다. 알림별 구독자만 병렬로 조회합니다.
+
+        Args:
+            account_id (str): AWS 계정 ID
+            budgets (List[Dict[str, Any]]): 이미 조회한 describe_budgets 결과 (없으면 조회)
+            max_workers (int): 동시에 실행할 API 호출 수
+
+        Returns:
+            List[Dict[str, Any]]: 예산별 {'BudgetName', 'BudgetType', ..., 'Notifications': [{..., 'Subscribers': [...]}], 'Actions': [...]}
+        """
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            if budgets is None:
+                budgets_future = executor.submit(lambda: list(self.iter_budgets(account_id)))
+            notifications_future = executor.submit(lambda: list(iter_items(
+                self.client.describe_budget_notifications_for_account,
+                'BudgetNotificationsForAccount',
+                stats=self.pagination_stats,
+                AccountId=account_id
+            )))
+            actions_future = executor.submit(lambda: list(iter_items(
+                self.client.describe_budget_actions_for_account,
+                'Actions',
+                stats=self.pagination_stats,
+                AccountId=account_id
+            )))
+
+            notifications_by_budget: Dict[str, List[Dict[str, Any]]] = {}
+            for entry in notifications_future.result():
+                notifications_by_budget.setdefault(entry['BudgetName'], []).extend(entry.get('Notifications', []))
+
+            actions_by_budget: Dict[str, List[Dict[str, Any]]] = {}
+            for action in actions_future.result():
+                actions_by_budget.setdefault(action['BudgetName'], []).append({
+                    key: action[key] for key in ('ActionId', 'ActionType', 'ActionThreshold', 'NotificationType', 'ApprovalModel', 'Status') if key in action
+                })
+
+            records = []
+            subscriber_futures = []
+            for budget in (budgets if budgets is not None else budgets_future.result()):
+                record = self._compact_budget(budget)
+                record['Notifications'] = []
+                for notification in notifications_by_budget.get(budget['BudgetName'], []):
+                    record['Notifications'].append(dict(notification, Subscribers=[]))
+                    subscriber_futures.append((record['Notifications'][-1], executor.submit(lambda name=budget['BudgetName'], item=notification: list(iter_items(
+                        self.client.describe_subscribers_for_notification,
+                        'Subscribers',
+                        stats=self.pagination_stats,
+                        AccountId=account_id,
+                        BudgetName=name,
+                        Notification=item
+                    )))))
+                record['Actions'] = actions_by_budget.get(budget['BudgetName'], [])
+                records.append(record)
+
+            for notification, future in subscriber_futures:
+                notification['Subscribers'] = future.result()
+
+        return records
@@ -0,0 +1,260 @@
+import argparse
+import calendar
+import json
+import numpy as np
+from datetime import date, timedelta
+from typing import Dict, List, Any, Tuple
+from aws_cost_table import CostTable, daily_matrix
+
+class BudgetBurnAnalyzer:
+    """
+    예산과 일 단위 비용 시계열을 NumPy 배열로 모아 소진율과 이상치를 한 번에 계산합니다.
+
+    - 시계열(예: 계정 x 서비스)별: 이번 달 누적 비용, 최근 일평균 기준 월말 예상 비용,
+      직전 window일 대비 rolling z-score와 이상치
+    - 예산별: 소진율(%), 경과 일수 대비 소진 속도 편차, 월말 예상 비용/소진율, 상태(OK/AT_RISK/OVER)
+
+    계정/서비스별 반복문 없이 전체 시계열을 행렬 연산으로 처리합니다.
+    """
+
+    def __init__(self, as_of: date, window: int = 14, z_threshold: float = 3.0, recent_days: int = 7):
+        """
+        Args:
+            as_of (date): 평가 기준일 (이 날짜까지의 비용을 사용, 보통 어제)
+            window (int): rolling z-score 계산에 사용할 직전 일수
+            z_threshold (float): 이상치로 판단할 |z| 기준
+            recent_days (int): 월말 예상 비용 계산에 사용할 최근 일평균 일수
+        """
+        self.as_of = as_of
+        self.window = window
+        self.z_threshold = z_threshold
+        self.recent_days = recent_days
+
+        self.month_start = as_of.replace(day=1)
+        self.days_in_month = calendar.monthrange(as_of.year, as_of.month)[1]
+        self.days_elapsed = as_of.day
+
+    def rolling_zscores(self, values: np.ndarray) -> np.ndarray:
+        """
+        각 날짜의 값을 직전 window일의 평균/표준편차로 표준화합니다.
+
+        처음 window일과 표준편차가 0인 구간은 0입니다. 누적합으로 모든 시계열과 날짜를 한 번에 계산합니다.
+        """
+        n, length = values.shape
+        zscores = np.zeros((n, length), dtype=np.float64)
+        if length <= self.window:
+            return zscores
+
+        cumulative = np.zeros((n, length + 1), dtype=np.float64)
+        np.cumsum(values, axis=1, out=cumulative[:, 1:])
+        cumulative_squares = np.zeros((n, length + 1), dtype=np.float64)
+        np.cumsum(values * values, axis=1, out=cumulative_squares[:, 1:])
+
+        # t일의 직전 window일은 [t - window, t)
+        totals = cumulative[:, self.window:length] - cumulative[:, :length - self.window]
+        squares = cumulative_squares[:, self.window:length] - cumulative_squares[:, :length - self.window]
+        mean = totals / self.window
+        std = np.sqrt(np.maximum(squares / self.window - mean * mean, 0.0))
+        # 누적합의 반올림 오차로 생기는 아주 작은 표준편차는 0으로 취급
+        valid = std > 1e-9 * np.maximum(np.abs(mean), 1.0)
+        np.divide(values[:, self.window:] - mean, std, out=zscores[:, self.window:], where=valid)
+        return zscores
+
+    def score_series(self, labels: np.ndarray, periods: np.ndarray, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        시계열별 이번 달 누적/예상 비용과 z-score를 계산합니다.
+
+        Args:
+            labels (np.ndarray): 시계열 레이블 (n, 키 수), CostTable.series의 첫 번째 반환값
+            periods (np.ndarray): 기간 시작일 (정렬됨)
+            matrix (np.ndarray): 일 단위 비용 행렬 (n, 기간 수)
+
+        Returns:
+            Dict[str, np.ndarray]: labels, start, values, month_to_date, recent_daily, projected, zscores
+        """
+        # 이번 달 1일부터는 항상 포함하여 월초 이후 비용이 없는 날도 0으로 채움
+        start, values = daily_matrix(periods, matrix, self.as_of, start=self.month_start)
+        month_offset = (self.month_start - start).days
+        recent = min(self.recent_days, self.days_elapsed)
+
+        month_to_date = values[:, month_offset:].sum(axis=1)
+        recent_daily = values[:, -recent:].mean(axis=1) if values.shape[1] else np.zeros(len(values))
+        projected = month_to_date + recent_daily * (self.days_in_month - self.days_elapsed)
+
+        return {
+            'labels': labels,
+            'start': start,
+            'values': values,
+            'month_to_date': month_to_date,
+            'recent_daily': recent_daily,
+            'projected': projected,
+            'zscores': self.rolling_zscores(values)
+        }
+
+    def evaluate_budgets(self, budgets_by_account: Dict[str, List[Dict[str, Any]]], scores: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """
+        MONTHLY COST 예산의 소진율과 월말 예상치를 계산합니다.
+
+        실제 비용은 예산의 CalculatedSpend.ActualSpend를 사용하고, 남은 기간의 비용은 계정의 최근
+        일평균에 (예산 실제 비용 / 계정 이번 달 비용) 비율을 곱해 추정합니다. (필터가 있는 예산 보정)
+        계정의 비용 시계열이 없으면 이번 달 일평균으로 추정합니다.
+        """
+        account_ids, account_index = np.unique(scores['labels'][:, 0].astype(str), return_inverse=True) if len(scores['labels']) else (np.array([], dtype=str), np.array([], dtype=np.int64))
+        account_mtd = np.bincount(account_index, weights=scores['month_to_date'], minlength=len(account_ids))
+        account_recent = np.bincount(account_index, weights=scores['recent_daily'], minlength=len(account_ids))
+        position = {account_id: index for index, account_id in enumerate(account_ids.tolist())}
+
+        selected = []
+        for account_id, budgets in budgets_by_account.items():
+            for budget in budgets:
+                if budget.get('TimeUnit') == 'MONTHLY' and budget.get('BudgetType', 'COST') == 'COST' and 'BudgetLimit' in budget:
+                    selected.append((account_id, budget))
+        if not selected:
+            return []
+
+        limit = np.array([float(budget['BudgetLimit']['Amount']) for _, budget in selected], dtype=np.float64)
+        actual = np.array([float(budget.get('CalculatedSpend', {}).get('ActualSpend', {}).get('Amount', 'nan')) for _, budget in selected], dtype=np.float64)
+        aws_forecast = np.array([float(budget.get('CalculatedSpend', {}).get('ForecastedSpend', {}).get('Amount', 'nan')) for _, budget in selected], dtype=np.float64)
+        index = np.array([position.get(account_id, -1) for account_id, _ in selected], dtype=np.int64)
+        has_series = index >= 0
+        safe_index = np.where(has_series, index, 0)
+
+        # ActualSpend가 없으면 계정의 이번 달 비용을 사용
+        mtd = np.where(has_series, account_mtd[safe_index] if len(account_mtd) else 0.0, np.nan)
+        actual = np.where(np.isnan(actual), mtd, actual)
+
+        remaining = self.days_in_month - self.days_elapsed
+        share = np.divide(actual, mtd, out=np.ones_like(actual), where=has_series & (mtd > 0))
+        recent_daily = np.where(has_series, (account_recent[safe_index] if len(account_recent) else 0.0) * share, actual / self.days_elapsed)
+        projected = actual + recent_daily * remaining
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_consumed = np.where(limit > 0, actual / limit * 100, np.nan)
+            projected_percent = np.where(limit > 0, projected / limit * 100, np.nan)
+        expected_percent = self.days_elapsed / self.days_in_month * 100
+        # 0보다 크면 경과 일수보다 빠르게 소진 중 (예: 0.5 = 50% 빠름)
+        burn_rate_deviation = percent_consumed / expected_percent - 1
+        status = np.where(actual > limit, 'OVER', np.where(projected > limit, 'AT_RISK', 'OK'))
+
+        results = []
+        for i, (account_id, budget) in enumerate(selected):
+            results.append({
+                'account_id': account_id,
+                'budget_name': budget.get('BudgetName'),
+                'limit': float(limit[i]),
+                'actual': float(actual[i]),
+                'projected': round(float(projected[i]), 4),
+                'aws_forecast': None if np.isnan(aws_forecast[i]) else float(aws_forecast[i]),
+                'percent_consumed': round(float(percent_consumed[i]), 2),
+                'projected_percent': round(float(projected_percent[i]), 2),
+                'expected_percent': round(expected_percent, 2),
+                'burn_rate_deviation': round(float(burn_rate_deviation[i]), 4),
+                'status': str(status[i])
+            })
+        return results
+
+    def find_anomalies(self, scores: Dict[str, np.ndarray], keys: List[str]) -> List[Dict[str, Any]]:
+        """|z|가 z_threshold를 넘는 (시계열, 날짜)를 |z| 내림차순으로 반환합니다."""
+        zscores = scores['zscores']
+        rows, cols = np.nonzero(np.abs(zscores) > self.z_threshold)
+        order = np.argsort(-np.abs(zscores[rows, cols]), kind='stable')
+        start = scores['start'].toordinal()
+
+        anomalies = []
+        for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+            record = dict(zip(keys, scores['labels'][row].tolist()))
+            record['date'] = date.fromordinal(start + col).isoformat()
+            record['amount'] = round(float(scores['values'][row, col]), 4)
+            record['zscore'] = round(float(zscores[row, col]), 2)
+            anomalies.append(record)
+        return anomalies
+
+    def analyze(
+        self,
+        table: CostTable,
+        budgets_by_account: Dict[str, List[Dict[str, Any]]],
+        keys: List[str] = ('account_id', 'SERVICE'),
+        metric: str = 'UnblendedCost'
+    ) -> Dict[str, Any]:
+        """
+        CostTable의 일 단위 비용과 계정별 예산을 평가합니다.
+
+        Args:
+            table (CostTable): DAILY 비용 테이블 (keys 컬럼 포함, 첫 번째 키는 계정 ID)
+            budgets_by_account (Dict[str, List[Dict[str, Any]]]): 계정 ID별 describe_budgets 결과
+            keys (List[str]): 시계열을 구분할 컬럼 (첫 번째는 계정 ID 컬럼)
+            metric (str): 사용할 메트릭
+
+        Returns:
+            Dict[str, Any]: {'as_of', 'summary', 'budgets': [...], 'series': [...], 'anomalies': [...]}
+        """
+        keys = list(keys)
+        scores = self.score_series(*table.series(keys, metric))
+        budgets = self.evaluate_budgets(budgets_by_account, scores)
+
+        latest = scores['zscores'][:, -1] if scores['zscores'].shape[1] else np.zeros(len(scores['labels']))
+        series = [
+            dict(zip(keys, label), month_to_date=round(mtd, 4), projected=round(projected, 4), latest_zscore=round(z, 2))
+            for label, mtd, projected, z in zip(scores['labels'].tolist(), scores['month_to_date'].tolist(), scores['projected'].tolist(), latest.tolist())
+        ]
+        anomalies = self.find_anomalies(scores, keys)
+
+        return {
+            'as_of': self.as_of.isoformat(),
+            'summary': {
+                'series': len(series),
+                'budgets': len(budgets),
+                'over': sum(1 for budget in budgets if budget['status'] == 'OVER'),
+                'at_risk': sum(1 for budget in budgets if budget['status'] == 'AT_RISK'),
+                'anomalies': len(anomalies)
+            },
+            'budgets': budgets,
+            'series': series,
+            'anomalies': anomalies
+        }
+
+def load_fanout_result(result: Dict[str, Any]) -> Tuple[CostTable, Dict[str, List[Dict[str, Any]]]]:
+    """aws_fanout.py 결과에서 계정별 비용 테이블(account_id 컬럼 포함)과 계정별 예산 목록을 만듭니다."""
+    accounts = [account for account in result.get('accounts', []) if 'cost' in account]
+    table = CostTable.from_responses(
+        [account['cost'] for account in accounts],
+        [{'account_id': account['account_id']} for account in accounts]
+    )
+    budgets = {account['account_id']: account.get('budgets', []) for account in result.get('accounts', [])}
+    return table, budgets
+
+def main():
+    parser = argparse.ArgumentParser(description='계정별 예산 소진율과 서비스별 비용 이상치를 평가하는 스크립트')
+    parser.add_argument('--input', required=True, help='aws_fanout.py 결과 JSON 파일 (--granularity DAILY로 수집, 비용 그룹화 기준 SERVICE)')
+    parser.add_argument('--as-of', default=(date.today() - timedelta(days=1)).isoformat(), help='평가 기준일 (YYYY-MM-DD, 기본값: 어제)')
+    parser.add_argument('--window', type=int, default=14, help='rolling z-score 계산 기간(일) (기본값: 14)')
+    parser.add_argument('--z-threshold', type=float, default=3.0, help='이상치로 판단할 |z| 기준 (기본값: 3.0)')
+    parser.add_argument('--metric', default='UnblendedCost', help='사용할 비용 메트릭 (기본값: UnblendedCost)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로 (지정하지 않으면 요약만 출력)')
+
+    args = parser.parse_args()
+
+    try:
+        with open(args.input, encoding='utf-8') as f:
+            table, budgets = load_fanout_result(json.load(f))
+
+        analyzer = BudgetBurnAnalyzer(date.fromisoformat(args.as_of), window=args.window, z_threshold=args.z_threshold)
+        result = analyzer.analyze(table, budgets, metric=args.metric)
+
+        summary = result['summary']
+        print(f"시계열 {summary['series']}개, 예산 {summary['budgets']}개 (초과 {summary['over']}개, 초과 예상 {summary['at_risk']}개), 이상치 {summary['anomalies']}개")
+        for budget in result['budgets']:
+            if budget['status'] != 'OK':
+                print(f"- [{budget['status']}] {budget['account_id']} {budget['budget_name']}: {budget['percent_consumed']}% 소진, 월말 예상 {budget['projected_percent']}%")
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            print(f"결과가 {args.output}에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join('.cache', 'ce_cache.sqlite3')
+
+def caller_scope(role_arn: str, external_id: str) -> str:
+    """캐시 항목을 호출자별로 나누는 식별자 (Role ARN과 External ID가 모두 같아야 같은 항목을 공유)"""
+    return json.dumps([role_arn, external_id], separators=(',', ':'))
+
+class CostCache:
+    """
+    Cost Explorer 응답을 SQLite 파일에 캐시합니다.
+
+    - 키: 호출자 식별자(caller_scope), 작업 이름, 정규화한 요청 파라미터의 SHA-256 해시
+      (다른 Role/External ID로 조회한 응답은 공유하지 않음)
+    - 확정된 과거 기간(이번 달 이전에 끝나는 기간)은 만료 없이 보관
+    - 이번 달이 포함된 기간과 예측(forecast)은 TTL 후 만료
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제(LRU)
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: int = 3600,
+        forecast_ttl_seconds: int = 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        finalize_grace_days: int = 3,
+        refresh: bool = False
+    ):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            ttl_seconds (int): 확정되지 않은 기간의 비용 데이터 보관 시간(초)
+            forecast_ttl_seconds (int): 예측 데이터 보관 시간(초)
+            max_bytes (int): 캐시 최대 크기(바이트)
+            finalize_grace_days (int): 월이 바뀐 뒤 지난달 데이터를 확정으로 간주하기까지의 일수
+            refresh (bool): True이면 캐시를 읽지 않고 항상 새로 조회한 결과로 덮어씀
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.forecast_ttl_seconds = forecast_ttl_seconds
+        self.max_bytes = max_bytes
+        self.finalize_grace_days = finalize_grace_days
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, operation TEXT NOT NULL, body TEXT NOT NULL, size INTEGER NOT NULL, '
+            'created_at REAL NOT NULL, expires_at REAL, last_access REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(scope: str, operation: str, params: Dict[str, Any]) -> str:
+        """호출자 식별자, 작업 이름, 정규화한 파라미터로 캐시 키를 만듭니다."""
+        normalized = dict(params)
+        if 'Metrics' in normalized:
+            normalized['Metrics'] = sorted(normalized['Metrics'])
+        payload = json.dumps({'scope': scope, 'operation': operation, 'params': normalized}, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def is_finalized(self, end_date: str, today: date = None) -> bool:
+        """기간 종료일(배타적)이 확정된 달에 속하는지 여부를 반환합니다."""
+        today = today or datetime.now(timezone.utc).date()
+        month_start = today.replace(day=1)
+        if (today - month_start).days < self.finalize_grace_days:
+            # 월초에는 지난달 데이터도 아직 보정될 수 있으므로 지지난달까지만 확정으로 간주
+            month_start = (month_start - timedelta(days=1)).replace(day=1)
+        return date.fromisoformat(end_date[:10]) <= month_start
+
+    def _expires_at(self, operation: str, params: Dict[str, Any], now: float) -> Optional[float]:
+        if operation == 'GetCostForecast':
+            return now + self.forecast_ttl_seconds
+        if self.is_finalized(params['TimePeriod']['End']):
+            return None
+        return now + self.ttl_seconds
+
+    def get(self, scope: str, operation: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """scope(caller_scope)로 캐시된 응답을 반환합니다. 없거나 만료되었거나 refresh 모드이면 None을 반환합니다."""
+        if self.refresh:
+            self.misses += 1
+            return None
+
+        key = self.make_key(scope, operation, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT body, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, scope: str, operation: str, params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """응답을 scope(caller_scope) 항목으로 캐시에 저장하고 필요하면 LRU 순서로 오래된 항목을 삭제합니다."""
+        body = json.dumps(
+            {key: value for key, value in response.items() if key != 'ResponseMetadata'},
+            ensure_ascii=False,
+            separators=(',', ':'),
+            default=str
+        )
+        key = self.make_key(scope, operation, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, operation, body, size, created_at, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, operation, body, len(body), now, self._expires_at(operation, params, now), now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute('DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        """모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,19 @@
-import boto3
-import configparser
-import os
-from typing import Dict, Any, List
+import argparse
+from typing import Dict, Any, List, Iterable, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
+from aws_session import AWSSessionManager, get_session_manager
+from aws_pagination import PaginationStats, iter_pages
+from aws_cost_cache import CostCache, DEFAULT_CACHE_PATH, caller_scope
+from aws_metrics import get_registry
+
+DESCRIPTION = 'AWS Cost Explorer 데이터를 조회하는 스크립트'
+
+# HOURLY 조회는 한 번에 최대 14일까지 가능
+HOURLY_MAX_DAYS = 14
+# GroupBy는 최대 2개까지 지정 가능
+MAX_GROUP_BY = 2
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -12,81 +22,278 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 class AWSCostExplorer:
-    def __init__(self, role_arn: str, session_name: str, external_id: str, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user'):
-        # AWS 자격 증명 파일에서 프로필 읽기
-        config = configparser.ConfigParser()
-        credentials_path = os.path.join(os.getcwd(), '.aws', 'credentials')
-        
-        if not os.path.exists(credentials_path):
-            raise ValueError(f"자격 증명 파일을 찾을 수 없습니다: {credentials_path}")
-            
-        config.read(credentials_path)
-        
-        if profile_name not in config:
-            raise ValueError(f"프로필 '{profile_name}'을(를) .aws/credentials 파일에서 찾을 수 없습니다.")
-            
-        # STS 클라이언트 생성
-        sts_client = boto3.client(
-            'sts',
-            aws_access_key_id=config[profile_name]['aws_access_key_id'],
-            aws_secret_access_key=config[profile_name]['aws_secret_access_key'],
-            region_name=region
-        )
-        
-        # 역할 가정
-        assumed_role = sts_client.assume_role(
-            RoleArn=role_arn,
-            RoleSessionName=session_name,
-            ExternalId=external_id
-        )
+    def __init__(self, role_arn: str, session_name: str, external_id: str, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user', session_manager: AWSSessionManager = None, cache: CostCache = None):
+        # 세션 매니저와 클라이언트는 첫 API 호출 시점에 준비 (캐시 적중/인자 오류 시 boto3 import와 AssumeRole 생략)
+        self.session_manager = session_manager
+        self._profile_name = profile_name
+        self._client_kwargs = {
+            'role_arn': role_arn,
+            'session_name': session_name,
+            'external_id': external_id,
+            'region': region
+        }
+        self._client = None
+
+        # API 작업별 페이지/항목 수 통계
+        self.pagination_stats = PaginationStats()
+
+        # 응답 캐시 (None이면 항상 API 호출, 항목은 Role ARN/External ID별로 분리)
+        self.cache = cache
+        self.cache_scope = caller_scope(role_arn, external_id)
+
+    @property
+    def client(self):
+        """캐시된 임시 자격 증명으로 만든 cost explorer 클라이언트 (처음 사용할 때 생성, 만료 전 자동 갱신)"""
+        if self._client is None:
+            # 세션 매니저를 지정하지 않으면 (region, profile) 별로 공유되는 매니저 사용
+            if self.session_manager is None:
+                self.session_manager = get_session_manager(region=self._client_kwargs['region'], profile_name=self._profile_name)
+            self._client = self.session_manager.get_client('ce', **self._client_kwargs)
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    @staticmethod
+    def _cost_and_usage_params(
+        start_date: str,
+        end_date: str,
+        granularity: str,
+        metrics: List[str],
+        group_by: List[Dict[str, str]] = None,
+        filter: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        params = {
+            'TimePeriod': {
+                'Start': start_date,
+                'End': end_date
+            },
+            'Granularity': granularity,
+            'Metrics': metrics
+        }
 
-        credentials = assumed_role['Credentials']
+        if group_by:
+            params['GroupBy'] = group_by
+        if filter:
+            params['Filter'] = filter
+
+        return params
+
+    def iter_cost_and_usage_pages(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'MONTHLY',
+        metrics: List[str] = ['UnblendedCost'],
+        group_by: List[Dict[str, str]] = None,
+        filter: Dict[str, Any] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        비용 데이터를 NextPageToken 기준으로 페이지 단위로 가져오는 제너레이터입니다.
 
-        # 임시 자격 증명으로 cost explorer 클라이언트 생성
-        self.client = boto3.client(
-            'ce',
-            aws_access_key_id=credentials['AccessKeyId'],
-            aws_secret_access_key=credentials['SecretAccessKey'],
-            aws_session_token=credentials['SessionToken'],
-            region_name=region
+        인자는 get_cost_and_usage와 동일하며, 각 페이지의 원본 응답을 그대로 반환합니다.
+        """
+        params = self._cost_and_usage_params(start_date, end_date, granularity, metrics, group_by, filter)
+        return iter_pages(
+            self.client.get_cost_and_usage,
+            result_key='ResultsByTime',
+            stats=self.pagination_stats,
+            input_token='NextPageToken',
+            output_token='NextPageToken',
+            **params
         )
 
-    def get_cost_and_usage(
+    @staticmethod
+    def merge_cost_pages(pages: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        get_cost_and_usage 페이지 응답들을 하나의 응답으로 합칩니다.
+
+        페이지 경계에서 같은 기간(TimePeriod)이 나뉘어 반환된 경우 Groups를 이어 붙입니다.
+        """
+        merged: Dict[str, Any] = {}
+        for page in pages:
+            if not merged:
+                merged = {key: value for key, value in page.items() if key != 'NextPageToken'}
+                merged['ResultsByTime'] = list(page.get('ResultsByTime', []))
+                merged['DimensionValueAttributes'] = list(page.get('DimensionValueAttributes', []))
+                continue
+
+            results = page.get('ResultsByTime', [])
+            if results and merged['ResultsByTime'] and results[0]['TimePeriod'] == merged['ResultsByTime'][-1]['TimePeriod']:
+                last = merged['ResultsByTime'][-1]
+                last['Groups'] = last.get('Groups', []) + results[0].get('Groups', [])
+                results = results[1:]
+            merged['ResultsByTime'].extend(results)
+            merged['DimensionValueAttributes'].extend(page.get('DimensionValueAttributes', []))
+
+        return merged
+
+    @staticmethod
+    def split_time_period(start_date: str, end_date: str, granularity: str, group_by: List[Dict[str, str]] = None) -> List[Tuple[str, str]]:
+        """
+        조회 기간을 API가 허용하는 구간으로 나눕니다.
+
+        - HOURLY: 14일 단위
+        - DAILY + GroupBy: 달력 월 단위 (응답이 커서 여러 페이지로 나뉘는 경우를 병렬 조회)
+        - 그 외: 나누지 않음
+
+        입력이 'YYYY-MM-DDThh:mm:ssZ' 형식이면 같은 형식으로 반환합니다.
+        """
+        hourly_format = 'T' in start_date
+        fmt = '%Y-%m-%dT%H:%M:%SZ' if hourly_format else '%Y-%m-%d'
+        start = datetime.strptime(start_date, fmt)
+        end = datetime.strptime(end_date, fmt)
+
+        if granularity == 'HOURLY':
+            next_boundary = lambda current: current + timedelta(days=HOURLY_MAX_DAYS)
+        elif granularity == 'DAILY' and group_by:
+            next_boundary = lambda current: (current.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0, second=0)
+        else:
+            return [(start_date, end_date)]
+
+        chunks = []
+        current = start
+        while current < end:
+            chunk_end = min(next_boundary(current), end)
+            chunks.append((current.strftime(fmt), chunk_end.strftime(fmt)))
+            current = chunk_end
+        return chunks or [(start_date, end_date)]
+
+    @staticmethod
+    def stitch_cost_results(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        구간별 응답을 시간 순서대로 이어 붙여 한 번의 호출 결과와 같은 형태로 만듭니다.
+
+        겹치는 기간(TimePeriod)과 중복된 DimensionValueAttributes는 한 번만 포함합니다.
+        """
+        if len(responses) == 1:
+            return responses[0]
+
+        stitched = {key: value for key, value in responses[0].items() if key != 'ResponseMetadata'}
+        stitched['ResultsByTime'] = []
+        stitched['DimensionValueAttributes'] = []
+        seen_periods = set()
+        seen_values = set()
+        for response in responses:
+            for result in response.get('ResultsByTime', []):
+                period = (result['TimePeriod']['Start'], result['TimePeriod']['End'])
+                if period in seen_periods:
+                    continue
+                seen_periods.add(period)
+                stitched['ResultsByTime'].append(result)
+            for attribute in response.get('DimensionValueAttributes', []):
+                if attribute.get('Value') in seen_values:
+                    continue
+                seen_values.add(attribute.get('Value'))
+                stitched['DimensionValueAttributes'].append(attribute)
+
+        stitched['ResultsByTime'].sort(key=lambda result: result['TimePeriod']['Start'])
+        return stitched
+
+    @staticmethod
+    def iter_result_rows(response: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """get_cost_and_usage 응답(또는 페이지)을 기간/그룹 키 단위의 행으로 펼칩니다."""
+        for result in response.get('ResultsByTime', []):
+            period = result['TimePeriod']
+            groups = result.get('Groups') or [{'Keys': [], 'Metrics': result.get('Total', {})}]
+            for group in groups:
+                yield {
+                    'period_start': period['Start'],
+                    'period_end': period['End'],
+                    'group_keys': '|'.join(group.get('Keys', [])),
+                    'metrics': group.get('Metrics', {}),
+                    'estimated': result.get('Estimated', False)
+                }
+
+    def iter_cost_and_usage_rows(
         self,
         start_date: str,
         end_date: str,
         granularity: str = 'MONTHLY',
         metrics: List[str] = ['UnblendedCost'],
         group_by: List[Dict[str, str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        비용 데이터를 기간/그룹 키 단위의 행으로 페이지가 도착하는 즉시 반환하는 제너레이터입니다.
+
+        기간은 get_cost_and_usage와 같은 방식으로 나누어 순서대로 조회하며, 캐시에 있는 구간은
+        캐시에서 읽습니다. 스트리밍 결과는 캐시에 저장하지 않습니다.
+        """
+        for chunk_start, chunk_end in self.split_time_period(start_date, end_date, granularity, group_by):
+            cached = None
+            if self.cache:
+                params = self._cost_and_usage_params(chunk_start, chunk_end, granularity, metrics, group_by)
+                cached = self.cache.get(self.cache_scope, 'GetCostAndUsage', params)
+            pages = [cached] if cached is not None else self.iter_cost_and_usage_pages(chunk_start, chunk_end, granularity, metrics, group_by)
+            for page in pages:
+                yield from self.iter_result_rows(page)
+
+    def _fetch_cost_and_usage(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str,
+        metrics: List[str],
+        group_by: List[Dict[str, str]] = None,
+        filter: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """한 구간의 비용 데이터를 모든 페이지에 걸쳐 조회합니다. (구간 단위로 캐시)"""
+        params = self._cost_and_usage_params(start_date, end_date, granularity, metrics, group_by, filter)
+        if self.cache:
+            cached = self.cache.get(self.cache_scope, 'GetCostAndUsage', params)
+            if cached is not None:
+                return cached
+
+        pages = self.iter_cost_and_usage_pages(start_date, end_date, granularity, metrics, group_by, filter)
+        response = self.merge_cost_pages(pages)
+
+        if self.cache:
+            self.cache.put(self.cache_scope, 'GetCostAndUsage', params, response)
+        return response
+
+    def get_cost_and_usage(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'MONTHLY',
+        metrics: List[str] = ['UnblendedCost'],
+        group_by: List[Dict[str, str]] = None,
+        max_workers: int = 4,
+        filter: Dict[str, Any] = None
     ) -> Dict[str, Any]:
         """
         AWS Cost Explorer API를 통해 비용 데이터를 조회합니다.
+
+        HOURLY 또는 GroupBy가 지정된 DAILY 조회는 기간을 나누어 병렬로 조회한 뒤
+        한 번의 호출 결과와 같은 형태로 합칩니다.
         
         Args:
-            start_date (str): 시작 날짜 (YYYY-MM-DD 형식)
-            end_date (str): 종료 날짜 (YYYY-MM-DD 형식)
+            start_date (str): 시작 날짜 (YYYY-MM-DD 형식, HOURLY는 YYYY-MM-DDThh:mm:ssZ 형식도 가능)
+            end_date (str): 종료 날짜 (YYYY-MM-DD 형식, HOURLY는 YYYY-MM-DDThh:mm:ssZ 형식도 가능)
             granularity (str): 데이터 세분화 단위 (DAILY, MONTHLY, HOURLY)
             metrics (List[str]): 조회할 메트릭 목록
-            group_by (List[Dict[str, str]]): 그룹화 기준 (예: [{'Type': 'DIMENSION', 'Key': 'SERVICE'}])
+            group_by (List[Dict[str, str]]): 그룹화 기준, 최대 2개 (예: [{'Type': 'DIMENSION', 'Key': 'SERVICE'}])
+            max_workers (int): 나눈 구간을 동시에 조회할 최대 개수
+            filter (Dict[str, Any]): 조회 대상을 좁히는 Cost Explorer 필터 식 (예: {'Dimensions': {'Key': 'LINKED_ACCOUNT', 'Values': [...]}})
         
         Returns:
-            Dict[str, Any]: 비용 데이터
+            Dict[str, Any]: 비용 데이터 (캐시가 설정된 경우 캐시된 응답일 수 있음)
         """
         try:
-            params = {
-                'TimePeriod': {
-                    'Start': start_date,
-                    'End': end_date
-                },
-                'Granularity': granularity,
-                'Metrics': metrics
-            }
+            if group_by and len(group_by) > MAX_GROUP_BY:
+                raise ValueError(f"GroupBy는 최대 {MAX_GROUP_BY}개까지 지정할 수 있습니다.")
 
-            if group_by:
-                params['GroupBy'] = group_by
+            chunks = self.split_time_period(start_date, end_date, granularity, group_by)
+            if len(chunks) == 1:
+                return self._fetch_cost_and_usage(start_date, end_date, granularity, metrics, group_by, filter)
 
-            response = self.client.get_cost_and_usage(**params)
-            return response
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+                responses = list(executor.map(
+                    lambda chunk: self._fetch_cost_and_usage(chunk[0], chunk[1], granularity, metrics, group_by, filter),
+                    chunks
+                ))
+            return self.stitch_cost_results(responses)
 
         except Exception as e:
             print(f"비용 데이터 조회 중 오류 발생: {str(e)}")
@@ -97,7 +304,8 @@ class AWSCostExplorer:
         start_date: str,
         end_date: str,
         metric: str = 'UNBLENDED_COST',
-        granularity: str = 'MONTHLY'
+        granularity: str = 'MONTHLY',
+        filter: Dict[str, Any] = None
     ) -> Dict[str, Any]:
         """
         AWS Cost Explorer API를 통해 비용 예측 데이터를 조회합니다.
@@ -107,29 +315,46 @@ class AWSCostExplorer:
             end_date (str): 종료 날짜 (YYYY-MM-DD 형식)
             metric (str): 예측할 메트릭
             granularity (str): 데이터 세분화 단위 (DAILY, MONTHLY, HOURLY)
+            filter (Dict[str, Any]): 예측 대상을 좁히는 Cost Explorer 필터 식 (예: {'Dimensions': {'Key': 'SERVICE', 'Values': [...]}})
         
         Returns:
             Dict[str, Any]: 비용 예측 데이터
         """
         try:
-            response = self.client.get_cost_forecast(
-                TimePeriod={
+            params = {
+                'TimePeriod': {
                     'Start': start_date,
                     'End': end_date
                 },
-                Metric=metric,
-                Granularity=granularity
-            )
+                'Metric': metric,
+                'Granularity': granularity
+            }
+            if filter:
+                params['Filter'] = filter
+            if self.cache:
+                cached = self.cache.get(self.cache_scope, 'GetCostForecast', params)
+                if cached is not None:
+                    return cached
+
+            response = self.client.get_cost_forecast(**params)
+
+            if self.cache:
+                self.cache.put(self.cache_scope, 'GetCostForecast', params, response)
             return response
 
         except Exception as e:
             print(f"비용 예측 데이터 조회 중 오류 발생: {str(e)}")
             raise
 
-def main():
-    import argparse
-    
-    parser = argparse.ArgumentParser(description='AWS Cost Explorer 데이터를 조회하는 스크립트')
+def parse_group_by(value: str) -> Dict[str, str]:
+    """'TYPE:KEY' 형식(TYPE 생략 시 DIMENSION)의 문자열을 GroupBy 항목으로 변환합니다."""
+    if ':' not in value:
+        return {'Type': 'DIMENSION', 'Key': value}
+    group_type, key = value.split(':', 1)
+    return {'Type': group_type.upper(), 'Key': key}
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """명령행 인자를 parser에 추가합니다. (cli.py의 하위 명령과 공유)"""
     parser.add_argument('--role-arn', required=True, help='AWS Role ARN')
     parser.add_argument('--session-name', required=True, help='Session Name for STS')
     parser.add_argument('--external-id', required=True, help='External ID for STS')
@@ -138,10 +363,29 @@ def main():
     parser.add_argument('--start-date', required=True, help='시작 날짜 (YYYY-MM-DD)')
     parser.add_argument('--end-date', required=True, help='종료 날짜 (YYYY-MM-DD)')
     parser.add_argument('--granularity', default='MONTHLY', choices=['DAILY', 'MONTHLY', 'HOURLY'], help='데이터 세분화 단위')
-    parser.add_argument('--output', required=True, help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--output', required=True, help='결과를 저장할 파일 경로')
+    parser.add_argument('--format', default='json', choices=['json', 'ndjson', 'parquet', 'arrow'], help='출력 형식 (ndjson은 기간/그룹 단위 행을 조회되는 즉시 한 줄씩 저장, parquet/arrow는 컬럼형 테이블로 저장하며 pyarrow 필요)')
+    parser.add_argument('--compress', default='none', choices=['none', 'gzip', 'zstd'], help='ndjson 출력 압축 형식 (기본값: none)')
     parser.add_argument('--forecast', action='store_true', help='비용 예측 데이터 조회 여부')
-    
-    args = parser.parse_args()
+    parser.add_argument('--group-by', action='append', help="그룹화 기준, 최대 2개까지 반복 지정 (예: SERVICE, DIMENSION:LINKED_ACCOUNT, TAG:Environment, 기본값: SERVICE)")
+    parser.add_argument('--max-workers', type=int, default=4, help='나눈 기간을 동시에 조회할 최대 개수 (기본값: 4)')
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help=f'응답 캐시 파일 경로 (기본값: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='응답 캐시를 사용하지 않음')
+    parser.add_argument('--refresh', action='store_true', help='캐시를 읽지 않고 새로 조회하여 캐시를 갱신')
+    parser.add_argument('--incremental', action='store_true', help='마지막 동기화 이후 변경된 기간만 조회하여 로컬 데이터셋에 병합하고 변경분만 출력')
+    parser.add_argument('--lookback-days', type=int, default=3, help='증분 조회 시 다시 조회할 보정 기간(일) (기본값: 3)')
+    parser.add_argument('--account-id', help='증분 데이터셋을 구분할 계정 ID (기본값: Role ARN의 계정 ID)')
+    parser.add_argument('--sync-path', default=None, help='증분 데이터셋 파일 경로 (기본값: .cache/cost_sync.sqlite3)')
+    parser.add_argument('--stats', action='store_true', help='종료 시 API 작업별 호출 수/지연 시간/수신 바이트 통계를 stderr로 출력')
+    parser.add_argument('--metrics-file', help='작업별 통계를 Prometheus 텍스트 형식으로 저장할 파일 경로')
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    metrics = get_registry()
+
+    if args.format != 'json' and (args.forecast or args.incremental):
+        parser.error('--format ndjson/parquet/arrow는 일반 비용 조회에서만 사용할 수 있습니다.')
+
+    group_by = [parse_group_by(value) for value in (args.group_by or ['SERVICE'])]
 
     try:
         explorer = AWSCostExplorer(
@@ -149,10 +393,37 @@ def main():
             session_name=args.session_name,
             external_id=args.external_id,
             region=args.region,
-            profile_name=args.profile
+            profile_name=args.profile,
+            cache=None if args.no_cache else CostCache(args.cache_path, refresh=args.refresh)
         )
 
-        if args.forecast:
+        if args.format == 'ndjson':
+            from aws_output import NDJSONWriter
+
+            with NDJSONWriter(args.output, compression=args.compress) as writer:
+                for row in explorer.iter_cost_and_usage_rows(
+                    start_date=args.start_date,
+                    end_date=args.end_date,
+                    granularity=args.granularity,
+                    group_by=group_by
+                ):
+                    writer.write('cost', row)
+            print(f"{writer.count}개의 레코드가 {args.output}에 저장되었습니다.")
+            return
+
+        if args.incremental and not args.forecast:
+            from aws_cost_sync import CostSyncStore, IncrementalCostSync, DEFAULT_SYNC_PATH
+
+            syncer = IncrementalCostSync(explorer, CostSyncStore(args.sync_path or DEFAULT_SYNC_PATH), lookback_days=args.lookback_days)
+            result = syncer.sync(
+                account_id=args.account_id or args.role_arn.split(':')[4],
+                start_date=args.start_date,
+                end_date=args.end_date,
+                granularity=args.granularity,
+                group_by=group_by
+            )
+            print(f"{result['fetched_start']} ~ {result['fetched_end']} 구간을 조회하여 {len(result['delta'])}개의 변경된 행, {len(result['removed'])}개의 삭제된 행을 찾았습니다.")
+        elif args.forecast:
             result = explorer.get_cost_forecast(
                 start_date=args.start_date,
                 end_date=args.end_date,
@@ -163,16 +434,37 @@ def main():
                 start_date=args.start_date,
                 end_date=args.end_date,
                 granularity=args.granularity,
-                group_by=[{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+                group_by=group_by,
+                max_workers=args.max_workers
             )
 
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+        if args.format == 'json':
+            # 문자열로 한 번 더 만들지 않고 파일에 바로 직렬화
+            with open(args.output, 'w', encoding='utf-8') as f, metrics.timed('json.serialize'):
+                json.dump(result, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+        else:
+            from aws_cost_table import CostTable
+
+            table = CostTable.from_response(result)
+            if args.format == 'parquet':
+                table.write_parquet(args.output)
+            else:
+                table.write_ipc(args.output)
         print(f"결과가 {args.output}에 저장되었습니다.")
 
     except Exception as e:
         print(f"오류 발생: {str(e)}")
         exit(1)
+    finally:
+        if args.stats:
+            metrics.print_summary()
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser, parser.parse_args())
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,482 @@
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from aws_cost_explorer import AWSCostExplorer, DateTimeEncoder, MAX_GROUP_BY, parse_group_by
+from aws_cost_cache import CostCache, DEFAULT_CACHE_PATH
+from aws_metrics import get_registry
+
+DESCRIPTION = '겹치는 비용 조회 요청을 합치고 이미 조회한 데이터로 답하여 Cost Explorer 호출 수를 줄이는 스크립트'
+
+LINKED_ACCOUNT = ('DIMENSION', 'LINKED_ACCOUNT')
+GRANULARITIES = ('HOURLY', 'DAILY', 'MONTHLY')
+# 더 세밀한 데이터를 합산하여 답할 수 있는 (조회한 단위, 요청 단위)
+ROLLUPS = {('DAILY', 'MONTHLY')}
+
+def _next_month(value: date) -> date:
+    return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+def _month_boundaries(start_date: str, end_date: str) -> set:
+    """MONTHLY 응답의 기간 경계 (시작일, 종료일, 그 사이의 매월 1일)"""
+    boundaries = {start_date, end_date}
+    current = _next_month(date.fromisoformat(start_date[:10]))
+    while current.isoformat() < end_date:
+        boundaries.add(current.isoformat())
+        current = _next_month(current)
+    return boundaries
+
+class CostQuery:
+    """
+    get_cost_and_usage 요청 하나를 비교할 수 있는 형태로 정규화한 것입니다.
+
+    accounts를 지정하면 해당 계정(LINKED_ACCOUNT)들의 비용만 조회하는 요청입니다.
+    GroupBy는 응답의 Keys 순서를 정하므로 요청 순서를 유지하고, 메트릭/계정은 순서와 무관하게 비교합니다.
+    """
+
+    def __init__(
+        self,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'MONTHLY',
+        metrics: Iterable[str] = ('UnblendedCost',),
+        group_by: Iterable[Dict[str, str]] = None,
+        accounts: Iterable[str] = None
+    ):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"알 수 없는 세분화 단위: {granularity}")
+        if start_date >= end_date:
+            raise ValueError(f"시작 날짜({start_date})가 종료 날짜({end_date})보다 앞서야 합니다.")
+
+        self.start_date = start_date
+        self.end_date = end_date
+        self.granularity = granularity
+        self.metrics = tuple(dict.fromkeys(metrics))
+        self.group_by = tuple(dict.fromkeys((group['Type'], group['Key']) for group in group_by or []))
+        if len(self.group_by) > MAX_GROUP_BY:
+            raise ValueError(f"GroupBy는 최대 {MAX_GROUP_BY}개까지 지정할 수 있습니다.")
+        self.accounts = None if accounts is None else frozenset(accounts)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CostQuery':
+        """
+        요청 dict로 만듭니다. group_by 항목은 GroupBy dict 또는 'TYPE:KEY' 문자열입니다.
+
+        예: {'start_date': '2024-01-01', 'end_date': '2024-04-01', 'granularity': 'MONTHLY',
+             'group_by': ['SERVICE'], 'accounts': ['111111111111']}
+        """
+        group_by = [parse_group_by(group) if isinstance(group, str) else group for group in data.get('group_by') or []]
+        return cls(
+            start_date=data['start_date'],
+            end_date=data['end_date'],
+            granularity=data.get('granularity', 'MONTHLY'),
+            metrics=data.get('metrics') or ['UnblendedCost'],
+            group_by=group_by,
+            accounts=data.get('accounts')
+        )
+
+    @property
+    def key(self) -> Tuple[Any, ...]:
+        """같은 결과를 반환하는 요청끼리 같은 값"""
+        return (
+            self.start_date,
+            self.end_date,
+            self.granularity,
+            tuple(sorted(self.metrics)),
+            self.group_by,
+            None if self.accounts is None else tuple(sorted(self.accounts))
+        )
+
+    def group_by_params(self) -> List[Dict[str, str]]:
+        return [{'Type': group_type, 'Key': key} for group_type, key in self.group_by]
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'granularity': self.granularity,
+            'metrics': list(self.metrics),
+            'group_by': self.group_by_params()
+        }
+        if self.accounts is not None:
+            result['accounts'] = sorted(self.accounts)
+        return result
+
+class CostFetch:
+    """
+    계획된 get_cost_and_usage 호출 하나입니다. (여러 요청을 합친 기간/메트릭/GroupBy)
+
+    accounts가 None이 아니면 LINKED_ACCOUNT 필터를 붙여 조회합니다.
+    """
+
+    def __init__(self, start_date: str, end_date: str, granularity: str, metrics: Iterable[str], group_by: Iterable[Tuple[str, str]], accounts: frozenset = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.granularity = granularity
+        self.metrics = tuple(dict.fromkeys(metrics))
+        self.group_by = tuple(group_by)
+        self.accounts = accounts
+        self.queries: List[CostQuery] = []
+        self.response: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def for_query(cls, query: CostQuery) -> 'CostFetch':
+        """
+        요청 하나를 위한 호출을 만듭니다.
+
+        계정 부분 집합 요청은 GroupBy에 여유가 있으면 필터 대신 LINKED_ACCOUNT로 그룹화하여
+        다른 계정 부분 집합 요청도 같은 호출로 답할 수 있게 합니다.
+        """
+        group_by = query.group_by
+        accounts = query.accounts
+        if accounts is not None and (LINKED_ACCOUNT in group_by or len(group_by) < MAX_GROUP_BY):
+            group_by = group_by if LINKED_ACCOUNT in group_by else group_by + (LINKED_ACCOUNT,)
+            accounts = None
+        return cls(query.start_date, query.end_date, query.granularity, query.metrics, group_by, accounts)
+
+    @property
+    def filter(self) -> Optional[Dict[str, Any]]:
+        if self.accounts is None:
+            return None
+        return {'Dimensions': {'Key': 'LINKED_ACCOUNT', 'Values': sorted(self.accounts)}}
+
+    @property
+    def estimated_calls(self) -> int:
+        """기간 분할 기준의 예상 API 호출 수 (페이지네이션 제외)"""
+        group_by = [{'Type': group_type, 'Key': key} for group_type, key in self.group_by]
+        return len(AWSCostExplorer.split_time_period(self.start_date, self.end_date, self.granularity, group_by))
+
+    def covers(self, query: CostQuery, ignore_metrics: bool = False) -> bool:
+        """이 호출의 응답만으로 query에 답할 수 있는지 확인합니다."""
+        if query.granularity != self.granularity and (self.granularity, query.granularity) not in ROLLUPS:
+            return False
+        if ('T' in query.start_date) != ('T' in self.start_date):
+            return False
+        if query.start_date < self.start_date or query.end_date > self.end_date:
+            return False
+        # MONTHLY 응답은 달 단위로 합쳐져 있으므로 요청 기간이 응답의 기간 경계와 맞아야 함
+        if query.granularity == 'MONTHLY' and self.granularity == 'MONTHLY':
+            boundaries = _month_boundaries(self.start_date, self.end_date)
+            if query.start_date not in boundaries or query.end_date not in boundaries:
+                return False
+        if not ignore_metrics and not set(query.metrics) <= set(self.metrics):
+            return False
+        if not set(query.group_by) <= set(self.group_by):
+            return False
+        if query.accounts is None or query.accounts == self.accounts:
+            return self.accounts is None or query.accounts == self.accounts
+        return LINKED_ACCOUNT in self.group_by and (self.accounts is None or query.accounts <= self.accounts)
+
+    def merged_with(self, query: CostQuery) -> Optional['CostFetch']:
+        """
+        query를 합친 호출을 만듭니다. 합칠 수 없거나 따로 조회하는 것보다 호출 수가 늘면 None을 반환합니다.
+
+        기간이 겹치거나 맞닿은 같은 세분화 단위의 요청만 합치며, GroupBy는 합쳐도 최대 2개를 넘지 않아야 합니다.
+        """
+        if query.granularity != self.granularity or ('T' in query.start_date) != ('T' in self.start_date):
+            return None
+        if query.start_date > self.end_date or query.end_date < self.start_date:
+            return None
+
+        own = CostFetch.for_query(query)
+        if own.accounts != self.accounts:
+            return None
+        group_by = self.group_by + tuple(group for group in own.group_by if group not in self.group_by)
+        if len(group_by) > MAX_GROUP_BY:
+            return None
+
+        merged = CostFetch(
+            min(self.start_date, query.start_date),
+            max(self.end_date, query.end_date),
+            self.granularity,
+            self.metrics + query.metrics,
+            group_by,
+            self.accounts
+        )
+        if not all(merged.covers(existing) for existing in self.queries + [query]):
+            return None
+        # GroupBy를 추가하면 DAILY 조회가 월 단위로 나뉘므로 따로 조회할 때보다 호출이 늘지 않는 경우만 합침
+        if merged.estimated_calls > self.estimated_calls + own.estimated_calls:
+            return None
+        merged.queries = self.queries + [query]
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'granularity': self.granularity,
+            'metrics': list(self.metrics),
+            'group_by': [{'Type': group_type, 'Key': key} for group_type, key in self.group_by],
+            'estimated_calls': self.estimated_calls,
+            'queries': len(self.queries)
+        }
+        if self.accounts is not None:
+            result['filter'] = self.filter
+        return result
+
+class CostQueryPlanner:
+    """
+    AWSCostExplorer 앞에서 비용 조회 요청들을 정규화하고 합쳐 가장 적은 API 호출로 답합니다.
+
+    - 같은 요청은 한 번만 조회합니다.
+    - MONTHLY 요청은 같은 기간을 덮는 DAILY 데이터가 있으면 월 단위로 합산하여 답합니다.
+    - 계정 부분 집합 요청은 LINKED_ACCOUNT로 그룹화한 한 번의 호출에서 계정별로 골라 답합니다.
+    - GroupBy 일부만 필요한 요청은 더 많은 GroupBy로 조회한 데이터를 합산하여 답합니다.
+    - 조회한 응답은 보관하여 이후 execute 호출의 요청에도 재사용합니다.
+
+    합산한 금액은 float 합계를 소수점 10자리로 반올림한 문자열이며, 값이 하나뿐이면 원본 문자열을 그대로 사용합니다.
+    """
+
+    def __init__(self, explorer: AWSCostExplorer, max_workers: int = 4):
+        """
+        Args:
+            explorer (AWSCostExplorer): 실제 조회에 사용할 Cost Explorer 리더 (캐시 사용 가능)
+            max_workers (int): 합친 호출을 동시에 실행할 최대 개수
+        """
+        self.explorer = explorer
+        self.max_workers = max(1, max_workers)
+        # 조회가 끝난 호출 (다음 요청에도 재사용)
+        self.fetched: List[CostFetch] = []
+        self.report = {
+            'requests': 0,
+            'unique_requests': 0,
+            'answered_from_fetched': 0,
+            'fetches': 0,
+            'naive_calls': 0,
+            'planned_calls': 0,
+            'saved_calls': 0,
+            'api_pages': 0
+        }
+
+    @staticmethod
+    def naive_calls(queries: Iterable[CostQuery]) -> int:
+        """요청마다 따로 조회할 때의 예상 API 호출 수 (계정 부분 집합은 필터를 붙인 개별 호출)"""
+        return sum(
+            CostFetch(query.start_date, query.end_date, query.granularity, query.metrics, query.group_by, query.accounts).estimated_calls
+            for query in queries
+        )
+
+    def plan(self, queries: Iterable[CostQuery]) -> Tuple[List[CostFetch], Dict[Tuple[Any, ...], CostFetch]]:
+        """
+        요청들에 답하는 데 필요한 호출 목록을 만듭니다. (API를 호출하지 않음)
+
+        Returns:
+            Tuple[List[CostFetch], Dict]: (새로 조회할 호출 목록, 요청 key -> 답할 호출 (이미 조회한 호출 포함))
+        """
+        unique = {query.key: query for query in queries}
+        # 세밀한 단위를 먼저 계획해야 MONTHLY 요청이 DAILY 호출로 답할 수 있음
+        ordered = sorted(unique.values(), key=lambda query: (GRANULARITIES.index(query.granularity), query.start_date, query.end_date))
+
+        planned: List[CostFetch] = []
+        sources: Dict[Tuple[Any, ...], CostFetch] = {}
+        for query in ordered:
+            source = next((fetch for fetch in self.fetched if fetch.covers(query)), None)
+            if source is None:
+                # 기간/GroupBy가 맞으면 메트릭은 추가해도 호출 수가 늘지 않음
+                source = next((fetch for fetch in planned if fetch.covers(query, ignore_metrics=True)), None)
+                if source is not None:
+                    source.metrics = tuple(dict.fromkeys(source.metrics + query.metrics))
+                    source.queries.append(query)
+            if source is None:
+                for index, fetch in enumerate(planned):
+                    merged = fetch.merged_with(query)
+                    if merged is not None:
+                        planned[index] = source = merged
+                        for key, assigned in sources.items():
+                            if assigned is fetch:
+                                sources[key] = merged
+                        break
+            if source is None:
+                source = CostFetch.for_query(query)
+                source.queries.append(query)
+                planned.append(source)
+            sources[query.key] = source
+        return planned, sources
+
+    def _fetch(self, fetch: CostFetch) -> None:
+        fetch.response = self.explorer.get_cost_and_usage(
+            start_date=fetch.start_date,
+            end_date=fetch.end_date,
+            granularity=fetch.granularity,
+            metrics=list(fetch.metrics),
+            group_by=[{'Type': group_type, 'Key': key} for group_type, key in fetch.group_by] or None,
+            filter=fetch.filter
+        )
+
+    def execute(self, queries: Iterable[CostQuery]) -> List[Dict[str, Any]]:
+        """
+        요청들을 계획대로 조회하고 요청 순서대로 get_cost_and_usage와 같은 형식의 응답을 반환합니다.
+
+        호출 수 절감 내역은 self.report에 누적됩니다.
+        """
+        queries = list(queries)
+        planned, sources = self.plan(queries)
+
+        pages_before = self.explorer.pagination_stats.get('get_cost_and_usage')['pages']
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(planned)) or 1) as executor:
+            list(executor.map(self._fetch, planned))
+        self.fetched.extend(planned)
+
+        metrics = get_registry()
+        with metrics.timed('planner.answer'):
+            answers = {key: self.answer(source, query) for key, query, source in ((query.key, query, sources[query.key]) for query in queries)}
+
+        naive_calls = self.naive_calls(queries)
+        planned_calls = sum(fetch.estimated_calls for fetch in planned)
+        self.report['requests'] += len(queries)
+        self.report['unique_requests'] += len(sources)
+        self.report['answered_from_fetched'] += sum(1 for source in sources.values() if source not in planned)
+        self.report['fetches'] += len(planned)
+        self.report['naive_calls'] += naive_calls
+        self.report['planned_calls'] += planned_calls
+        self.report['saved_calls'] += naive_calls - planned_calls
+        self.report['api_pages'] += self.explorer.pagination_stats.get('get_cost_and_usage')['pages'] - pages_before
+
+        return [answers[query.key] for query in queries]
+
+    @staticmethod
+    def answer(fetch: CostFetch, query: CostQuery) -> Dict[str, Any]:
+        """조회한 응답에서 query의 기간/계정을 골라 GroupBy/세분화 단위에 맞게 합산합니다."""
+        response = fetch.response or {}
+        fetch_group_by = [(definition['Type'], definition['Key']) for definition in response.get('GroupDefinitions', [])] or list(fetch.group_by)
+        positions = [fetch_group_by.index(group) for group in query.group_by]
+        account_position = None
+        if query.accounts is not None and query.accounts != fetch.accounts:
+            account_position = fetch_group_by.index(LINKED_ACCOUNT)
+        rollup = fetch.granularity != query.granularity
+
+        # (시작, 종료) -> {'estimated': bool, 'groups': {Keys: {메트릭: [합계, 단위, 원본 문자열, 개수]}}}
+        buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        units: Dict[str, str] = {}
+        for result in response.get('ResultsByTime', []):
+            start, end = result['TimePeriod']['Start'], result['TimePeriod']['End']
+            if start < query.start_date or end > query.end_date:
+                continue
+            if rollup:
+                month = date.fromisoformat(start[:10]).replace(day=1)
+                start, end = max(month.isoformat(), query.start_date), min(_next_month(month).isoformat(), query.end_date)
+            bucket = buckets.setdefault((start, end), {'estimated': False, 'groups': {}})
+            bucket['estimated'] = bucket['estimated'] or bool(result.get('Estimated', False))
+
+            groups = (result.get('Groups') or []) if fetch_group_by else [{'Keys': [], 'Metrics': result.get('Total', {})}]
+            for group in groups:
+                keys = group.get('Keys', [])
+                if account_position is not None and keys[account_position] not in query.accounts:
+                    continue
+                sums = bucket['groups'].setdefault(tuple(keys[position] for position in positions), {})
+                for metric in query.metrics:
+                    value = group.get('Metrics', {}).get(metric)
+                    if value is None:
+                        continue
+                    units.setdefault(metric, value.get('Unit'))
+                    entry = sums.get(metric)
+                    if entry is None:
+                        sums[metric] = [float(value['Amount']), value.get('Unit'), value['Amount'], 1]
+                    else:
+                        entry[0] += float(value['Amount'])
+                        entry[3] += 1
+
+        def metric_values(sums: Dict[str, List[Any]]) -> Dict[str, Dict[str, Any]]:
+            return {
+                metric: {'Amount': entry[2] if entry[3] == 1 else repr(round(entry[0], 10)), 'Unit': entry[1]}
+                for metric, entry in sums.items()
+            }
+
+        results = []
+        key_values = set()
+        for (start, end), bucket in sorted(buckets.items()):
+            result: Dict[str, Any] = {'TimePeriod': {'Start': start, 'End': end}, 'Total': {}, 'Groups': [], 'Estimated': bucket['estimated']}
+            if query.group_by:
+                result['Groups'] = [{'Keys': list(keys), 'Metrics': metric_values(sums)} for keys, sums in bucket['groups'].items()]
+                key_values.update(value for keys in bucket['groups'] for value in keys)
+            else:
+                # 그룹이 없는 기간도 API처럼 0으로 채움
+                total = metric_values(bucket['groups'].get((), {}))
+                result['Total'] = {metric: total.get(metric, {'Amount': '0', 'Unit': units.get(metric, 'USD')}) for metric in query.metrics}
+            results.append(result)
+
+        answer: Dict[str, Any] = {'ResultsByTime': results}
+        if query.group_by:
+            answer['GroupDefinitions'] = query.group_by_params()
+        answer['DimensionValueAttributes'] = [
+            attribute for attribute in response.get('DimensionValueAttributes', []) if attribute.get('Value') in key_values
+        ]
+        return answer
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """명령행 인자를 parser에 추가합니다. (cli.py의 하위 명령과 공유)"""
+    parser.add_argument('--queries', required=True, help="요청 목록 JSON 파일 (예: [{\"start_date\": \"2024-01-01\", \"end_date\": \"2024-04-01\", \"granularity\": \"MONTHLY\", \"group_by\": [\"SERVICE\"], \"accounts\": [\"111111111111\"]}])")
+    parser.add_argument('--role-arn', help='AWS Role ARN (관리 계정, --dry-run이 아니면 필수)')
+    parser.add_argument('--session-name', help='Session Name for STS')
+    parser.add_argument('--external-id', help='External ID for STS')
+    parser.add_argument('--region', default='ap-northeast-2', help='AWS Region (기본값: ap-northeast-2)')
+    parser.add_argument('--profile', default='cmp-sts-user', help='AWS Credentials 프로필 이름 (기본값: cmp-sts-user)')
+    parser.add_argument('--dry-run', action='store_true', help='API를 호출하지 않고 합친 호출 계획과 예상 절감 호출 수만 출력')
+    parser.add_argument('--max-workers', type=int, default=4, help='합친 호출을 동시에 실행할 최대 개수 (기본값: 4)')
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help=f'응답 캐시 파일 경로 (기본값: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='응답 캐시를 사용하지 않음')
+    parser.add_argument('--output', help='요청별 응답과 절감 내역을 저장할 JSON 파일 경로')
+    parser.add_argument('--stats', action='store_true', help='종료 시 API 작업별 호출 수/지연 시간/수신 바이트 통계를 stderr로 출력')
+    parser.add_argument('--metrics-file', help='작업별 통계를 Prometheus 텍스트 형식으로 저장할 파일 경로')
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    metrics = get_registry()
+
+    if not args.dry_run and not (args.role_arn and args.session_name and args.external_id):
+        parser.error('--dry-run이 아니면 --role-arn, --session-name, --external-id가 필요합니다.')
+
+    try:
+        with open(args.queries, encoding='utf-8') as f:
+            queries = [CostQuery.from_dict(item) for item in json.load(f)]
+
+        if args.dry_run:
+            planner = CostQueryPlanner(explorer=None)
+            planned, sources = planner.plan(queries)
+            naive_calls = planner.naive_calls(queries)
+            planned_calls = sum(fetch.estimated_calls for fetch in planned)
+            for fetch in planned:
+                print(json.dumps(fetch.to_dict(), ensure_ascii=False))
+            print(f"요청 {len(queries)}개 (중복 제외 {len(sources)}개) -> 호출 {len(planned)}건, 예상 API 호출 {planned_calls}회 (개별 조회 시 {naive_calls}회, {naive_calls - planned_calls}회 절약)")
+            return
+
+        explorer = AWSCostExplorer(
+            role_arn=args.role_arn,
+            session_name=args.session_name,
+            external_id=args.external_id,
+            region=args.region,
+            profile_name=args.profile,
+            cache=None if args.no_cache else CostCache(args.cache_path)
+        )
+        planner = CostQueryPlanner(explorer, max_workers=args.max_workers)
+        responses = planner.execute(queries)
+
+        report = planner.report
+        print(f"요청 {report['requests']}개 (중복 제외 {report['unique_requests']}개) -> 호출 {report['fetches']}건, 예상 API 호출 {report['planned_calls']}회 (개별 조회 시 {report['naive_calls']}회, {report['saved_calls']}회 절약, 실제 페이지 {report['api_pages']}개)")
+
+        if args.output:
+            result = {
+                'report': report,
+                'plan': [fetch.to_dict() for fetch in planner.fetched],
+                'results': [{'query': query.to_dict(), 'response': response} for query, response in zip(queries, responses)]
+            }
+            with open(args.output, 'w', encoding='utf-8') as f, metrics.timed('json.serialize'):
+                json.dump(result, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+            print(f"결과가 {args.output}에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+    finally:
+        if args.stats:
+            metrics.print_summary()
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser, parser.parse_args())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Any, Tuple
+from aws_cost_explorer import AWSCostExplorer
+
+DEFAULT_SYNC_PATH = os.path.join('.cache', 'cost_sync.sqlite3')
+
+class CostSyncStore:
+    """
+    증분 비용 동기화를 위한 로컬 데이터셋입니다.
+
+    (계정, 세분화 단위, 그룹화 기준, 지표) 별로 워터마크(동기화한 시작일과 마지막 종료일)와
+    기간/그룹 키 단위의 비용 행을 SQLite 파일에 저장합니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_SYNC_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS watermarks ('
+            'dataset TEXT PRIMARY KEY, synced_from TEXT NOT NULL, synced_until TEXT NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS cost_rows ('
+            'dataset TEXT NOT NULL, period_start TEXT NOT NULL, period_end TEXT NOT NULL, group_keys TEXT NOT NULL, '
+            'body TEXT NOT NULL, PRIMARY KEY (dataset, period_start, group_keys));'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def dataset_key(account_id: str, granularity: str, group_by: List[Dict[str, str]] = None, metrics: List[str] = None) -> str:
+        """
+        계정/세분화 단위/그룹화 기준/지표로 데이터셋 키를 만듭니다.
+
+        저장된 행에는 조회할 때 지정한 지표만 들어 있으므로, 지표가 다르면 별도 데이터셋으로 처음부터 동기화합니다.
+        """
+        groups = ','.join(f"{group['Type']}:{group['Key']}" for group in (group_by or []))
+        return f"{account_id}|{granularity}|{groups}|{','.join(sorted(metrics or []))}"
+
+    def get_watermark(self, dataset: str) -> Tuple[str, str]:
+        """동기화된 구간 (synced_from, synced_until)을 반환합니다. 없으면 (None, None)"""
+        with self._lock:
+            row = self._conn.execute('SELECT synced_from, synced_until FROM watermarks WHERE dataset = ?', (dataset,)).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def merge(
+        self,
+        dataset: str,
+        rows: List[Dict[str, Any]],
+        synced_from: str,
+        synced_until: str,
+        replace_start: str = None,
+        replace_end: str = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        새로 조회한 행을 저장된 데이터셋에 병합하고 워터마크를 갱신합니다.
+
+        replace_start..replace_end(다시 조회한 구간)를 지정하면 그 구간의 저장된 행 중
+        새 조회 결과에 없는 행(보정으로 사라진 그룹)을 삭제합니다.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: (새로 추가되었거나 값이 바뀐 행 (delta), 삭제된 행)
+        """
+        delta = []
+        removed = []
+        with self._lock:
+            if replace_start is not None and replace_end is not None:
+                fetched = {(row['period_start'], row['group_keys']) for row in rows}
+                for period_start, group_keys, body in self._conn.execute(
+                    'SELECT period_start, group_keys, body FROM cost_rows WHERE dataset = ? AND period_start >= ? AND period_start < ?',
+                    (dataset, replace_start, replace_end)
+                ).fetchall():
+                    if (period_start, group_keys) not in fetched:
+                        self._conn.execute(
+                            'DELETE FROM cost_rows WHERE dataset = ? AND period_start = ? AND group_keys = ?',
+                            (dataset, period_start, group_keys)
+                        )
+                        removed.append(json.loads(body))
+
+            for row in rows:
+                key = (dataset, row['period_start'], row['group_keys'])
+                body = json.dumps(row, sort_keys=True, separators=(',', ':'))
+                existing = self._conn.execute(
+                    'SELECT body FROM cost_rows WHERE dataset = ? AND period_start = ? AND group_keys = ?', key
+                ).fetchone()
+                if existing and existing[0] == body:
+                    continue
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO cost_rows (dataset, period_start, period_end, group_keys, body) VALUES (?, ?, ?, ?, ?)',
+                    (dataset, row['period_start'], row['period_end'], row['group_keys'], body)
+                )
+                delta.append(row)
+
+            self._conn.execute(
+                'INSERT OR REPLACE INTO watermarks (dataset, synced_from, synced_until) VALUES (?, ?, ?)',
+                (dataset, synced_from, synced_until)
+            )
+            self._conn.commit()
+        return delta, removed
+
+    def load(self, dataset: str, start_date: str = None, end_date: str = None) -> List[Dict[str, Any]]:
+        """저장된 데이터셋의 행을 기간 순서로 반환합니다."""
+        query = 'SELECT body FROM cost_rows WHERE dataset = ?'
+        params: Tuple = (dataset,)
+        if start_date:
+            query += ' AND period_start >= ?'
+            params += (start_date,)
+        if end_date:
+            query += ' AND period_start < ?'
+            params += (end_date,)
+        with self._lock:
+            rows = self._conn.execute(query + ' ORDER BY period_start, group_keys', params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def flatten_results(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """get_cost_and_usage 응답을 기간/그룹 키 단위의 행으로 펼칩니다."""
+    return list(AWSCostExplorer.iter_result_rows(response))
+
+class IncrementalCostSync:
+    """
+    워터마크 이후의 날짜와 보정 기간(lookback)만 조회하여 로컬 데이터셋을 갱신합니다.
+
+    Cost Explorer는 최근 며칠의 비용을 계속 보정하므로, 마지막 동기화 종료일에서
+    lookback_days만큼 앞선 날짜부터 다시 조회합니다.
+    """
+
+    def __init__(self, explorer: AWSCostExplorer, store: CostSyncStore, lookback_days: int = 3):
+        self.explorer = explorer
+        self.store = store
+        self.lookback_days = lookback_days
+
+    @staticmethod
+    def _align_start(start: date, granularity: str) -> str:
+        """조회 시작일을 세분화 단위의 기간 경계에 맞춥니다. (MONTHLY는 월초, HOURLY는 자정)"""
+        if granularity == 'MONTHLY':
+            return start.replace(day=1).isoformat()
+        if granularity == 'HOURLY':
+            return f"{start.isoformat()}T00:00:00Z"
+        return start.isoformat()
+
+    def sync(
+        self,
+        account_id: str,
+        start_date: str,
+        end_date: str,
+        granularity: str = 'DAILY',
+        metrics: List[str] = ['UnblendedCost'],
+        group_by: List[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        start_date..end_date 범위 중 아직 동기화하지 않았거나 보정될 수 있는 구간만 조회합니다.
+
+        동기화한 구간은 항상 연속되도록 유지합니다. 요청 구간이 동기화한 구간과 떨어져 있으면
+        사이의 빈 구간까지 함께 조회하며, 다시 조회한 구간의 저장된 행은 조회 결과로 대체합니다.
+
+        Returns:
+            Dict[str, Any]: {'dataset', 'fetched_start', 'fetched_end', 'delta': [...], 'removed': [...]}
+        """
+        dataset = self.store.dataset_key(account_id, granularity, group_by, metrics)
+        fetch_start, fetch_end = start_date, end_date
+        synced_from, synced_until = self.store.get_watermark(dataset)
+        if synced_until:
+            lookback_start = self._align_start(date.fromisoformat(synced_until[:10]) - timedelta(days=self.lookback_days), granularity)
+            if start_date < synced_from:
+                # 동기화한 구간의 앞쪽: 요청 시작일부터 조회하고, 요청이 동기화 시작일 전에 끝나면 빈 구간까지 조회
+                fetch_end = max(end_date, synced_from)
+            elif start_date > synced_until:
+                # 동기화한 구간 뒤로 떨어진 요청: 보정 기간부터 빈 구간을 포함하여 조회
+                fetch_start = lookback_start
+            else:
+                fetch_start = max(start_date, lookback_start)
+
+        delta = []
+        removed = []
+        if fetch_start < fetch_end:
+            response = self.explorer.get_cost_and_usage(
+                start_date=fetch_start,
+                end_date=fetch_end,
+                granularity=granularity,
+                metrics=metrics,
+                group_by=group_by
+            )
+            delta, removed = self.store.merge(
+                dataset,
+                flatten_results(response),
+                min(synced_from or fetch_start, fetch_start),
+                max(synced_until or fetch_end, fetch_end),
+                replace_start=fetch_start,
+                replace_end=fetch_end
+            )
+
+        return {
+            'dataset': dataset,
+            'fetched_start': fetch_start,
+            'fetched_end': fetch_end,
+            'delta': delta,
+            'removed': removed
+        }
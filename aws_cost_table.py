@@ -0,0 +1,223 @@
+import numpy as np
+from datetime import date
+from typing import Dict, List, Any, Iterable, Tuple
+
+# 문자열 컬럼 (정수 코드 + 카테고리 배열로 저장)
+BASE_COLUMNS = ('period_start', 'period_end', 'metric', 'unit')
+
+def daily_matrix(periods: np.ndarray, matrix: np.ndarray, end: date, start: date = None) -> Tuple[date, np.ndarray]:
+    """
+    CostTable.series 결과를 비용이 없는 날도 0으로 채워 end일까지 하루 단위로 이어지는 행렬로 만듭니다.
+
+    행렬은 가장 이른 기간부터 시작하며, start를 지정하면 적어도 그 날짜부터 시작합니다. (시작일, 행렬)을 반환합니다.
+    """
+    days = np.array([date.fromisoformat(str(period)[:10]).toordinal() for period in periods], dtype=np.int64)
+    candidates = ([int(days.min())] if len(days) else []) + ([start.toordinal()] if start else [])
+    first = min(candidates) if candidates else end.toordinal()
+    length = max(end.toordinal() - first + 1, 0)
+    positions = days - first
+    keep = (positions >= 0) & (positions < length)
+
+    full = np.zeros((matrix.shape[0], length), dtype=np.float64)
+    full[:, positions[keep]] = matrix[:, keep]
+    return date.fromordinal(first), full
+
+class CostTable:
+    """
+    get_cost_and_usage 응답을 펼친 컬럼형 테이블입니다.
+
+    한 행은 (기간, 그룹 키, 메트릭) 하나에 해당하며, 문자열 컬럼은 정수 코드와 카테고리 배열로,
+    금액은 float64 배열로 저장하여 그룹별 합계/피벗을 NumPy 연산으로 처리합니다.
+    """
+
+    def __init__(self, codes: Dict[str, np.ndarray], categories: Dict[str, np.ndarray], amount: np.ndarray, estimated: np.ndarray, group_columns: List[str]):
+        self._codes = codes
+        self._categories = categories
+        self.amount = amount
+        self.estimated = estimated
+        self.group_columns = group_columns
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any], **labels: str) -> 'CostTable':
+        """응답 하나를 테이블로 변환합니다. labels는 모든 행에 붙일 상수 컬럼입니다. (예: account_id='123')"""
+        return cls.from_responses([response], [labels] if labels else None)
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[Dict[str, Any]], labels: Iterable[Dict[str, str]] = None) -> 'CostTable':
+        """
+        여러 응답을 하나의 테이블로 변환합니다.
+
+        Args:
+            responses (Iterable[Dict[str, Any]]): get_cost_and_usage 응답 목록
+            labels (Iterable[Dict[str, str]]): 응답별로 모든 행에 붙일 상수 컬럼 (예: [{'account_id': '123'}, ...])
+        """
+        responses = list(responses)
+        labels = list(labels) if labels is not None else [{} for _ in responses]
+
+        group_columns: List[str] = []
+        for response, label in zip(responses, labels):
+            for name in list(label) + [definition['Key'] for definition in response.get('GroupDefinitions', [])]:
+                if name not in group_columns:
+                    group_columns.append(name)
+
+        # 문자열을 처음 등장한 순서대로 정수 코드로 인코딩
+        names = BASE_COLUMNS + tuple(group_columns)
+        encoders: Dict[str, Dict[str, int]] = {name: {} for name in names}
+        values: Dict[str, List[int]] = {name: [] for name in names}
+        amount: List[float] = []
+        estimated: List[bool] = []
+
+        def encode(name: str, value: str) -> None:
+            encoder = encoders[name]
+            code = encoder.get(value)
+            if code is None:
+                code = encoder[value] = len(encoder)
+            values[name].append(code)
+
+        for response, label in zip(responses, labels):
+            keys = [definition['Key'] for definition in response.get('GroupDefinitions', [])]
+            for result in response.get('ResultsByTime', []):
+                period = result['TimePeriod']
+                result_estimated = bool(result.get('Estimated', False))
+                groups = result.get('Groups') or [{'Keys': [], 'Metrics': result.get('Total', {})}]
+                for group in groups:
+                    group_values = dict(label)
+                    group_values.update(zip(keys, group.get('Keys', [])))
+                    for metric, value in group.get('Metrics', {}).items():
+                        encode('period_start', period['Start'])
+                        encode('period_end', period['End'])
+                        encode('metric', metric)
+                        encode('unit', value.get('Unit', ''))
+                        for name in group_columns:
+                            encode(name, group_values.get(name, ''))
+                        amount.append(float(value.get('Amount', 0)))
+                        estimated.append(result_estimated)
+
+        codes = {name: np.array(values[name], dtype=np.int32) for name in names}
+        categories = {name: np.array(list(encoders[name]), dtype=object) for name in names}
+
+        return cls(codes, categories, np.array(amount, dtype=np.float64), np.array(estimated, dtype=bool), group_columns)
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(BASE_COLUMNS[:2]) + self.group_columns + list(BASE_COLUMNS[2:]) + ['amount', 'estimated']
+
+    def column(self, name: str) -> np.ndarray:
+        """컬럼 값을 배열로 반환합니다. (문자열 컬럼은 디코딩하여 반환)"""
+        if name == 'amount':
+            return self.amount
+        if name == 'estimated':
+            return self.estimated
+        return self._categories[name][self._codes[name]]
+
+    def _mask(self, metric: str = None) -> np.ndarray:
+        if metric is None:
+            return np.ones(len(self), dtype=bool)
+        matches = np.nonzero(self._categories['metric'] == metric)[0]
+        if len(matches) == 0:
+            return np.zeros(len(self), dtype=bool)
+        return self._codes['metric'] == matches[0]
+
+    def group_sum(self, by: List[str], metric: str = None) -> Dict[str, np.ndarray]:
+        """
+        by 컬럼 조합별 금액 합계를 계산합니다.
+
+        Args:
+            by (List[str]): 그룹화할 컬럼 목록 (예: ['period_start', 'SERVICE'])
+            metric (str): 합산할 메트릭 (None이면 모든 메트릭)
+
+        Returns:
+            Dict[str, np.ndarray]: by 컬럼들과 'amount' 컬럼 (각 컬럼 값이 처음 등장한 순서 기준 정렬)
+        """
+        mask = self._mask(metric)
+        sizes = [len(self._categories[name]) for name in by]
+        combined = np.ravel_multi_index([self._codes[name][mask] for name in by], sizes) if by else np.zeros(int(mask.sum()), dtype=np.int64)
+        unique, inverse = np.unique(combined, return_inverse=True)
+        sums = np.bincount(inverse, weights=self.amount[mask], minlength=len(unique)).astype(np.float64)
+
+        result = {}
+        for name, codes in zip(by, np.unravel_index(unique, sizes) if by else []):
+            result[name] = self._categories[name][codes]
+        result['amount'] = sums
+        return result
+
+    def pivot(self, index: str, columns: str, metric: str = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        index x columns 금액 합계 행렬을 만듭니다. (예: 기간 x 서비스)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (행 레이블, 열 레이블, 합계 행렬)
+        """
+        mask = self._mask(metric)
+        rows = len(self._categories[index])
+        cols = len(self._categories[columns])
+        flat = self._codes[index][mask].astype(np.int64) * cols + self._codes[columns][mask]
+        matrix = np.bincount(flat, weights=self.amount[mask], minlength=rows * cols).reshape(rows, cols)
+        return self._categories[index], self._categories[columns], matrix
+
+    def series(self, keys: List[str], metric: str = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        keys 컬럼 조합별 기간 시계열 행렬을 만듭니다. (예: 계정 x 서비스별 일 단위 비용)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (행 레이블 (n, len(keys)), 기간 시작일 (정렬됨), 합계 행렬 (n, 기간 수))
+        """
+        mask = self._mask(metric)
+        sizes = [len(self._categories[name]) for name in keys]
+        combined = np.ravel_multi_index([self._codes[name][mask] for name in keys], sizes) if keys else np.zeros(int(mask.sum()), dtype=np.int64)
+        unique, rows = np.unique(combined, return_inverse=True)
+
+        # 기간 코드는 처음 등장한 순서이므로 시작일 순서의 열 번호로 바꿈
+        periods = self._categories['period_start']
+        order = np.argsort(periods.astype(str), kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        cols = rank[self._codes['period_start'][mask]]
+
+        matrix = np.bincount(rows * len(periods) + cols, weights=self.amount[mask], minlength=len(unique) * len(periods))
+        labels = np.empty((len(unique), len(keys)), dtype=object)
+        for index, (name, codes) in enumerate(zip(keys, np.unravel_index(unique, sizes) if keys else [])):
+            labels[:, index] = self._categories[name][codes]
+        return labels, periods[order], matrix.reshape(len(unique), len(periods))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """행 단위 dict 목록으로 변환합니다."""
+        columns = {name: self.column(name).tolist() for name in self.columns}
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def to_arrow(self):
+        """pyarrow.Table로 변환합니다. 문자열 컬럼은 dictionary 인코딩을 유지합니다."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Arrow/Parquet 출력을 사용하려면 pyarrow 패키지를 설치해야 합니다: pip install pyarrow")
+
+        arrays = []
+        for name in self.columns:
+            if name == 'amount':
+                arrays.append(pa.array(self.amount, type=pa.float64()))
+            elif name == 'estimated':
+                arrays.append(pa.array(self.estimated, type=pa.bool_()))
+            else:
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(self._codes[name], type=pa.int32()),
+                    pa.array(self._categories[name].tolist(), type=pa.string())
+                ))
+        return pa.Table.from_arrays(arrays, names=self.columns)
+
+    def write_parquet(self, path: str) -> None:
+        """Parquet 파일로 저장합니다."""
+        table = self.to_arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+
+    def write_ipc(self, path: str) -> None:
+        """Arrow IPC(Feather v2) 파일로 저장합니다."""
+        table = self.to_arrow()
+        import pyarrow as pa
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
@@ -0,0 +1,212 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, Any, Iterable
+from aws_session import AWSSessionManager, get_session_manager
+from aws_org_reader import AWSOrgReader, DateTimeEncoder
+from aws_budget import AWSBudgetReader
+from aws_cost_explorer import AWSCostExplorer
+from aws_records import Budget, to_records
+
+COLLECTORS = ('budget', 'cost')
+
+class AccountFanout:
+    """
+    조직의 모든 멤버 계정에 대해 계정별 역할을 가정하고 예산/비용 데이터를 병렬로 수집합니다.
+
+    한 계정의 실패는 해당 계정 결과의 'errors'에만 기록되며 다른 계정의 수집에는 영향을 주지 않습니다.
+    """
+
+    def __init__(
+        self,
+        role_arn_template: str,
+        session_name: str,
+        external_id: str,
+        region: str = 'ap-northeast-2',
+        profile_name: str = 'cmp-sts-user',
+        session_manager: AWSSessionManager = None,
+        max_workers: int = 16,
+        collectors: Iterable[str] = COLLECTORS,
+        compact: bool = False,
+        budget_fields: Iterable[str] = None
+    ):
+        """
+        Args:
+            role_arn_template (str): 계정별 역할 ARN 템플릿 (예: 'arn:aws:iam::{account_id}:role/ReadOnly')
+            session_name (str): STS 세션 이름
+            external_id (str): External ID for STS
+            region (str): AWS Region
+            profile_name (str): AWS Credentials 프로필 이름
+            session_manager (AWSSessionManager): 공유할 세션 매니저 (기본값: 프로세스 공유 매니저)
+            max_workers (int): 동시에 수집할 계정 수 상한
+            collectors (Iterable[str]): 실행할 수집기 ('budget', 'cost')
+            compact (bool): 예산을 응답 dict 대신 Budget 레코드로 보관 (JSON 출력 형식은 같음)
+            budget_fields (Iterable[str]): 예산 레코드에 남길 키 (지정하면 compact 사용)
+        """
+        unknown = set(collectors) - set(COLLECTORS)
+        if unknown:
+            raise ValueError(f"알 수 없는 수집기: {', '.join(sorted(unknown))}")
+
+        self.role_arn_template = role_arn_template
+        self.session_name = session_name
+        self.external_id = external_id
+        self.region = region
+        self.profile_name = profile_name
+        self.session_manager = session_manager or get_session_manager(region=region, profile_name=profile_name)
+        self.max_workers = max(1, max_workers)
+        self.collectors = tuple(collectors)
+        self.compact = compact or budget_fields is not None
+        self.budget_fields = None if budget_fields is None else tuple(budget_fields)
+
+    @staticmethod
+    def list_accounts(org_structure: Dict[str, Any], active_only: bool = True) -> List[Dict[str, Any]]:
+        """get_org_structure 결과에서 계정 목록을 중복 없이 추출합니다."""
+        accounts = []
+        seen = set()
+        for parent_accounts in org_structure.get('accounts', {}).values():
+            for account in parent_accounts:
+                if account['Id'] in seen:
+                    continue
+                if active_only and account.get('Status', 'ACTIVE') != 'ACTIVE':
+                    continue
+                seen.add(account['Id'])
+                accounts.append(account)
+        return accounts
+
+    def _reader_kwargs(self, account_id: str) -> Dict[str, Any]:
+        return {
+            'role_arn': self.role_arn_template.format(account_id=account_id),
+            'session_name': self.session_name,
+            'external_id': self.external_id,
+            'region': self.region,
+            'profile_name': self.profile_name,
+            'session_manager': self.session_manager
+        }
+
+    def collect_account(self, account: Dict[str, Any], cost_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        한 계정의 예산/비용 데이터를 수집합니다.
+
+        Args:
+            account (Dict[str, Any]): list_accounts_for_parent가 반환한 계정 정보
+            cost_params (Dict[str, Any]): AWSCostExplorer.get_cost_and_usage에 전달할 인자
+
+        Returns:
+            Dict[str, Any]: 계정별 수집 결과 (실패한 수집기는 'errors'에 기록)
+        """
+        account_id = account['Id']
+        result = {
+            'account_id': account_id,
+            'account_name': account.get('Name'),
+            'errors': {}
+        }
+
+        if 'budget' in self.collectors:
+            try:
+                reader = AWSBudgetReader(**self._reader_kwargs(account_id))
+                # describe_budgets는 오류를 삼키므로 제너레이터를 직접 사용하여 오류를 기록
+                budgets = reader.iter_budgets(account_id)
+                result['budgets'] = to_records(Budget, budgets, self.budget_fields) if self.compact else list(budgets)
+            except Exception as e:
+                result['errors']['budget'] = str(e)
+
+        if 'cost' in self.collectors:
+            try:
+                explorer = AWSCostExplorer(**self._reader_kwargs(account_id))
+                result['cost'] = explorer.get_cost_and_usage(**(cost_params or {}))
+            except Exception as e:
+                result['errors']['cost'] = str(e)
+
+        return result
+
+    def run(self, accounts: List[Dict[str, Any]], cost_params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        모든 계정을 최대 max_workers개씩 병렬로 수집하여 하나의 결과로 합칩니다.
+
+        Returns:
+            Dict[str, Any]: {'summary': {...}, 'accounts': [...]} (계정 순서는 입력 순서와 동일)
+        """
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda account: self.collect_account(account, cost_params), accounts))
+        elapsed = time.perf_counter() - started
+
+        failed = sum(1 for result in results if result['errors'])
+        return {
+            'summary': {
+                'accounts': len(results),
+                'succeeded': len(results) - failed,
+                'failed': failed,
+                'collectors': list(self.collectors),
+                'elapsed_seconds': round(elapsed, 3),
+                'accounts_per_second': round(len(results) / elapsed, 2) if elapsed else None
+            },
+            'accounts': results
+        }
+
+def main():
+    today = date.today()
+
+    parser = argparse.ArgumentParser(description='조직의 모든 멤버 계정에 대해 예산/비용 데이터를 병렬로 수집하는 스크립트')
+    parser.add_argument('--role-arn', required=True, help='조직 구조 조회에 사용할 AWS Role ARN')
+    parser.add_argument('--member-role-template', required=True, help="멤버 계정 역할 ARN 템플릿 (예: 'arn:aws:iam::{account_id}:role/ReadOnly')")
+    parser.add_argument('--session-name', required=True, help='Session Name for STS')
+    parser.add_argument('--external-id', required=True, help='External ID for STS')
+    parser.add_argument('--region', default='ap-northeast-2', help='AWS Region (기본값: ap-northeast-2)')
+    parser.add_argument('--profile', default='cmp-sts-user', help='AWS Credentials 프로필 이름 (기본값: cmp-sts-user)')
+    parser.add_argument('--collect', default=','.join(COLLECTORS), help='실행할 수집기 목록 (쉼표 구분, 기본값: budget,cost)')
+    parser.add_argument('--start-date', default=today.replace(day=1).isoformat(), help='비용 조회 시작 날짜 (YYYY-MM-DD, 기본값: 이번 달 1일)')
+    parser.add_argument('--end-date', default=today.isoformat(), help='비용 조회 종료 날짜 (YYYY-MM-DD, 기본값: 오늘)')
+    parser.add_argument('--granularity', default='MONTHLY', choices=['DAILY', 'MONTHLY', 'HOURLY'], help='데이터 세분화 단위')
+    parser.add_argument('--max-workers', type=int, default=16, help='동시에 수집할 계정 수 (기본값: 16)')
+    parser.add_argument('--compact', action='store_true', help='계정/예산을 응답 dict 대신 __slots__ 레코드로 보관하여 메모리 사용량을 줄임 (출력 형식은 같음)')
+    parser.add_argument('--budget-fields', help='예산 항목에 남길 키 목록 (쉼표 구분, 예: BudgetName,BudgetLimit,CalculatedSpend,TimeUnit,BudgetType, 지정하면 --compact 사용)')
+    parser.add_argument('--output', required=True, help='결과를 저장할 JSON 파일 경로')
+
+    args = parser.parse_args()
+
+    try:
+        org_reader = AWSOrgReader(
+            role_arn=args.role_arn,
+            session_name=args.session_name,
+            external_id=args.external_id,
+            region=args.region,
+            profile_name=args.profile
+        )
+        budget_fields = [field.strip() for field in args.budget_fields.split(',')] if args.budget_fields else None
+        accounts = AccountFanout.list_accounts(org_reader.get_org_structure(compact=args.compact or budget_fields is not None))
+        print(f"총 {len(accounts)}개의 계정을 수집합니다.")
+
+        fanout = AccountFanout(
+            role_arn_template=args.member_role_template,
+            session_name=args.session_name,
+            external_id=args.external_id,
+            region=args.region,
+            profile_name=args.profile,
+            max_workers=args.max_workers,
+            collectors=[name.strip() for name in args.collect.split(',') if name.strip()],
+            compact=args.compact,
+            budget_fields=budget_fields
+        )
+        result = fanout.run(accounts, cost_params={
+            'start_date': args.start_date,
+            'end_date': args.end_date,
+            'granularity': args.granularity,
+            'group_by': [{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+        })
+
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+
+        summary = result['summary']
+        print(f"성공 {summary['succeeded']}개, 실패 {summary['failed']}개 ({summary['accounts_per_second']} 계정/초)")
+        print(f"결과가 {args.output}에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+if __name__ == '__main__':
+    main()
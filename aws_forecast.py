@@ -0,0 +1,402 @@
+import argparse
+import json
+import numpy as np
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Any, Tuple
+from aws_cost_explorer import AWSCostExplorer
+from aws_cost_cache import CostCache, DEFAULT_CACHE_PATH
+from aws_cost_table import CostTable, daily_matrix
+from aws_metrics import get_registry
+
+DESCRIPTION = '계정 x 서비스별 비용을 로컬 모델(및 선택한 시계열은 Cost Explorer)로 예측하는 스크립트'
+
+# 로컬 예측 모델
+MODELS = ('seasonal', 'linear', 'mean')
+# get_cost_and_usage 메트릭 이름 -> get_cost_forecast 메트릭 이름
+FORECAST_METRICS = {
+    'UnblendedCost': 'UNBLENDED_COST',
+    'BlendedCost': 'BLENDED_COST',
+    'AmortizedCost': 'AMORTIZED_COST',
+    'NetUnblendedCost': 'NET_UNBLENDED_COST',
+    'NetAmortizedCost': 'NET_AMORTIZED_COST'
+}
+# 시계열 키 컬럼 -> Cost Explorer 필터 차원 (나머지는 컬럼 이름을 그대로 차원으로 사용)
+DIMENSION_COLUMNS = {'account_id': 'LINKED_ACCOUNT'}
+
+def series_filter(keys: List[str], label: List[str]) -> Dict[str, Any]:
+    """시계열 레이블을 get_cost_forecast의 Filter 식으로 변환합니다. (예: LINKED_ACCOUNT And SERVICE)"""
+    expressions = [
+        {'Dimensions': {'Key': DIMENSION_COLUMNS.get(key, key), 'Values': [str(value)]}}
+        for key, value in zip(keys, label)
+    ]
+    return expressions[0] if len(expressions) == 1 else {'And': expressions}
+
+class LocalForecaster:
+    """
+    일 단위 비용 행렬(시계열 x 날짜)의 모든 시계열을 한 번에 예측합니다.
+
+    - seasonal: 최근 history_days일의 선형 추세 + 요일별 계절성 (추세와 요일 더미를 함께 회귀)
+    - linear: 최근 history_days일의 선형 추세
+    - mean: 최근 season_length일 평균을 유지 (이력이 2주기보다 짧으면 모든 모델이 이 방식을 사용)
+
+    추세와 계절성은 닫힌 형태의 최소제곱식으로 계산하므로 시계열별 반복문이 없습니다.
+    """
+
+    def __init__(self, model: str = 'seasonal', history_days: int = 56, season_length: int = 7):
+        """
+        Args:
+            model (str): 예측 모델 ('seasonal', 'linear', 'mean')
+            history_days (int): 모델 학습에 사용할 최근 일수
+            season_length (int): 계절성 주기(일)
+        """
+        if model not in MODELS:
+            raise ValueError(f"알 수 없는 예측 모델: {model} (사용 가능: {', '.join(MODELS)})")
+
+        self.model = model
+        self.history_days = history_days
+        self.season_length = season_length
+
+    def predict(self, values: np.ndarray, horizon: int, model: str = None) -> np.ndarray:
+        """
+        values 다음 날부터 horizon일 동안의 일 단위 비용을 예측합니다.
+
+        Args:
+            values (np.ndarray): 일 단위 비용 행렬 (n, 날짜 수), 마지막 열이 가장 최근 날짜
+            horizon (int): 예측할 일수
+            model (str): 이번 호출에만 사용할 모델 (기본값: 생성 시 지정한 모델)
+
+        Returns:
+            np.ndarray: 예측 행렬 (n, horizon), 음수는 0으로 보정
+        """
+        model = model or self.model
+        n, length = values.shape
+        history = min(self.history_days, length)
+        if history == 0 or horizon <= 0:
+            return np.zeros((n, max(horizon, 0)), dtype=np.float64)
+
+        # 추세를 추정하기에 이력이 짧으면 최근 평균을 유지
+        if model == 'mean' or history < 2 * self.season_length:
+            recent = values[:, -min(self.season_length, history):].mean(axis=1)
+            return np.repeat(recent[:, None], horizon, axis=1)
+
+        y = values[:, length - history:]
+        t = np.arange(history, dtype=np.float64)
+        future = np.arange(history, history + horizon)
+
+        if model == 'seasonal':
+            # 추세 + 요일 더미 회귀의 닫힌 형태: 요일별로 y와 t를 중심화한 뒤 기울기를 구하면
+            # 요일 패턴과 추세가 서로 섞이지 않음 (요일별 평균을 먼저 빼면 추세 일부가 계절성에 흡수됨)
+            # 요일별 관측 수가 같도록 이력을 주기의 배수로 맞춤
+            history -= history % self.season_length
+            y = y[:, -history:]
+            t = np.arange(history, dtype=np.float64)
+            future = np.arange(history, history + horizon)
+            cycles = history // self.season_length
+            y_phase = y.reshape(n, cycles, self.season_length)
+            t_phase = t.reshape(cycles, self.season_length)
+            t_centered = t_phase - t_phase.mean(axis=0)
+            y_centered = y_phase - y_phase.mean(axis=1)[:, None, :]
+            slope = np.einsum('nks,ks->n', y_centered, t_centered) / float((t_centered * t_centered).sum())
+            # 요일별 절편 (n, season_length)
+            level = y_phase.mean(axis=1) - slope[:, None] * t_phase.mean(axis=0)
+            forecast = level[:, future % self.season_length] + slope[:, None] * future
+        else:
+            t_centered = t - t.mean()
+            y_mean = y.mean(axis=1)
+            slope = (y - y_mean[:, None]) @ t_centered / float((t_centered * t_centered).sum())
+            intercept = y_mean - slope * t.mean()
+            forecast = intercept[:, None] + slope[:, None] * future
+        return np.maximum(forecast, 0.0)
+
+    def backtest(self, values: np.ndarray, horizon: int, folds: int = 3) -> Dict[str, Any]:
+        """
+        마지막 folds개의 horizon일 구간을 차례로 숨기고 그 직전까지의 데이터로 예측하여 모델별 정확도를 계산합니다.
+
+        오차는 시계열별 구간 합계 기준이며, wape는 sum|예측 - 실제| / sum(실제), bias는 (sum 예측 - sum 실제) / sum(실제)입니다.
+
+        Returns:
+            Dict[str, Any]: {'horizon', 'folds', 'models': {모델: {'wape', 'bias'}}}
+        """
+        length = values.shape[1]
+        cutoffs = [length - fold * horizon for fold in range(1, folds + 1)]
+        cutoffs = [cutoff for cutoff in cutoffs if cutoff >= 2 * self.season_length]
+
+        models = {}
+        for model in MODELS:
+            absolute_error = forecast_total = actual_total = 0.0
+            for cutoff in cutoffs:
+                actual = values[:, cutoff:cutoff + horizon].sum(axis=1)
+                predicted = self.predict(values[:, :cutoff], horizon, model=model).sum(axis=1)
+                absolute_error += float(np.abs(predicted - actual).sum())
+                forecast_total += float(predicted.sum())
+                actual_total += float(actual.sum())
+            models[model] = {
+                'wape': round(absolute_error / actual_total, 4) if actual_total else None,
+                'bias': round((forecast_total - actual_total) / actual_total, 4) if actual_total else None
+            }
+
+        return {'horizon': horizon, 'folds': len(cutoffs), 'models': models}
+
+class CostForecastEngine:
+    """
+    (계정 x 서비스) 등 여러 비용 시계열의 예측을 한 번에 계산합니다.
+
+    - 로컬 예측: 캐시된 일 단위 비용 이력으로 LocalForecaster가 모든 시계열을 행렬 연산으로 예측 (API 호출 없음)
+    - Cost Explorer 예측: 선택한 시계열만 Filter를 지정한 get_cost_forecast를 스레드 풀로 요청
+      (클라이언트의 속도 제한기를 공유하므로 동시 요청 수와 관계없이 CE 호출 속도 제한을 지킴)
+    - 비교: 두 예측이 모두 있는 시계열로 로컬 예측과 CE 예측의 차이를 계산
+    """
+
+    def __init__(self, forecaster: LocalForecaster = None, explorer: AWSCostExplorer = None, metric: str = 'UnblendedCost', max_workers: int = 8):
+        """
+        Args:
+            forecaster (LocalForecaster): 로컬 예측 모델 (기본값: seasonal)
+            explorer (AWSCostExplorer): CE 예측에 사용할 조회기 (None이면 로컬 예측만 가능)
+            metric (str): 비용 메트릭 (get_cost_and_usage 이름)
+            max_workers (int): CE 예측을 동시에 요청할 최대 개수
+        """
+        if metric not in FORECAST_METRICS:
+            raise ValueError(f"예측을 지원하지 않는 메트릭: {metric}")
+
+        self.forecaster = forecaster or LocalForecaster()
+        self.explorer = explorer
+        self.metric = metric
+        self.max_workers = max(1, max_workers)
+        self.metrics = get_registry()
+
+    def ce_forecasts(self, keys: List[str], labels: np.ndarray, start_date: str, end_date: str) -> Tuple[np.ndarray, Dict[int, str]]:
+        """
+        시계열별로 Filter를 지정한 get_cost_forecast를 병렬로 요청합니다.
+
+        Returns:
+            Tuple[np.ndarray, Dict[int, str]]: (시계열별 예측 합계 (실패 시 nan), 실패한 행 번호별 오류 메시지)
+        """
+        if self.explorer is None:
+            raise ValueError("Cost Explorer 예측을 사용하려면 explorer를 지정해야 합니다.")
+
+        def fetch(label: List[str]) -> float:
+            response = self.explorer.get_cost_forecast(
+                start_date=start_date,
+                end_date=end_date,
+                metric=FORECAST_METRICS[self.metric],
+                granularity='MONTHLY',
+                filter=series_filter(keys, label)
+            )
+            return float(response['Total']['Amount'])
+
+        totals = np.full(len(labels), np.nan, dtype=np.float64)
+        errors: Dict[int, str] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(fetch, label) for label in labels.tolist()]
+            for index, future in enumerate(futures):
+                try:
+                    totals[index] = future.result()
+                except Exception as e:
+                    errors[index] = str(e)
+        return totals, errors
+
+    @staticmethod
+    def compare(local: np.ndarray, ce: np.ndarray) -> Dict[str, Any]:
+        """두 예측이 모두 있는 시계열에 대해 CE 예측 대비 로컬 예측의 차이를 계산합니다."""
+        both = ~np.isnan(ce)
+        local, ce = local[both], ce[both]
+        ce_total = float(ce.sum())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative = np.abs(local - ce) / ce
+        relative = relative[np.isfinite(relative)]
+        return {
+            'series': int(both.sum()),
+            'wape': round(float(np.abs(local - ce).sum()) / ce_total, 4) if ce_total else None,
+            'bias': round((float(local.sum()) - ce_total) / ce_total, 4) if ce_total else None,
+            'median_abs_pct_diff': round(float(np.median(relative)) * 100, 2) if len(relative) else None
+        }
+
+    def forecast(
+        self,
+        table: CostTable,
+        start_date: str,
+        end_date: str,
+        keys: List[str] = ('LINKED_ACCOUNT', 'SERVICE'),
+        ce_series: int = 0,
+        backtest_folds: int = 0
+    ) -> Dict[str, Any]:
+        """
+        CostTable의 일 단위 비용 이력으로 start_date..end_date(종료일 제외) 기간의 비용을 시계열별로 예측합니다.
+
+        Args:
+            table (CostTable): DAILY 비용 테이블 (keys 컬럼 포함, 첫 번째 키는 계정 ID)
+            start_date (str): 예측 시작 날짜 (YYYY-MM-DD, 이력은 전날까지 사용)
+            end_date (str): 예측 종료 날짜 (YYYY-MM-DD)
+            keys (List[str]): 시계열을 구분할 컬럼
+            ce_series (int): 이력 비용이 큰 순서로 CE 예측도 요청할 시계열 수 (0이면 요청하지 않음, 음수이면 전체)
+            backtest_folds (int): 로컬 모델 백테스트 구간 수 (0이면 실행하지 않음)
+
+        Returns:
+            Dict[str, Any]: {'period', 'model', 'summary', 'accounts': [...], 'series': [...], 'ce_comparison', 'backtest'}
+        """
+        keys = list(keys)
+        start = date.fromisoformat(start_date)
+        horizon = (date.fromisoformat(end_date) - start).days
+        if horizon <= 0:
+            raise ValueError("예측 종료 날짜는 시작 날짜보다 뒤여야 합니다.")
+
+        started = time.perf_counter()
+        with self.metrics.timed('forecast.local'):
+            labels, periods, matrix = table.series(keys, self.metric)
+            _, values = daily_matrix(periods, matrix, start - timedelta(days=1))
+            local = self.forecaster.predict(values, horizon).sum(axis=1)
+            history_total = values[:, -self.forecaster.history_days:].sum(axis=1)
+        local_seconds = time.perf_counter() - started
+
+        ce = np.full(len(labels), np.nan, dtype=np.float64)
+        errors: Dict[int, str] = {}
+        selected = np.argsort(-history_total, kind='stable')
+        if ce_series >= 0:
+            selected = selected[:ce_series]
+        if len(selected):
+            ce[selected], selected_errors = self.ce_forecasts(keys, labels[selected], start_date, end_date)
+            errors = {int(selected[index]): message for index, message in selected_errors.items()}
+
+        account_ids, account_index = np.unique(labels[:, 0].astype(str), return_inverse=True) if len(labels) else (np.array([], dtype=str), np.array([], dtype=np.int64))
+        account_totals = np.bincount(account_index, weights=local, minlength=len(account_ids))
+
+        series = []
+        for index, (label, forecast) in enumerate(zip(labels.tolist(), local.tolist())):
+            record = dict(zip(keys, label))
+            record['forecast'] = round(forecast, 4)
+            if not np.isnan(ce[index]):
+                record['ce_forecast'] = round(float(ce[index]), 4)
+            if index in errors:
+                record['ce_error'] = errors[index]
+            series.append(record)
+
+        return {
+            'period': {'start': start_date, 'end': end_date},
+            'model': self.forecaster.model,
+            'summary': {
+                'series': len(series),
+                'accounts': len(account_ids),
+                'forecast_total': round(float(local.sum()), 4),
+                'local_seconds': round(local_seconds, 4),
+                'ce_requests': int(len(selected)),
+                'ce_errors': len(errors)
+            },
+            'accounts': [
+                {keys[0]: account_id, 'forecast': round(total, 4)}
+                for account_id, total in zip(account_ids.tolist(), account_totals.tolist())
+            ],
+            'series': series,
+            'ce_comparison': self.compare(local, ce) if len(selected) else None,
+            'backtest': self.forecaster.backtest(values, horizon, backtest_folds) if backtest_folds > 0 else None
+        }
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """명령행 인자를 parser에 추가합니다. (cli.py의 하위 명령과 공유)"""
+    today = date.today()
+    next_month = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+    parser.add_argument('--input', help='aws_fanout.py 결과 JSON 파일 (--granularity DAILY로 수집, 지정하면 이력을 조회하지 않음)')
+    parser.add_argument('--role-arn', help='AWS Role ARN (관리 계정, 이력 조회 및 CE 예측에 사용)')
+    parser.add_argument('--session-name', help='Session Name for STS')
+    parser.add_argument('--external-id', help='External ID for STS')
+    parser.add_argument('--region', default='ap-northeast-2', help='AWS Region (기본값: ap-northeast-2)')
+    parser.add_argument('--profile', default='cmp-sts-user', help='AWS Credentials 프로필 이름 (기본값: cmp-sts-user)')
+    parser.add_argument('--start-date', default=today.isoformat(), help='예측 시작 날짜 (YYYY-MM-DD, 기본값: 오늘)')
+    parser.add_argument('--end-date', default=next_month.isoformat(), help='예측 종료 날짜 (YYYY-MM-DD, 기본값: 다음 달 1일)')
+    parser.add_argument('--history-days', type=int, default=56, help='모델 학습에 사용할 최근 일수 (기본값: 56)')
+    parser.add_argument('--model', default='seasonal', choices=MODELS, help='로컬 예측 모델 (기본값: seasonal)')
+    parser.add_argument('--metric', default='UnblendedCost', choices=sorted(FORECAST_METRICS), help='비용 메트릭 (기본값: UnblendedCost)')
+    parser.add_argument('--ce-series', type=int, default=0, help='이력 비용이 큰 순서로 CE 예측도 요청하여 비교할 시계열 수 (-1이면 전체, 기본값: 0)')
+    parser.add_argument('--backtest-folds', type=int, default=0, help='로컬 모델 백테스트 구간 수 (기본값: 0, 실행하지 않음)')
+    parser.add_argument('--max-workers', type=int, default=8, help='CE 예측을 동시에 요청할 최대 개수 (기본값: 8)')
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help=f'응답 캐시 파일 경로 (기본값: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='응답 캐시를 사용하지 않음')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로 (지정하지 않으면 요약만 출력)')
+    parser.add_argument('--stats', action='store_true', help='종료 시 API 작업별 호출 수/지연 시간/수신 바이트 통계를 stderr로 출력')
+    parser.add_argument('--metrics-file', help='작업별 통계를 Prometheus 텍스트 형식으로 저장할 파일 경로')
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    from aws_budget_analysis import load_fanout_result
+
+    metrics = get_registry()
+
+    needs_explorer = args.input is None or args.ce_series != 0
+    if needs_explorer and not (args.role_arn and args.session_name and args.external_id):
+        parser.error('--input 없이 실행하거나 --ce-series를 지정하려면 --role-arn, --session-name, --external-id가 필요합니다.')
+
+    try:
+        explorer = None
+        if needs_explorer:
+            explorer = AWSCostExplorer(
+                role_arn=args.role_arn,
+                session_name=args.session_name,
+                external_id=args.external_id,
+                region=args.region,
+                profile_name=args.profile,
+                cache=None if args.no_cache else CostCache(args.cache_path)
+            )
+
+        if args.input:
+            with open(args.input, encoding='utf-8') as f:
+                table, _ = load_fanout_result(json.load(f))
+            keys = ['account_id', 'SERVICE']
+        else:
+            # 관리 계정에서 조직 전체의 계정 x 서비스 일 단위 이력을 한 번에 조회 (확정된 지난달 구간은 캐시에서 읽음)
+            history_start = date.fromisoformat(args.start_date) - timedelta(days=args.history_days)
+            response = explorer.get_cost_and_usage(
+                start_date=history_start.isoformat(),
+                end_date=args.start_date,
+                granularity='DAILY',
+                metrics=[args.metric],
+                group_by=[{'Type': 'DIMENSION', 'Key': 'LINKED_ACCOUNT'}, {'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+            )
+            table = CostTable.from_response(response)
+            keys = ['LINKED_ACCOUNT', 'SERVICE']
+
+        engine = CostForecastEngine(
+            forecaster=LocalForecaster(model=args.model, history_days=args.history_days),
+            explorer=explorer,
+            metric=args.metric,
+            max_workers=args.max_workers
+        )
+        result = engine.forecast(
+            table,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            keys=keys,
+            ce_series=args.ce_series,
+            backtest_folds=args.backtest_folds
+        )
+
+        summary = result['summary']
+        print(f"{args.start_date} ~ {args.end_date} 예측: 시계열 {summary['series']}개, 계정 {summary['accounts']}개, 합계 {summary['forecast_total']:.2f} ({summary['local_seconds']}초)")
+        if result['ce_comparison']:
+            comparison = result['ce_comparison']
+            print(f"CE 예측 {summary['ce_requests']}개 요청 (실패 {summary['ce_errors']}개), CE 대비 WAPE {comparison['wape']}, 편향 {comparison['bias']}")
+        if result['backtest']:
+            for model, accuracy in result['backtest']['models'].items():
+                print(f"- 백테스트 {model}: WAPE {accuracy['wape']}, 편향 {accuracy['bias']}")
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f, metrics.timed('json.serialize'):
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            print(f"결과가 {args.output}에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+    finally:
+        if args.stats:
+            metrics.print_summary()
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser, parser.parse_args())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+import bisect
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Optional, TextIO
+
+# 지연 시간 히스토그램 버킷 상한(초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class OperationMetrics:
+    """작업 하나의 호출 수, 오류/재시도 수, 수신 바이트와 지연 시간 히스토그램입니다."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def quantile(self, q: float) -> float:
+        """히스토그램에서 분위수를 추정합니다. (해당 버킷의 상한, 마지막 버킷은 최댓값)"""
+        if self.calls == 0:
+            return 0.0
+        rank = q * self.calls
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes_received': self.bytes_received,
+            'total_seconds': round(self.total_seconds, 6),
+            'avg_ms': round(self.total_seconds / self.calls * 1000, 3) if self.calls else 0.0,
+            'p50_ms': round(self.quantile(0.5) * 1000, 3),
+            'p95_ms': round(self.quantile(0.95) * 1000, 3),
+            'max_ms': round(self.max_seconds * 1000, 3)
+        }
+
+class MetricsRegistry:
+    """
+    작업별 지연 시간/호출 수/수신 바이트/재시도/오류를 기록합니다. (스레드 안전)
+
+    add_hook으로 등록한 콜백은 기록할 때마다 이벤트 dict를 받습니다.
+    (예: {'operation': 'ce.get_cost_and_usage', 'seconds': 0.21, 'bytes_received': 5120, 'error': None, 'retry': False})
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._operations: Dict[str, OperationMetrics] = {}
+        self._hooks: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """기록 이벤트를 받을 콜백을 등록합니다."""
+        with self._lock:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        with self._lock:
+            self._hooks.remove(hook)
+
+    def observe(self, operation: str, seconds: float, bytes_received: int = 0, error: Optional[Exception] = None, retry: bool = False) -> None:
+        """
+        작업 한 번(재시도라면 시도 한 번)의 결과를 기록합니다.
+
+        Args:
+            operation (str): 작업 이름 (예: 'ce.get_cost_and_usage', 'sts.assume_role')
+            seconds (float): 걸린 시간(초)
+            bytes_received (int): 수신한 응답 크기(바이트)
+            error (Exception): 실패한 경우 발생한 예외
+            retry (bool): 재시도로 실행된 시도인지 여부
+        """
+        with self._lock:
+            entry = self._operations.get(operation)
+            if entry is None:
+                entry = self._operations[operation] = OperationMetrics(self.buckets)
+            entry.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            entry.calls += 1
+            entry.total_seconds += seconds
+            if seconds > entry.max_seconds:
+                entry.max_seconds = seconds
+            entry.bytes_received += bytes_received
+            if error is not None:
+                entry.errors += 1
+            if retry:
+                entry.retries += 1
+            hooks = self._hooks
+
+        if hooks:
+            event = {'operation': operation, 'seconds': seconds, 'bytes_received': bytes_received, 'error': error, 'retry': retry}
+            for hook in hooks:
+                hook(event)
+
+    @contextmanager
+    def timed(self, operation: str) -> Iterator[None]:
+        """with 블록의 실행 시간을 operation으로 기록합니다. (예외가 발생하면 오류로 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.observe(operation, time.perf_counter() - start, error=e)
+            raise
+        self.observe(operation, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """작업별 누적 통계를 반환합니다."""
+        with self._lock:
+            return {operation: entry.as_dict() for operation, entry in sorted(self._operations.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def format_table(self) -> str:
+        """작업별 통계를 사람이 읽기 쉬운 표로 만듭니다."""
+        header = ('operation', 'calls', 'errors', 'retries', 'bytes', 'avg_ms', 'p50_ms', 'p95_ms', 'max_ms')
+        rows = [header]
+        for operation, stats in self.snapshot().items():
+            rows.append((operation,) + tuple(str(stats[key]) for key in ('calls', 'errors', 'retries', 'bytes_received', 'avg_ms', 'p50_ms', 'p95_ms', 'max_ms')))
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = []
+        for index, row in enumerate(rows):
+            lines.append('  '.join(value.ljust(widths[0]) if i == 0 else value.rjust(widths[i]) for i, value in enumerate(row)))
+            if index == 0:
+                lines.append('  '.join('-' * width for width in widths))
+        return '\n'.join(lines)
+
+    def to_prometheus(self, prefix: str = 'aws_client') -> str:
+        """Prometheus 텍스트 노출 형식으로 변환합니다."""
+        with self._lock:
+            operations = [(operation, entry.as_dict(), list(entry.counts), entry.total_seconds) for operation, entry in sorted(self._operations.items())]
+
+        lines = [
+            f'# HELP {prefix}_operation_duration_seconds Operation latency in seconds.',
+            f'# TYPE {prefix}_operation_duration_seconds histogram'
+        ]
+        for operation, _, counts, total_seconds in operations:
+            label = f'operation="{operation}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{prefix}_operation_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{prefix}_operation_duration_seconds_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'{prefix}_operation_duration_seconds_sum{{{label}}} {total_seconds}')
+            lines.append(f'{prefix}_operation_duration_seconds_count{{{label}}} {cumulative}')
+
+        for name, key, description in (
+            ('operation_errors_total', 'errors', 'Failed operation attempts.'),
+            ('operation_retries_total', 'retries', 'Retried operation attempts.'),
+            ('operation_received_bytes_total', 'bytes_received', 'Response bytes received.')
+        ):
+            lines.append(f'# HELP {prefix}_{name} {description}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for operation, stats, _, _ in operations:
+                lines.append(f'{prefix}_{name}{{operation="{operation}"}} {stats[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str, prefix: str = 'aws_client') -> None:
+        """node_exporter textfile collector 등에서 읽을 수 있도록 파일로 저장합니다."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus(prefix))
+
+    def print_summary(self, file: TextIO = None) -> None:
+        """통계 표를 출력합니다. (기본값: stderr, stdout의 JSON 출력과 섞이지 않도록)"""
+        print('\n=== 작업별 통계 ===', file=file or sys.stderr)
+        print(self.format_table(), file=file or sys.stderr)
+
+def response_size(response: Any) -> int:
+    """boto3 응답의 HTTP content-length 헤더 값을 반환합니다. (없으면 0)"""
+    if not isinstance(response, dict):
+        return 0
+    headers = response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    try:
+        return int(headers.get('content-length', 0))
+    except (TypeError, ValueError):
+        return 0
+
+# 프로세스 전체에서 공유하는 기본 레지스트리
+_default_registry = MetricsRegistry()
+
+def get_registry() -> MetricsRegistry:
+    """프로세스 전체에서 공유하는 기본 레지스트리를 반환합니다."""
+    return _default_registry
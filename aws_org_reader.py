@@ -1,69 +1,80 @@
-import boto3
 import argparse
 import json
-from typing import Dict, List, Any
-import configparser
-import os
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from aws_session import AWSSessionManager, get_session_manager
+from aws_rate_limiter import RateLimitExceeded
+from aws_pagination import PaginationStats, iter_items
+from aws_records import Record, Root, OU, Account, to_records
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, datetime):
             return obj.isoformat()
+        if isinstance(obj, Record):
+            return obj.to_dict()
         return super().default(obj)
 
 class AWSOrgReader:
-    def __init__(self, role_arn: str, session_name: str, external_id: str, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user'):
-        # AWS 자격 증명 파일에서 프로필 읽기
-        config = configparser.ConfigParser()
-        credentials_path = os.path.join(os.getcwd(), '.aws', 'credentials')
-        
-        # 디버깅을 위한 파일 경로 출력
-        #print(f"자격 증명 파일 경로: {credentials_path}")
-        #print(f"파일 존재 여부: {os.path.exists(credentials_path)}")
-        
-        if not os.path.exists(credentials_path):
-            raise ValueError(f"자격 증명 파일을 찾을 수 없습니다: {credentials_path}")
-            
-        config.read(credentials_path)
-        
-        # 디버깅을 위한 프로필 목록 출력
-        #print(f"사용 가능한 프로필: {config.sections()}")
-        
-        if profile_name not in config:
-            raise ValueError(f"프로필 '{profile_name}'을(를) .aws/credentials 파일에서 찾을 수 없습니다.")
-            
-        # STS 클라이언트 생성
-        sts_client = boto3.client(
-            'sts',
-            aws_access_key_id=config[profile_name]['aws_access_key_id'],
-            aws_secret_access_key=config[profile_name]['aws_secret_access_key'],
-            region_name=region
-        )
-        
-        # 역할 가정
-        assumed_role = sts_client.assume_role(
-            RoleArn=role_arn,
-            RoleSessionName=session_name,
-            ExternalId=external_id
-        )
+    def __init__(self, role_arn: str, session_name: str, external_id: str, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user', session_manager: AWSSessionManager = None):
+        # 세션 매니저와 클라이언트는 첫 API 호출 시점에 준비 (캐시 적중/인자 오류 시 boto3 import와 AssumeRole 생략)
+        self.session_manager = session_manager
+        self._profile_name = profile_name
+        self._client_kwargs = {
+            'role_arn': role_arn,
+            'session_name': session_name,
+            'external_id': external_id,
+            'region': region
+        }
+        self._client = None
+
+        # API 작업별 페이지/항목 수 통계
+        self.pagination_stats = PaginationStats()
 
-        credentials = assumed_role['Credentials']
+    @property
+    def client(self):
+        """캐시된 임시 자격 증명으로 만든 organizations 클라이언트 (처음 사용할 때 생성, 만료 전 자동 갱신)"""
+        if self._client is None:
+            # 세션 매니저를 지정하지 않으면 (region, profile) 별로 공유되는 매니저 사용
+            if self.session_manager is None:
+                self.session_manager = get_session_manager(region=self._client_kwargs['region'], profile_name=self._profile_name)
+            self._client = self.session_manager.get_client('organizations', **self._client_kwargs)
+        return self._client
 
-        # 임시 자격 증명으로 organizations 클라이언트 생성
-        self.client = boto3.client(
-            'organizations',
-            aws_access_key_id=credentials['AccessKeyId'],
-            aws_secret_access_key=credentials['SecretAccessKey'],
-            aws_session_token=credentials['SessionToken'],
-            region_name=region
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
+    def iter_roots(self) -> Iterator[Dict[str, Any]]:
+        """조직의 루트 정보를 페이지 단위로 가져오는 제너레이터입니다."""
+        return iter_items(self.client.list_roots, 'Roots', stats=self.pagination_stats)
+
+    def iter_ous_for_parent(self, parent_id: str) -> Iterator[Dict[str, Any]]:
+        """특정 부모 ID에 속한 OU 목록을 페이지 단위로 가져오는 제너레이터입니다."""
+        return iter_items(
+            self.client.list_organizational_units_for_parent,
+            'OrganizationalUnits',
+            stats=self.pagination_stats,
+            ParentId=parent_id
+        )
+
+    def iter_accounts_for_parent(self, parent_id: str) -> Iterator[Dict[str, Any]]:
+        """특정 부모 ID에 속한 계정 목록을 페이지 단위로 가져오는 제너레이터입니다."""
+        return iter_items(
+            self.client.list_accounts_for_parent,
+            'Accounts',
+            stats=self.pagination_stats,
+            ParentId=parent_id
         )
 
     def get_roots(self) -> List[Dict[str, Any]]:
         """조직의 루트 정보를 가져옵니다."""
         try:
-            response = self.client.list_roots()
-            return response.get('Roots', [])
+            return list(self.iter_roots())
+        except RateLimitExceeded:
+            # 스로틀링으로 데이터가 누락된 것을 빈 결과로 숨기지 않음
+            raise
         except Exception as e:
             print(f"루트 정보 조회 중 오류 발생: {str(e)}")
             return []
@@ -71,8 +82,9 @@ class AWSOrgReader:
     def get_ous_for_parent(self, parent_id: str) -> List[Dict[str, Any]]:
         """특정 부모 ID에 속한 OU 목록을 가져옵니다."""
         try:
-            response = self.client.list_organizational_units_for_parent(ParentId=parent_id)
-            return response.get('OrganizationalUnits', [])
+            return list(self.iter_ous_for_parent(parent_id))
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"OU 목록 조회 중 오류 발생: {str(e)}")
             return []
@@ -80,14 +92,78 @@ class AWSOrgReader:
     def get_accounts_for_parent(self, parent_id: str) -> List[Dict[str, Any]]:
         """특정 부모 ID에 속한 계정 목록을 가져옵니다."""
         try:
-            response = self.client.list_accounts_for_parent(ParentId=parent_id)
-            return response.get('Accounts', [])
+            return list(self.iter_accounts_for_parent(parent_id))
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             print(f"계정 목록 조회 중 오류 발생: {str(e)}")
             return []
 
-    def get_org_structure(self) -> Dict[str, Any]:
-        """전체 조직 구조를 재귀적으로 가져옵니다."""
+    def iter_children(self, roots: List[Dict[str, Any]], max_workers: int = 8, strict: bool = False) -> Iterator[Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        루트부터 레벨 단위(BFS)로 내려가며 부모별 (parent_id, OU 목록, 계정 목록)을 반환하는 제너레이터입니다.
+
+        각 레벨(frontier)에 속한 부모들의 OU/계정 목록을 스레드 풀에서 병렬로 조회하며,
+        부모의 조회가 끝나는 대로 제출 순서대로 반환합니다.
+
+        Args:
+            roots (List[Dict[str, Any]]): get_roots가 반환한 루트 목록
+            max_workers (int): 동시에 실행할 API 호출 수 (1이면 순차 조회)
+            strict (bool): True이면 목록 조회 오류를 빈 목록으로 바꾸지 않고 그대로 전파
+        """
+        if strict:
+            list_ous = lambda parent_id: list(self.iter_ous_for_parent(parent_id))
+            list_accounts = lambda parent_id: list(self.iter_accounts_for_parent(parent_id))
+        else:
+            list_ous, list_accounts = self.get_ous_for_parent, self.get_accounts_for_parent
+
+        frontier = [root['Id'] for root in roots]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while frontier:
+                ou_futures = [executor.submit(list_ous, parent_id) for parent_id in frontier]
+                account_futures = [executor.submit(list_accounts, parent_id) for parent_id in frontier]
+
+                next_frontier = []
+                # 제출 순서대로 결과를 반환하여 출력 순서를 일정하게 유지
+                for parent_id, ou_future, account_future in zip(frontier, ou_futures, account_futures):
+                    ous = ou_future.result()
+                    next_frontier.extend(ou['Id'] for ou in ous)
+                    yield parent_id, ous, account_future.result()
+                frontier = next_frontier
+
+    def iter_org_structure(self, max_workers: int = 8) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        조직 구조를 (레코드 종류, 부모 ID, 항목) 단위로 조회되는 즉시 반환하는 제너레이터입니다.
+
+        레코드 종류는 'root', 'ou', 'account'이며 루트의 부모 ID는 None입니다.
+        """
+        roots = self.get_roots()
+        for root in roots:
+            yield 'root', None, root
+
+        for parent_id, ous, accounts in self.iter_children(roots, max_workers):
+            for ou in ous:
+                yield 'ou', parent_id, ou
+            for account in accounts:
+                yield 'account', parent_id, account
+
+    def get_org_structure(self, max_workers: int = 8, compact: bool = False, account_fields: Iterable[str] = None, strict: bool = False) -> Dict[str, Any]:
+        """
+        전체 조직 구조를 레벨 단위(BFS)로 가져옵니다.
+
+        Args:
+            max_workers (int): 동시에 실행할 API 호출 수 (1이면 순차 조회)
+            compact (bool): 루트/OU/계정을 응답 dict 대신 __slots__ 레코드(Root/OU/Account)로 보관
+                (부모별 응답을 받는 즉시 변환하므로 대규모 조직의 메모리 사용량이 줄어듦)
+            account_fields (Iterable[str]): 계정 레코드에 남길 키 (예: ['Id', 'Name', 'Status'], 지정하면 compact 사용)
+            strict (bool): True이면 루트/OU/계정 목록 조회 오류를 빈 목록으로 바꾸지 않고 그대로 전파
+                (일부가 빠진 결과를 완전한 조직 구조로 오인하면 안 되는 경우, 예: 스냅샷 저장소 기록)
+
+        Returns:
+            Dict[str, Any]: {'roots': [...], 'ous': {parent_id: [...]}, 'accounts': {parent_id: [...]}}
+            (레코드도 JSON 직렬화 결과는 dict와 같음)
+        """
+        compact = compact or account_fields is not None
         org_structure = {
             'roots': [],
             'ous': {},
@@ -95,27 +171,16 @@ class AWSOrgReader:
         }
 
         # 루트 정보 가져오기
-        roots = self.get_roots()
+        roots = list(self.iter_roots()) if strict else self.get_roots()
         #print(f"roots={roots}")
-        org_structure['roots'] = roots
+        org_structure['roots'] = to_records(Root, roots) if compact else roots
 
-        # 각 루트에 대해 OU와 계정 정보 수집
-        for root in roots:
-            root_id = root['Id']
-            self._collect_ou_and_accounts(root_id, org_structure)
+        # 루트부터 시작하여 레벨 단위로 OU와 계정 정보 수집
+        for parent_id, ous, accounts in self.iter_children(roots, max_workers, strict=strict):
+            if compact:
+                ous = to_records(OU, ous)
+                accounts = to_records(Account, accounts, account_fields)
+            org_structure['ous'][parent_id] = ous
+            org_structure['accounts'][parent_id] = accounts
 
         return org_structure
-
-    def _collect_ou_and_accounts(self, parent_id: str, org_structure: Dict[str, Any]) -> None:
-        """재귀적으로 OU와 계정 정보를 수집합니다."""
-        # OU 목록 가져오기
-        ous = self.get_ous_for_parent(parent_id)
-        org_structure['ous'][parent_id] = ous
-
-        # 계정 목록 가져오기
-        accounts = self.get_accounts_for_parent(parent_id)
-        org_structure['accounts'][parent_id] = accounts
-
-        # 각 OU에 대해 재귀적으로 정보 수집
-        for ou in ous:
-            self._collect_ou_and_accounts(ou['Id'], org_structure)
\ No newline at end of file
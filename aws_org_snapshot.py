@@ -0,0 +1,289 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+from aws_org_reader import AWSOrgReader
+from aws_output import dumps
+
+DEFAULT_SNAPSHOT_PATH = os.path.join('.cache', 'org_snapshot.sqlite3')
+# 경로 접두사 범위 검색의 상한 (path >= prefix AND path < prefix + _PATH_END)
+_PATH_END = '\uffff'
+
+def _children_hash(ous: List[Dict[str, Any]], accounts: List[Dict[str, Any]]) -> str:
+    return hashlib.sha1(json.dumps([ous, accounts], sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class OrgSnapshot:
+    """
+    조직 구조를 SQLite 파일에 저장하고 색인된 조회를 제공합니다.
+
+    각 노드(루트/OU/계정)는 루트부터 자신까지의 ID 경로('/r-xxxx/ou-a/ou-b/')를 함께 저장하므로
+    - 계정의 상위 체인 조회는 O(depth)
+    - OU 하위의 모든 계정 조회는 경로 접두사 범위 검색(색인 사용)
+    - 이름/이메일로 계정 조회는 색인 검색
+    으로 처리되며, 다른 프로세스에서도 조직을 다시 조회하지 않고 사용할 수 있습니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS nodes ('
+            'id TEXT PRIMARY KEY, type TEXT NOT NULL, parent_id TEXT, name TEXT, email TEXT, '
+            'path TEXT NOT NULL, data TEXT NOT NULL, fetched_at REAL, children_hash TEXT);'
+            'CREATE INDEX IF NOT EXISTS nodes_parent ON nodes (parent_id);'
+            'CREATE INDEX IF NOT EXISTS nodes_path ON nodes (path);'
+            'CREATE INDEX IF NOT EXISTS nodes_name ON nodes (name COLLATE NOCASE);'
+            'CREATE INDEX IF NOT EXISTS nodes_email ON nodes (email COLLATE NOCASE);'
+        )
+        self._conn.commit()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._is_empty()
+
+    def _is_empty(self) -> bool:
+        return self._conn.execute('SELECT 1 FROM nodes LIMIT 1').fetchone() is None
+
+    def _upsert(self, node_type: str, item: Dict[str, Any], parent_id: Optional[str], path: str) -> None:
+        self._conn.execute(
+            'INSERT INTO nodes (id, type, parent_id, name, email, path, data) VALUES (?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(id) DO UPDATE SET type = excluded.type, parent_id = excluded.parent_id, name = excluded.name, '
+            'email = excluded.email, path = excluded.path, data = excluded.data',
+            (item['Id'], node_type, parent_id, item.get('Name'), item.get('Email'), path, dumps(item))
+        )
+
+    def _path_of(self, node_id: str) -> Optional[str]:
+        row = self._conn.execute('SELECT path FROM nodes WHERE id = ?', (node_id,)).fetchone()
+        return row[0] if row else None
+
+    def _move_subtree(self, old_prefix: str, new_prefix: str) -> None:
+        """경로 접두사가 바뀐 하위 노드들의 경로를 갱신합니다. (OU 이동)"""
+        self._conn.execute(
+            'UPDATE nodes SET path = ? || substr(path, ?) WHERE path > ? AND path < ?',
+            (new_prefix, len(old_prefix) + 1, old_prefix, old_prefix + _PATH_END)
+        )
+
+    def _delete_subtree(self, prefix: str) -> int:
+        return self._conn.execute('DELETE FROM nodes WHERE path >= ? AND path < ?', (prefix, prefix + _PATH_END)).rowcount
+
+    def _apply_children(self, parent_id: str, ous: List[Dict[str, Any]], accounts: List[Dict[str, Any]], now: float, stats: Dict[str, int]) -> List[str]:
+        """
+        부모의 자식 목록을 반영하고 새로 추가된 OU ID 목록(하위를 조회해야 하는 OU)을 반환합니다.
+
+        자식 목록이 바뀌지 않았으면 조회 시각만 갱신합니다.
+        """
+        children_hash = _children_hash(ous, accounts)
+        row = self._conn.execute('SELECT path, children_hash FROM nodes WHERE id = ?', (parent_id,)).fetchone()
+        if row is None:
+            return []
+        parent_path, previous_hash = row
+        if previous_hash == children_hash:
+            self._conn.execute('UPDATE nodes SET fetched_at = ? WHERE id = ?', (now, parent_id))
+            return []
+
+        stats['parents_changed'] += 1
+        new_ids = {item['Id'] for item in ous + accounts}
+        for (child_id, child_path) in self._conn.execute('SELECT id, path FROM nodes WHERE parent_id = ?', (parent_id,)).fetchall():
+            if child_id not in new_ids:
+                stats['nodes_removed'] += self._delete_subtree(child_path)
+
+        unexplored = []
+        for node_type, items in (('ou', ous), ('account', accounts)):
+            for item in items:
+                path = f"{parent_path}{item['Id']}/"
+                old_path = self._path_of(item['Id'])
+                if old_path is None:
+                    stats['nodes_added'] += 1
+                    if node_type == 'ou':
+                        unexplored.append(item['Id'])
+                elif old_path != path:
+                    self._move_subtree(old_path, path)
+                self._upsert(node_type, item, parent_id, path)
+
+        self._conn.execute('UPDATE nodes SET fetched_at = ?, children_hash = ? WHERE id = ?', (now, children_hash, parent_id))
+        return unexplored
+
+    def refresh(self, reader: AWSOrgReader, ttl_seconds: float = 3600, max_workers: int = 8) -> Dict[str, int]:
+        """
+        조회한 지 ttl_seconds가 지난 부모만 다시 조회하여 스냅샷을 갱신합니다.
+
+        스냅샷이 비어 있으면 루트부터 전체를 조회합니다. 자식 목록이 바뀐 부모만 노드를 갱신하고,
+        새로 생긴 OU는 하위까지 조회합니다. 다른 부모로 이동한 노드는 새 부모가 갱신될 때 다시 나타납니다.
+
+        자식 목록 조회에 실패한 부모는 빈 목록으로 간주하지 않고 건너뜁니다. (기존 하위 노드 유지,
+        조회 시각을 갱신하지 않으므로 다음 갱신에서 다시 조회) API 조회 중에는 잠금을 잡지 않으며,
+        레벨별 조회 결과를 반영할 때만 잠급니다.
+
+        Returns:
+            Dict[str, int]: {'parents_checked', 'parents_changed', 'parents_failed', 'nodes_added', 'nodes_removed'}
+        """
+        stats = {'parents_checked': 0, 'parents_changed': 0, 'parents_failed': 0, 'nodes_added': 0, 'nodes_removed': 0}
+        now = time.time()
+
+        if self.is_empty():
+            # 루트 조회 실패는 그대로 전파 (빈 스냅샷을 빈 조직으로 채우지 않음)
+            roots = list(reader.iter_roots())
+            with self._lock:
+                if self._is_empty():
+                    for root in roots:
+                        self._upsert('root', root, None, f"/{root['Id']}/")
+                        stats['nodes_added'] += 1
+                    self._conn.commit()
+
+        with self._lock:
+            stale = [row[0] for row in self._conn.execute(
+                "SELECT id FROM nodes WHERE type IN ('root', 'ou') AND (fetched_at IS NULL OR fetched_at <= ?) ORDER BY path",
+                (now - ttl_seconds,)
+            ).fetchall()]
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while stale:
+                # get_*_for_parent는 오류를 빈 목록으로 반환하므로 오류를 전파하는 iter_* 사용
+                ou_futures = [executor.submit(lambda parent_id: list(reader.iter_ous_for_parent(parent_id)), parent_id) for parent_id in stale]
+                account_futures = [executor.submit(lambda parent_id: list(reader.iter_accounts_for_parent(parent_id)), parent_id) for parent_id in stale]
+                fetched = []
+                for parent_id, ou_future, account_future in zip(stale, ou_futures, account_futures):
+                    stats['parents_checked'] += 1
+                    try:
+                        fetched.append((parent_id, ou_future.result(), account_future.result()))
+                    except Exception as e:
+                        stats['parents_failed'] += 1
+                        print(f"부모 {parent_id}의 자식 목록 조회 중 오류 발생 (기존 스냅샷 유지): {str(e)}")
+
+                unexplored = []
+                with self._lock:
+                    for parent_id, ous, accounts in fetched:
+                        unexplored.extend(self._apply_children(parent_id, ous, accounts, now, stats))
+                    self._conn.commit()
+                stale = unexplored
+
+        return stats
+
+    def _rows_to_items(self, rows: List[tuple]) -> List[Dict[str, Any]]:
+        return [json.loads(row[0]) for row in rows]
+
+    def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """ID로 루트/OU/계정 정보를 조회합니다."""
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM nodes WHERE id = ?', (node_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_parent_chain(self, node_id: str) -> List[Dict[str, Any]]:
+        """루트부터 node_id의 직속 부모까지의 노드 목록을 반환합니다."""
+        with self._lock:
+            path = self._path_of(node_id)
+            if path is None:
+                return []
+            ancestor_ids = path.strip('/').split('/')[:-1]
+            rows = {row[0]: row[1] for row in self._conn.execute(
+                f"SELECT id, data FROM nodes WHERE id IN ({','.join('?' * len(ancestor_ids))})", ancestor_ids
+            ).fetchall()} if ancestor_ids else {}
+        return [json.loads(rows[ancestor_id]) for ancestor_id in ancestor_ids if ancestor_id in rows]
+
+    def get_descendant_accounts(self, node_id: str) -> List[Dict[str, Any]]:
+        """OU(또는 루트) 하위의 모든 계정을 재귀적으로 반환합니다."""
+        with self._lock:
+            path = self._path_of(node_id)
+            if path is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT data FROM nodes WHERE path > ? AND path < ? AND type = 'account' ORDER BY path",
+                (path, path + _PATH_END)
+            ).fetchall()
+        return self._rows_to_items(rows)
+
+    def find_accounts(self, name: str = None, email: str = None) -> List[Dict[str, Any]]:
+        """이름 또는 이메일(대소문자 무시)로 계정을 찾습니다."""
+        column, value = ('email', email) if email else ('name', name)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM nodes WHERE {column} = ? COLLATE NOCASE AND type = 'account'", (value,)
+            ).fetchall()
+        return self._rows_to_items(rows)
+
+    def to_org_structure(self) -> Dict[str, Any]:
+        """스냅샷을 AWSOrgReader.get_org_structure와 같은 형식으로 변환합니다."""
+        org_structure = {'roots': [], 'ous': {}, 'accounts': {}}
+        with self._lock:
+            rows = self._conn.execute('SELECT id, type, parent_id, data FROM nodes ORDER BY path').fetchall()
+        for node_id, node_type, parent_id, data in rows:
+            item = json.loads(data)
+            if node_type == 'root':
+                org_structure['roots'].append(item)
+            else:
+                key = 'ous' if node_type == 'ou' else 'accounts'
+                org_structure[key].setdefault(parent_id, []).append(item)
+            if node_type != 'account':
+                org_structure['ous'].setdefault(node_id, [])
+                org_structure['accounts'].setdefault(node_id, [])
+        return org_structure
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='조직 구조 스냅샷을 갱신하거나 조회하는 스크립트')
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT_PATH, help=f'스냅샷 파일 경로 (기본값: {DEFAULT_SNAPSHOT_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    refresh_parser = subparsers.add_parser('refresh', help='TTL이 지난 부모만 다시 조회하여 스냅샷 갱신')
+    refresh_parser.add_argument('--role-arn', required=True, help='AWS Role ARN')
+    refresh_parser.add_argument('--session-name', required=True, help='Session Name for STS')
+    refresh_parser.add_argument('--external-id', required=True, help='External ID for STS')
+    refresh_parser.add_argument('--region', default='ap-northeast-2', help='AWS Region (기본값: ap-northeast-2)')
+    refresh_parser.add_argument('--profile', default='cmp-sts-user', help='AWS Credentials 프로필 이름 (기본값: cmp-sts-user)')
+    refresh_parser.add_argument('--ttl', type=float, default=3600, help='부모별 자식 목록 재조회 주기(초) (기본값: 3600)')
+    refresh_parser.add_argument('--max-workers', type=int, default=8, help='동시 API 호출 수 (기본값: 8)')
+
+    path_parser = subparsers.add_parser('account-path', help='계정의 상위 OU 체인 조회')
+    path_parser.add_argument('account_id', help='AWS 계정 ID')
+
+    accounts_parser = subparsers.add_parser('ou-accounts', help='OU 하위의 모든 계정 조회')
+    accounts_parser.add_argument('ou_id', help='OU 또는 루트 ID')
+
+    find_parser = subparsers.add_parser('find', help='이름 또는 이메일로 계정 조회')
+    find_parser.add_argument('--name', help='계정 이름')
+    find_parser.add_argument('--email', help='계정 이메일')
+
+    args = parser.parse_args()
+
+    try:
+        snapshot = OrgSnapshot(args.snapshot)
+
+        if args.command == 'refresh':
+            reader = AWSOrgReader(
+                role_arn=args.role_arn,
+                session_name=args.session_name,
+                external_id=args.external_id,
+                region=args.region,
+                profile_name=args.profile
+            )
+            result = snapshot.refresh(reader, ttl_seconds=args.ttl, max_workers=args.max_workers)
+        elif args.command == 'account-path':
+            result = snapshot.get_parent_chain(args.account_id)
+        elif args.command == 'ou-accounts':
+            result = snapshot.get_descendant_accounts(args.ou_id)
+        else:
+            if not args.name and not args.email:
+                parser.error('--name 또는 --email 중 하나를 지정해야 합니다.')
+            result = snapshot.find_accounts(name=args.name, email=args.email)
+
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+if __name__ == '__main__':
+    main()
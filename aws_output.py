@@ -0,0 +1,98 @@
+import gzip
+import io
+import json
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any, Optional
+from aws_metrics import MetricsRegistry, get_registry
+from aws_records import Record
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+def json_default(obj: Any) -> Any:
+    """datetime/date는 ISO 8601 문자열로, Decimal은 숫자로, 레코드(aws_records)는 원본 형식의 dict로 변환합니다."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# 한 번만 만들어 재사용하는 압축 인코더 (JSONEncoder 서브클래스 없이 default 함수만 지정)
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=json_default)
+
+def dumps(obj: Any) -> str:
+    """공백 없는 한 줄 JSON 문자열로 직렬화합니다."""
+    return _encoder.encode(obj)
+
+def _open_text(path: Optional[str], compression: str):
+    if compression == 'none':
+        if path is None:
+            return sys.stdout, False
+        return open(path, 'w', encoding='utf-8'), True
+
+    if path is None:
+        raise ValueError("압축 출력은 파일 경로(--output)를 지정해야 합니다.")
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8'), True
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd 압축을 사용하려면 zstandard 패키지를 설치해야 합니다: pip install zstandard")
+        raw = open(path, 'wb')
+        stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8'), True
+    raise ValueError(f"지원하지 않는 압축 형식입니다: {compression}")
+
+class NDJSONWriter:
+    """
+    레코드를 수집되는 즉시 한 줄씩 쓰는 NDJSON 작성기입니다.
+
+    각 줄은 {"type": 레코드 종류, ...추가 필드, "data": 레코드} 형식이며, 전체 결과를 메모리에
+    모으지 않으므로 첫 레코드가 바로 출력됩니다.
+    """
+
+    def __init__(self, path: str = None, compression: str = 'none', flush_every: int = 1, metrics: MetricsRegistry = None):
+        """
+        Args:
+            path (str): 출력 파일 경로 (None이면 stdout)
+            compression (str): 압축 형식 ('none', 'gzip', 'zstd')
+            flush_every (int): 몇 줄마다 flush할지 (0이면 닫을 때만 flush)
+            metrics (MetricsRegistry): 레코드 직렬화 시간을 기록할 레지스트리 (기본값: 프로세스 공유 레지스트리)
+        """
+        self.path = path
+        self.compression = compression
+        self.flush_every = flush_every
+        self.metrics = metrics or get_registry()
+        self.count = 0
+        self._file, self._owns_file = _open_text(path, compression)
+
+    def write(self, record_type: str, data: Any, **fields: Any) -> None:
+        """레코드 하나를 한 줄로 씁니다."""
+        record: Dict[str, Any] = {'type': record_type}
+        record.update(fields)
+        record['data'] = data
+        start = time.perf_counter()
+        line = dumps(record)
+        self.metrics.observe('json.serialize_record', time.perf_counter() - start)
+        self._file.write(line)
+        self._file.write('\n')
+        self.count += 1
+        if self.flush_every and self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self) -> 'NDJSONWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,123 @@
+import threading
+from typing import Dict, List, Any, AsyncIterator, Awaitable, Callable, Iterator, Optional
+
+class PaginationStats:
+    """API 작업별로 호출 수, 페이지 수, 항목 수를 기록합니다. (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, operation: str, pages: int, items: int) -> None:
+        """한 번의 페이지네이션 호출 결과를 누적합니다."""
+        with self._lock:
+            entry = self._stats.setdefault(operation, {'calls': 0, 'pages': 0, 'items': 0})
+            entry['calls'] += 1
+            entry['pages'] += pages
+            entry['items'] += items
+
+    def get(self, operation: str) -> Dict[str, int]:
+        """특정 작업의 누적 통계를 반환합니다."""
+        with self._lock:
+            return dict(self._stats.get(operation, {'calls': 0, 'pages': 0, 'items': 0}))
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        """모든 작업의 누적 통계를 반환합니다."""
+        with self._lock:
+            return {operation: dict(entry) for operation, entry in self._stats.items()}
+
+def iter_pages(
+    method: Callable[..., Dict[str, Any]],
+    result_key: Optional[str] = None,
+    stats: Optional[PaginationStats] = None,
+    operation: Optional[str] = None,
+    input_token: str = 'NextToken',
+    output_token: str = 'NextToken',
+    **params
+) -> Iterator[Dict[str, Any]]:
+    """
+    NextToken 기반 API를 페이지 단위로 순회하는 제너레이터입니다.
+
+    Args:
+        method (Callable): 호출할 boto3 클라이언트 메서드 (예: client.list_roots)
+        result_key (str): 항목 수를 집계할 응답 키 (예: 'Roots')
+        stats (PaginationStats): 페이지/항목 수를 기록할 통계 객체
+        operation (str): 통계에 기록할 작업 이름 (기본값: 메서드 이름)
+        input_token (str): 다음 페이지 요청 시 사용할 파라미터 이름
+        output_token (str): 응답에 포함된 다음 페이지 토큰 키
+        **params: API 호출 파라미터
+
+    Yields:
+        Dict[str, Any]: 페이지별 응답
+    """
+    operation = operation or getattr(method, '__name__', 'unknown')
+    pages = 0
+    items = 0
+    token = None
+    try:
+        while True:
+            if token:
+                params[input_token] = token
+            response = method(**params)
+            pages += 1
+            if result_key:
+                items += len(response.get(result_key, []))
+            yield response
+
+            token = response.get(output_token)
+            if not token:
+                break
+    finally:
+        # 순회가 중간에 중단되더라도 지금까지 가져온 페이지 수를 기록
+        if stats is not None:
+            stats.record(operation, pages, items)
+
+def iter_items(method: Callable[..., Dict[str, Any]], result_key: str, **kwargs) -> Iterator[Dict[str, Any]]:
+    """페이지를 순회하며 result_key 아래의 항목을 하나씩 반환하는 제너레이터입니다."""
+    for page in iter_pages(method, result_key=result_key, **kwargs):
+        yield from page.get(result_key, [])
+
+def collect_items(method: Callable[..., Dict[str, Any]], result_key: str, **kwargs) -> List[Dict[str, Any]]:
+    """모든 페이지의 항목을 한 번에 리스트로 수집합니다."""
+    return list(iter_items(method, result_key, **kwargs))
+
+async def aiter_pages(
+    method: Callable[..., Awaitable[Dict[str, Any]]],
+    result_key: Optional[str] = None,
+    stats: Optional[PaginationStats] = None,
+    operation: Optional[str] = None,
+    input_token: str = 'NextToken',
+    output_token: str = 'NextToken',
+    **params
+) -> AsyncIterator[Dict[str, Any]]:
+    """iter_pages의 asyncio 버전입니다. method는 aiobotocore 클라이언트 메서드여야 합니다."""
+    operation = operation or getattr(method, '__name__', 'unknown')
+    pages = 0
+    items = 0
+    token = None
+    try:
+        while True:
+            if token:
+                params[input_token] = token
+            response = await method(**params)
+            pages += 1
+            if result_key:
+                items += len(response.get(result_key, []))
+            yield response
+
+            token = response.get(output_token)
+            if not token:
+                break
+    finally:
+        if stats is not None:
+            stats.record(operation, pages, items)
+
+async def aiter_items(method: Callable[..., Awaitable[Dict[str, Any]]], result_key: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+    """iter_items의 asyncio 버전입니다."""
+    async for page in aiter_pages(method, result_key=result_key, **kwargs):
+        for item in page.get(result_key, []):
+            yield item
+
+async def acollect_items(method: Callable[..., Awaitable[Dict[str, Any]]], result_key: str, **kwargs) -> List[Dict[str, Any]]:
+    """collect_items의 asyncio 버전입니다."""
+    return [item async for item in aiter_items(method, result_key, **kwargs)]
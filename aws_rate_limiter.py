@@ -0,0 +1,290 @@
+import functools
+import random
+import threading
+import time
+from typing import Dict, Any, Awaitable, Callable, Optional
+from aws_metrics import MetricsRegistry, get_registry, response_size
+
+# 서비스별 기본 초당 요청 수 (Cost Explorer는 요청당 과금되며 TPS 한도가 낮음)
+DEFAULT_RATES = {
+    'ce': 5.0,
+    'budgets': 10.0,
+    'organizations': 10.0,
+    'sts': 20.0
+}
+
+THROTTLING_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'TooManyRequestsException',
+    'RequestLimitExceeded',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'LimitExceededException',
+    'SlowDown'
+}
+
+TRANSIENT_ERROR_CODES = {
+    'InternalError',
+    'InternalFailure',
+    'InternalErrorException',
+    'ServiceUnavailable',
+    'ServiceUnavailableException',
+    'RequestTimeout',
+    'RequestTimeoutException'
+}
+
+class RateLimitExceeded(Exception):
+    """재시도 횟수를 모두 소진할 때까지 스로틀링이 계속된 경우 발생합니다."""
+
+def _error_code(error: Exception) -> Optional[str]:
+    # botocore ClientError는 응답 dict를 response 속성으로 가짐 (botocore를 import하지 않고 확인)
+    response = getattr(error, 'response', None)
+    return response.get('Error', {}).get('Code') if isinstance(response, dict) else None
+
+def is_throttling_error(error: Exception) -> bool:
+    return _error_code(error) in THROTTLING_ERROR_CODES
+
+def is_transient_error(error: Exception) -> bool:
+    # 예외가 발생했다면 botocore는 이미 import된 상태
+    from botocore.exceptions import ConnectionError as BotoConnectionError, ReadTimeoutError
+
+    if isinstance(error, (BotoConnectionError, ReadTimeoutError)):
+        return True
+    return _error_code(error) in TRANSIENT_ERROR_CODES
+
+class AdaptiveRateLimiter:
+    """
+    토큰 버킷 기반 속도 제한기입니다.
+
+    스로틀링 응답을 받으면 허용 속도를 절반으로 줄이고(지수 백오프 후 재시도), 성공할 때마다
+    설정된 최대 속도까지 조금씩 다시 올립니다.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        rate: float,
+        burst: float = None,
+        min_rate: float = 0.5,
+        max_retries: int = 8,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0
+    ):
+        """
+        Args:
+            service_name (str): 서비스 이름 (통계 표시용)
+            rate (float): 최대 초당 요청 수
+            burst (float): 버킷 크기 (기본값: rate)
+            min_rate (float): 스로틀링 시 줄어들 수 있는 최소 초당 요청 수
+            max_retries (int): 스로틀링/일시적 오류에 대한 최대 재시도 횟수
+            base_delay (float): 백오프 기본 대기 시간(초)
+            max_delay (float): 백오프 최대 대기 시간(초)
+        """
+        self.service_name = service_name
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.min_rate = min(min_rate, rate)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._stats = {'calls': 0, 'retries': 0, 'throttles': 0, 'errors': 0, 'wait_seconds': 0.0}
+
+    def _record(self, key: str, value: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고 대기해야 하는 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        """토큰 하나를 예약하고 필요한 만큼 대기합니다. 대기한 시간(초)을 반환합니다."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+            self._record('wait_seconds', wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """acquire의 asyncio 버전입니다."""
+        # asyncio는 import에 수십 ms가 걸리므로 동기 경로(CLI 시작)에서는 import하지 않음
+        import asyncio
+
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+            self._record('wait_seconds', wait)
+        return wait
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * 0.5)
+            self._stats['throttles'] += 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """
+        오류를 분류하여 재시도 전 대기 시간(지수 백오프, 지터 포함)을 반환합니다.
+
+        재시도할 수 없는 오류이거나 재시도 횟수를 모두 소진하면 예외를 발생시킵니다.
+        """
+        throttled = is_throttling_error(error)
+        if not throttled and not is_transient_error(error):
+            self._record('errors')
+            raise error
+        if throttled:
+            self.on_throttle()
+        if attempt == self.max_retries:
+            self._record('errors')
+            if throttled:
+                raise RateLimitExceeded(f"{self.service_name} 요청이 {self.max_retries}회 재시도 후에도 스로틀링되었습니다: {str(error)}") from error
+            raise error
+        self._record('retries')
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+        self._record('wait_seconds', delay)
+        return delay
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """속도 제한을 적용하여 func를 호출하고, 스로틀링/일시적 오류는 백오프 후 재시도합니다."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            self._record('calls')
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                time.sleep(self._retry_delay(e, attempt))
+                continue
+
+            self.on_success()
+            return result
+
+    async def call_async(self, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """call의 asyncio 버전입니다. func는 코루틴 함수여야 합니다."""
+        import asyncio
+
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async()
+            self._record('calls')
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(e, attempt))
+                continue
+
+            self.on_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """호출/재시도/스로틀링 횟수와 대기 시간, 현재 허용 속도를 반환합니다."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['rate'] = round(self.rate, 3)
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        return stats
+
+class RateLimitedClient:
+    """
+    boto3 클라이언트의 API 메서드 호출을 AdaptiveRateLimiter를 통해 실행하는 프록시입니다.
+
+    시도마다 지연 시간, 수신 바이트, 재시도/오류 여부를 '서비스.메서드' 이름으로 metrics에 기록합니다.
+    """
+
+    def __init__(self, client, limiter: AdaptiveRateLimiter, metrics: MetricsRegistry = None):
+        self._client = client
+        self._limiter = limiter
+        self._metrics = metrics or get_registry()
+        self._operations = set(client.meta.method_to_api_mapping)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name not in self._operations:
+            return attr
+
+        operation = f"{self._limiter.service_name}.{name}"
+        metrics = self._metrics
+
+        @functools.wraps(attr)
+        def _api_call(*args, **kwargs):
+            attempts = 0
+
+            def _attempt(*args, **kwargs):
+                nonlocal attempts
+                retry = attempts > 0
+                attempts += 1
+                start = time.perf_counter()
+                try:
+                    response = attr(*args, **kwargs)
+                except Exception as e:
+                    metrics.observe(operation, time.perf_counter() - start, error=e, retry=retry)
+                    raise
+                metrics.observe(operation, time.perf_counter() - start, response_size(response), retry=retry)
+                return response
+
+            return self._limiter.call(_attempt, *args, **kwargs)
+
+        return _api_call
+
+class AsyncRateLimitedClient:
+    """
+    aiobotocore 클라이언트용 RateLimitedClient입니다.
+
+    semaphore를 지정하면 여러 클라이언트가 동시에 진행 중인 요청 수 상한을 공유합니다.
+    """
+
+    def __init__(self, client, limiter: AdaptiveRateLimiter, semaphore: 'asyncio.Semaphore' = None, metrics: MetricsRegistry = None):
+        self._client = client
+        self._limiter = limiter
+        self._semaphore = semaphore
+        self._metrics = metrics or get_registry()
+        self._operations = set(client.meta.method_to_api_mapping)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name not in self._operations:
+            return attr
+
+        operation = f"{self._limiter.service_name}.{name}"
+        metrics = self._metrics
+
+        async def _timed(retry: bool, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                response = await attr(*args, **kwargs)
+            except Exception as e:
+                metrics.observe(operation, time.perf_counter() - start, error=e, retry=retry)
+                raise
+            metrics.observe(operation, time.perf_counter() - start, response_size(response), retry=retry)
+            return response
+
+        @functools.wraps(attr)
+        async def _api_call(*args, **kwargs):
+            attempts = 0
+
+            async def _attempt(*args, **kwargs):
+                nonlocal attempts
+                retry = attempts > 0
+                attempts += 1
+                if self._semaphore is None:
+                    return await _timed(retry, *args, **kwargs)
+                # 세마포어 대기 시간은 지연 시간에서 제외
+                async with self._semaphore:
+                    return await _timed(retry, *args, **kwargs)
+
+            return await self._limiter.call_async(_attempt, *args, **kwargs)
+
+        return _api_call
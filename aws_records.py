@@ -0,0 +1,233 @@
+import sys
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+def _intern(value: Any) -> Any:
+    """상태/유형처럼 값의 종류가 적은 문자열은 intern하여 레코드끼리 같은 객체를 공유합니다."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _encode_time(value: Any) -> Any:
+    """datetime은 epoch 초(float)로 저장합니다. (datetime 객체보다 작음, 문자열 등은 그대로 보관)"""
+    return value.timestamp() if isinstance(value, datetime) else value
+
+def _decode_time(value: Any) -> Any:
+    # botocore와 같이 로컬 시간대의 datetime으로 복원하여 isoformat 결과를 원본과 같게 유지
+    return datetime.fromtimestamp(value).astimezone() if isinstance(value, float) else value
+
+def _encode_amount(spend: Optional[Dict[str, str]]) -> Tuple[Any, Any]:
+    """
+    {'Amount': '100.0', 'Unit': 'USD'}를 ('100.0', 'USD')로 변환합니다.
+
+    금액은 원본 문자열 그대로 보관합니다. (float로 바꾸면 '100' -> '100.0', '0.0000046583' -> '4.6583e-06'처럼
+    출력이 달라지고 큰 금액은 자릿수를 잃음)
+    """
+    if not spend:
+        return None, None
+    return spend.get('Amount'), _intern(spend.get('Unit'))
+
+def _decode_amount(amount: Any, unit: Any) -> Optional[Dict[str, Any]]:
+    if amount is None:
+        return None
+    spend = {'Amount': amount}
+    if unit is not None:
+        spend['Unit'] = unit
+    return spend
+
+def _amount_value(amount: Any) -> Optional[float]:
+    """보관한 금액 문자열을 계산용 float로 변환합니다. (없거나 숫자가 아니면 None)"""
+    try:
+        return float(amount)
+    except (TypeError, ValueError):
+        return None
+
+# 필드 변환 종류 -> (저장 시 변환, 읽을 때 변환)
+_CODECS = {
+    'str': (lambda value: value, lambda value: value),
+    'intern': (_intern, lambda value: value),
+    'time': (_encode_time, _decode_time)
+}
+
+class Record:
+    """
+    boto3 응답 항목을 __slots__ 속성으로 보관하는 레코드의 공통 구현입니다.
+
+    FIELDS에 정의한 키는 전용 속성에, 그 외의 키는 extra dict에 보관합니다. fields를 지정하면 그 키만 남깁니다.
+    to_dict()는 원본과 같은 키/형식의 dict를 만들고, get/[]/in으로 dict처럼 읽을 수도 있습니다.
+    """
+
+    __slots__ = ('extra',)
+
+    # (JSON 키, 속성 이름, 변환 종류)
+    FIELDS: Tuple[Tuple[str, str, str], ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], fields: Iterable[str] = None) -> 'Record':
+        """
+        응답 항목 dict로 레코드를 만듭니다.
+
+        Args:
+            data (Dict[str, Any]): API 응답 항목 (예: list_accounts_for_parent의 Accounts 항목)
+            fields (Iterable[str]): 남길 키 목록 (None이면 모든 키)
+        """
+        keep = None if fields is None else frozenset(fields)
+        record = cls.__new__(cls)
+        known = set()
+        for key, attr, kind in cls.FIELDS:
+            known.add(key)
+            value = data.get(key) if keep is None or key in keep else None
+            setattr(record, attr, None if value is None else _CODECS[kind][0](value))
+        extra = {key: value for key, value in data.items() if key not in known and (keep is None or key in keep)}
+        record.extra = extra or None
+        return record
+
+    def _value(self, key: str) -> Any:
+        for field_key, attr, kind in self.FIELDS:
+            if field_key == key:
+                value = getattr(self, attr)
+                return None if value is None else _CODECS[kind][1](value)
+        return self.extra.get(key) if self.extra else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """원본 응답 항목과 같은 형식의 dict를 만듭니다. (값이 없는 키는 생략)"""
+        result = {}
+        for key, attr, kind in self.FIELDS:
+            value = getattr(self, attr)
+            if value is not None:
+                result[key] = _CODECS[kind][1](value)
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._value(key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._value(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self._value(key) is not None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Root(Record):
+    """list_roots 항목"""
+
+    __slots__ = ('id', 'arn', 'name')
+
+    FIELDS = (
+        ('Id', 'id', 'str'),
+        ('Arn', 'arn', 'str'),
+        ('Name', 'name', 'str')
+    )
+
+class OU(Record):
+    """list_organizational_units_for_parent 항목"""
+
+    __slots__ = ('id', 'arn', 'name')
+
+    FIELDS = (
+        ('Id', 'id', 'str'),
+        ('Arn', 'arn', 'str'),
+        ('Name', 'name', 'str')
+    )
+
+class Account(Record):
+    """list_accounts_for_parent 항목"""
+
+    __slots__ = ('id', 'arn', 'email', 'name', 'status', 'state', 'joined_method', 'joined_timestamp')
+
+    FIELDS = (
+        ('Id', 'id', 'str'),
+        ('Arn', 'arn', 'str'),
+        ('Email', 'email', 'str'),
+        ('Name', 'name', 'str'),
+        ('Status', 'status', 'intern'),
+        ('State', 'state', 'intern'),
+        ('JoinedMethod', 'joined_method', 'intern'),
+        ('JoinedTimestamp', 'joined_timestamp', 'time')
+    )
+
+class Budget(Record):
+    """
+    describe_budgets 항목
+
+    BudgetLimit/CalculatedSpend의 금액은 원본 문자열로, TimePeriod/LastUpdatedTime은 epoch 초로 보관합니다.
+    계산에는 float 속성(budget.limit_amount, budget.actual_amount, budget.forecast_amount)을 사용합니다.
+    """
+
+    __slots__ = (
+        'name', 'budget_type', 'time_unit', 'limit_text', 'limit_unit', 'period_start', 'period_end',
+        'actual_text', 'actual_unit', 'forecast_text', 'forecast_unit', 'last_updated'
+    )
+
+    FIELDS = (
+        ('BudgetName', 'name', 'str'),
+        ('TimeUnit', 'time_unit', 'intern'),
+        ('BudgetType', 'budget_type', 'intern'),
+        ('LastUpdatedTime', 'last_updated', 'time')
+    )
+    # 금액/기간처럼 중첩된 값을 펼쳐 저장하는 키
+    NESTED_KEYS = ('BudgetLimit', 'TimePeriod', 'CalculatedSpend')
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], fields: Iterable[str] = None) -> 'Budget':
+        keep = None if fields is None else frozenset(fields)
+        record = super().from_dict({key: value for key, value in data.items() if key not in cls.NESTED_KEYS}, keep)
+
+        selected = lambda key: data.get(key) if keep is None or key in keep else None
+        record.limit_text, record.limit_unit = _encode_amount(selected('BudgetLimit'))
+        period = selected('TimePeriod') or {}
+        record.period_start = _encode_time(period.get('Start'))
+        record.period_end = _encode_time(period.get('End'))
+        spend = selected('CalculatedSpend') or {}
+        record.actual_text, record.actual_unit = _encode_amount(spend.get('ActualSpend'))
+        record.forecast_text, record.forecast_unit = _encode_amount(spend.get('ForecastedSpend'))
+        return record
+
+    @property
+    def limit_amount(self) -> Optional[float]:
+        return _amount_value(self.limit_text)
+
+    @property
+    def actual_amount(self) -> Optional[float]:
+        return _amount_value(self.actual_text)
+
+    @property
+    def forecast_amount(self) -> Optional[float]:
+        return _amount_value(self.forecast_text)
+
+    def _nested(self) -> Dict[str, Any]:
+        nested = {}
+        limit = _decode_amount(self.limit_text, self.limit_unit)
+        if limit is not None:
+            nested['BudgetLimit'] = limit
+        period = {key: _decode_time(value) for key, value in (('Start', self.period_start), ('End', self.period_end)) if value is not None}
+        if period:
+            nested['TimePeriod'] = period
+        spend = {key: value for key, value in (
+            ('ActualSpend', _decode_amount(self.actual_text, self.actual_unit)),
+            ('ForecastedSpend', _decode_amount(self.forecast_text, self.forecast_unit))
+        ) if value is not None}
+        if spend:
+            nested['CalculatedSpend'] = spend
+        return nested
+
+    def _value(self, key: str) -> Any:
+        if key in self.NESTED_KEYS:
+            return self._nested().get(key)
+        return super()._value(key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = super().to_dict()
+        result.update(self._nested())
+        return result
+
+def to_records(record_type: type, items: Iterable[Dict[str, Any]], fields: Iterable[str] = None) -> list:
+    """응답 항목 목록을 레코드 목록으로 변환합니다. (fields는 모든 항목에 공통으로 적용)"""
+    fields = None if fields is None else frozenset(fields)
+    return [record_type.from_dict(item, fields) for item in items]
@@ -0,0 +1,190 @@
+import configparser
+import os
+import threading
+from typing import Dict, Any, Tuple
+from aws_rate_limiter import AdaptiveRateLimiter, RateLimitedClient, DEFAULT_RATES
+from aws_metrics import MetricsRegistry, get_registry
+
+# boto3/botocore는 import와 서비스 모델 로딩에 수백 ms가 걸리므로 실제로 클라이언트를 만들 때 import
+# (--help, 인자 오류, 캐시 적중은 boto3 없이 처리)
+_client_config = None
+
+def get_client_config():
+    """모든 클라이언트에 공통으로 사용하는 botocore Config를 반환합니다."""
+    global _client_config
+    if _client_config is None:
+        from botocore.config import Config
+
+        # 스로틀링 재시도는 AdaptiveRateLimiter가 담당하므로 botocore 자체 재시도는 끔
+        _client_config = Config(retries={'mode': 'standard', 'total_max_attempts': 1})
+    return _client_config
+
+def load_profile_credentials(profile_name: str) -> Tuple[str, str]:
+    """현재 디렉터리의 .aws/credentials 파일에서 프로필의 (access key, secret key)를 읽습니다."""
+    config = configparser.ConfigParser()
+    credentials_path = os.path.join(os.getcwd(), '.aws', 'credentials')
+
+    if not os.path.exists(credentials_path):
+        raise ValueError(f"자격 증명 파일을 찾을 수 없습니다: {credentials_path}")
+
+    config.read(credentials_path)
+
+    if profile_name not in config:
+        raise ValueError(f"프로필 '{profile_name}'을(를) .aws/credentials 파일에서 찾을 수 없습니다.")
+
+    return config[profile_name]['aws_access_key_id'], config[profile_name]['aws_secret_access_key']
+
+class AWSSessionManager:
+    """
+    STS AssumeRole 자격 증명과 boto3 클라이언트를 캐시하여 여러 리더가 공유하도록 합니다.
+
+    (role_arn, external_id, session_name) 별로 한 번만 AssumeRole을 호출하고, 만료 직전에
+    botocore의 RefreshableCredentials가 자동으로 재발급합니다. 같은 역할/서비스/리전의 클라이언트는
+    한 번만 생성하여 재사용합니다.
+
+    모든 클라이언트의 API 호출은 서비스/역할별 AdaptiveRateLimiter를 거치며, 스로틀링 시
+    속도를 낮추고 백오프 후 재시도합니다.
+    """
+
+    def __init__(self, region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user', duration_seconds: int = 3600, rates: Dict[str, float] = None, metrics: MetricsRegistry = None):
+        # AWS 자격 증명 파일에서 프로필 읽기
+        self._access_key_id, self._secret_access_key = load_profile_credentials(profile_name)
+
+        self.region = region
+        self.profile_name = profile_name
+        self.duration_seconds = duration_seconds
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+        # AssumeRole/클라이언트 생성/API 호출 시간 통계 (기본값: 프로세스 공유 레지스트리)
+        self.metrics = metrics or get_registry()
+
+        self._lock = threading.RLock()
+        self._sts_client = None
+        self._role_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._sessions: Dict[Tuple[str, str, str], Any] = {}
+        self._clients: Dict[Tuple[str, str, str, str, str], Any] = {}
+        self._limiters: Dict[Tuple[str, str, str], AdaptiveRateLimiter] = {}
+        self.assume_role_count = 0
+
+    def _get_sts_client(self):
+        """프로필의 장기 자격 증명으로 STS 클라이언트를 생성합니다. (한 번만 생성)"""
+        with self._lock:
+            if self._sts_client is None:
+                import boto3
+
+                with self.metrics.timed('sts.create_client'):
+                    client = boto3.client(
+                        'sts',
+                        aws_access_key_id=self._access_key_id,
+                        aws_secret_access_key=self._secret_access_key,
+                        region_name=self.region,
+                        config=get_client_config()
+                    )
+                self._sts_client = RateLimitedClient(client, self.get_rate_limiter('sts', self.region, self.profile_name), self.metrics)
+            return self._sts_client
+
+    def get_rate_limiter(self, service_name: str, region: str, scope: str) -> AdaptiveRateLimiter:
+        """서비스/리전/범위(역할 ARN 등)별 속도 제한기를 반환합니다. (API 한도는 계정 단위로 적용됨)"""
+        key = (service_name, region, scope)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = AdaptiveRateLimiter(service_name, self.rates.get(service_name, 10.0))
+                self._limiters[key] = limiter
+            return limiter
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """서비스별로 합산한 호출/재시도/스로틀링 횟수와 대기 시간을 반환합니다."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+
+        summary: Dict[str, Dict[str, Any]] = {}
+        for limiter in limiters:
+            stats = limiter.stats()
+            entry = summary.setdefault(limiter.service_name, {'calls': 0, 'retries': 0, 'throttles': 0, 'errors': 0, 'wait_seconds': 0.0})
+            for key in entry:
+                entry[key] += stats[key]
+        for entry in summary.values():
+            entry['wait_seconds'] = round(entry['wait_seconds'], 3)
+        return summary
+
+    def _assume_role(self, role_arn: str, session_name: str, external_id: str) -> Dict[str, str]:
+        """역할을 가정하고 RefreshableCredentials가 사용하는 형식으로 자격 증명을 반환합니다."""
+        assumed_role = self._get_sts_client().assume_role(
+            RoleArn=role_arn,
+            RoleSessionName=session_name,
+            ExternalId=external_id,
+            DurationSeconds=self.duration_seconds
+        )
+        with self._lock:
+            self.assume_role_count += 1
+
+        credentials = assumed_role['Credentials']
+        return {
+            'access_key': credentials['AccessKeyId'],
+            'secret_key': credentials['SecretAccessKey'],
+            'token': credentials['SessionToken'],
+            'expiry_time': credentials['Expiration'].isoformat()
+        }
+
+    def _role_lock(self, key: Tuple[str, str, str]) -> threading.Lock:
+        """역할별 잠금을 반환합니다. (서로 다른 역할의 AssumeRole은 병렬로 진행)"""
+        with self._lock:
+            lock = self._role_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._role_locks[key] = lock
+            return lock
+
+    def get_session(self, role_arn: str, session_name: str, external_id: str) -> 'boto3.Session':
+        """가정한 역할의 자동 갱신 자격 증명을 사용하는 boto3 세션을 반환합니다."""
+        key = (role_arn, external_id, session_name)
+        with self._role_lock(key):
+            return self._get_session_locked(key)
+
+    def _get_session_locked(self, key: Tuple[str, str, str]) -> 'boto3.Session':
+        session = self._sessions.get(key)
+        if session is None:
+            import boto3
+            import botocore.session
+            from botocore.credentials import RefreshableCredentials
+
+            role_arn, external_id, session_name = key
+            credentials = RefreshableCredentials.create_from_metadata(
+                metadata=self._assume_role(role_arn, session_name, external_id),
+                refresh_using=lambda: self._assume_role(role_arn, session_name, external_id),
+                method='sts-assume-role'
+            )
+            botocore_session = botocore.session.get_session()
+            botocore_session._credentials = credentials
+            session = boto3.Session(botocore_session=botocore_session, region_name=self.region)
+            self._sessions[key] = session
+        return session
+
+    def get_client(self, service_name: str, role_arn: str, session_name: str, external_id: str, region: str = None):
+        """가정한 역할로 생성한 boto3 클라이언트를 반환합니다. (역할/서비스/리전 별로 캐시)"""
+        region = region or self.region
+        role_key = (role_arn, external_id, session_name)
+        key = (service_name, region) + role_key
+        # boto3 세션은 스레드 안전하지 않으므로 역할별 잠금 안에서 클라이언트를 생성
+        with self._role_lock(role_key):
+            client = self._clients.get(key)
+            if client is None:
+                session = self._get_session_locked(role_key)
+                with self.metrics.timed(f'{service_name}.create_client'):
+                    raw_client = session.client(service_name, region_name=region, config=get_client_config())
+                client = RateLimitedClient(raw_client, self.get_rate_limiter(service_name, region, role_arn), self.metrics)
+                self._clients[key] = client
+            return client
+
+_session_managers: Dict[Tuple[str, str], AWSSessionManager] = {}
+_session_managers_lock = threading.Lock()
+
+def get_session_manager(region: str = 'ap-northeast-2', profile_name: str = 'cmp-sts-user') -> AWSSessionManager:
+    """프로세스 전체에서 공유하는 (region, profile_name) 별 세션 매니저를 반환합니다."""
+    key = (region, profile_name)
+    with _session_managers_lock:
+        manager = _session_managers.get(key)
+        if manager is None:
+            manager = AWSSessionManager(region=region, profile_name=profile_name)
+            _session_managers[key] = manager
+        return manager
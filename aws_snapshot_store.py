@@ -0,0 +1,380 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Iterator, Optional, TextIO, Tuple
+from aws_output import json_default
+
+DESCRIPTION = '변경분으로 저장한 조직/예산 스냅샷의 목록/시점 복원/변경분을 조회하는 스크립트'
+
+DEFAULT_STORE_PATH = os.path.join('.cache', 'snapshots.sqlite3')
+# 읽기에 사용할 메모리 맵 크기 (SQLite PRAGMA mmap_size)
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+# IN 절 하나에 넣을 최대 값 수 (SQLite 변수 개수 제한)
+_CHUNK_SIZE = 500
+
+# 해시 계산용 정규화 인코더 (키 정렬, 공백 없음, datetime/레코드는 JSON 출력과 같은 형식)
+_canonical = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), sort_keys=True, default=json_default)
+
+# (키, 종류, 부모 ID, 항목)
+Entry = Tuple[str, str, Optional[str], Any]
+
+def entry_body(kind: str, parent: Optional[str], item: Any) -> Tuple[bytes, str]:
+    """항목의 정규화된 JSON 본문과 그 해시(SHA-1 digest)를 반환합니다. 부모가 바뀌면(이동) 해시도 바뀝니다."""
+    body = _canonical.encode([kind, parent, item])
+    return hashlib.sha1(body.encode('utf-8')).digest(), body
+
+def parse_time(value: str) -> float:
+    """epoch 초 또는 ISO 8601 시각 문자열을 epoch 초로 변환합니다."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+class SnapshotStore:
+    """
+    반복 수집하는 조직/예산 스냅샷을 항목 단위 변경분(delta)으로 저장하는 SQLite 저장소입니다.
+
+    - 항목(계정/OU/예산 등)은 정규화한 JSON의 해시로 구분하며, 본문은 해시당 한 번만 저장합니다. (blobs)
+    - 스냅샷마다 이전 스냅샷 대비 추가/변경/삭제된 항목만 기록합니다. (deltas, 변경이 없으면 스냅샷 행 하나)
+    - 모든 쓰기는 한 트랜잭션의 일괄 INSERT이며, 기존 행은 수정하거나 삭제하지 않습니다. (append-only, WAL)
+    - 임의 시점의 전체 내용은 키별로 그 시점 이전의 마지막 변경분을 골라 한 번의 쿼리로 다시 만듭니다.
+    - 읽기는 SQLite의 메모리 맵(PRAGMA mmap_size)을 사용합니다.
+
+    스트림(stream)은 스냅샷 계열의 이름입니다. (예: 'org/123456789012', 'budgets/123456789012')
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, mmap_size: int = DEFAULT_MMAP_SIZE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(f'PRAGMA mmap_size={int(mmap_size)}')
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS snapshots ('
+            'id INTEGER PRIMARY KEY, stream TEXT NOT NULL, taken_at REAL NOT NULL, '
+            'added INTEGER NOT NULL, modified INTEGER NOT NULL, removed INTEGER NOT NULL, total INTEGER NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS snapshots_stream ON snapshots (stream, taken_at);'
+            'CREATE TABLE IF NOT EXISTS blobs (hash BLOB PRIMARY KEY, body TEXT NOT NULL) WITHOUT ROWID;'
+            'CREATE TABLE IF NOT EXISTS deltas ('
+            'stream TEXT NOT NULL, key TEXT NOT NULL, snapshot_id INTEGER NOT NULL, op TEXT NOT NULL, hash BLOB, '
+            'PRIMARY KEY (stream, key, snapshot_id)) WITHOUT ROWID;'
+            'CREATE INDEX IF NOT EXISTS deltas_snapshot ON deltas (snapshot_id);'
+        )
+        self._conn.commit()
+
+    def _manifest(self, stream: str, snapshot_id: int) -> Dict[str, bytes]:
+        """snapshot_id 시점의 키 -> 해시 (삭제된 키 제외)"""
+        # SQLite는 MAX()와 함께 조회한 열에 최댓값 행의 값을 반환함
+        rows = self._conn.execute(
+            'SELECT key, hash, MAX(snapshot_id) FROM deltas WHERE stream = ? AND snapshot_id <= ? GROUP BY key',
+            (stream, snapshot_id)
+        ).fetchall()
+        return {key: digest for key, digest, _ in rows if digest is not None}
+
+    def _latest_id(self, stream: str) -> Optional[int]:
+        row = self._conn.execute('SELECT MAX(id) FROM snapshots WHERE stream = ?', (stream,)).fetchone()
+        return row[0]
+
+    def commit(self, stream: str, entries: Iterable[Entry], taken_at: float = None, kinds: Iterable[str] = None) -> Dict[str, Any]:
+        """
+        스냅샷을 기록합니다. 이전 스냅샷과 해시가 다른 항목만 변경분으로 저장합니다.
+
+        entries는 빠짐없이 조회한 결과여야 합니다. 조회 오류로 빠진 항목도 삭제로 기록되므로,
+        오류를 빈 목록으로 바꾸는 조회 결과는 기록하지 않습니다. (strict 조회 사용)
+
+        시점 복원은 스냅샷 ID 순서로 변경분을 쌓으므로, 마지막 스냅샷보다 이른 taken_at은 ValueError로 거부합니다.
+
+        Args:
+            stream (str): 스냅샷 계열 이름
+            entries (Iterable[Entry]): (키, 종류, 부모 ID, 항목) 목록 (키는 스트림 안에서 고유한 '종류:ID')
+            taken_at (float): 수집 시각 (epoch 초, 기본값: 현재 시각, 스트림의 마지막 스냅샷보다 이르면 안 됨)
+            kinds (Iterable[str]): 이번에 수집한 항목 종류 (지정하면 다른 종류의 기존 항목은 삭제로 기록하지 않고 유지)
+
+        Returns:
+            Dict[str, Any]: {'snapshot_id', 'previous_snapshot_id', 'taken_at', 'total', 'changes': [...]}
+            changes 항목은 {'op': 'add'|'modify'|'remove', 'key', 'kind', 'parent', 'item'} (remove는 op/key만)
+        """
+        taken_at = time.time() if taken_at is None else taken_at
+        kinds = set(kinds) if kinds is not None else None
+        current: Dict[str, Tuple[bytes, str, Entry]] = {}
+        for entry in entries:
+            digest, body = entry_body(entry[1], entry[2], entry[3])
+            current[entry[0]] = (digest, body, entry)
+
+        with self._lock:
+            previous_id = self._latest_id(stream)
+            if previous_id is not None:
+                latest_taken_at = self._conn.execute('SELECT taken_at FROM snapshots WHERE id = ?', (previous_id,)).fetchone()[0]
+                if taken_at < latest_taken_at:
+                    raise ValueError(f"스트림 {stream}의 마지막 스냅샷({previous_id})보다 이른 시각으로는 기록할 수 없습니다: {taken_at} < {latest_taken_at}")
+            previous = self._manifest(stream, previous_id) if previous_id is not None else {}
+
+            changes = []
+            blobs = []
+            digests = []
+            for key, (digest, body, (_, kind, parent, item)) in current.items():
+                old = previous.get(key)
+                if old == digest:
+                    continue
+                changes.append({'op': 'modify' if old is not None else 'add', 'key': key, 'kind': kind, 'parent': parent, 'item': item})
+                blobs.append((digest, body))
+                digests.append(digest)
+            kept = 0
+            for key in previous.keys() - current.keys():
+                if kinds is not None and key.split(':', 1)[0] not in kinds:
+                    kept += 1
+                    continue
+                changes.append({'op': 'remove', 'key': key})
+                digests.append(None)
+
+            counts = {op: sum(1 for change in changes if change['op'] == op) for op in ('add', 'modify', 'remove')}
+            cursor = self._conn.execute(
+                'INSERT INTO snapshots (stream, taken_at, added, modified, removed, total) VALUES (?, ?, ?, ?, ?, ?)',
+                (stream, taken_at, counts['add'], counts['modify'], counts['remove'], len(current) + kept)
+            )
+            snapshot_id = cursor.lastrowid
+            self._conn.executemany('INSERT OR IGNORE INTO blobs (hash, body) VALUES (?, ?)', blobs)
+            self._conn.executemany(
+                'INSERT INTO deltas (stream, key, snapshot_id, op, hash) VALUES (?, ?, ?, ?, ?)',
+                [(stream, change['key'], snapshot_id, change['op'], digest) for change, digest in zip(changes, digests)]
+            )
+            self._conn.commit()
+
+        return {
+            'stream': stream,
+            'snapshot_id': snapshot_id,
+            'previous_snapshot_id': previous_id,
+            'taken_at': taken_at,
+            'total': len(current) + kept,
+            'changes': sorted(changes, key=lambda change: change['key'])
+        }
+
+    def streams(self) -> List[Dict[str, Any]]:
+        """스트림별 스냅샷 수와 마지막 수집 시각을 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute('SELECT stream, COUNT(*), MAX(taken_at) FROM snapshots GROUP BY stream ORDER BY stream').fetchall()
+        return [{'stream': stream, 'snapshots': count, 'last_taken_at': last} for stream, count, last in rows]
+
+    def snapshots(self, stream: str) -> List[Dict[str, Any]]:
+        """스트림의 스냅샷 목록 (오래된 순)"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, taken_at, added, modified, removed, total FROM snapshots WHERE stream = ? ORDER BY id', (stream,)
+            ).fetchall()
+        return [
+            {'snapshot_id': row[0], 'taken_at': row[1], 'added': row[2], 'modified': row[3], 'removed': row[4], 'total': row[5]}
+            for row in rows
+        ]
+
+    def resolve(self, stream: str, snapshot_id: int = None, at: float = None) -> Optional[int]:
+        """
+        조회할 스냅샷 ID를 정합니다.
+
+        snapshot_id를 지정하면 그 스냅샷, at을 지정하면 at 이전에 기록된 마지막 스냅샷, 둘 다 없으면 마지막 스냅샷입니다.
+        """
+        with self._lock:
+            if snapshot_id is not None:
+                row = self._conn.execute('SELECT id FROM snapshots WHERE stream = ? AND id = ?', (stream, snapshot_id)).fetchone()
+            elif at is not None:
+                row = self._conn.execute(
+                    'SELECT id FROM snapshots WHERE stream = ? AND taken_at <= ? ORDER BY taken_at DESC, id DESC LIMIT 1', (stream, at)
+                ).fetchone()
+            else:
+                row = (self._latest_id(stream),)
+        return row[0] if row else None
+
+    def iter_view(self, stream: str, snapshot_id: int) -> Iterator[Entry]:
+        """snapshot_id 시점의 모든 항목을 키 순서로 반환하는 제너레이터입니다."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT latest.key, blobs.body FROM ('
+                'SELECT key, hash, MAX(snapshot_id) FROM deltas WHERE stream = ? AND snapshot_id <= ? GROUP BY key'
+                ') AS latest JOIN blobs ON blobs.hash = latest.hash ORDER BY latest.key',
+                (stream, snapshot_id)
+            ).fetchall()
+        for key, body in rows:
+            kind, parent, item = json.loads(body)
+            yield key, kind, parent, item
+
+    def view(self, stream: str, snapshot_id: int = None, at: float = None) -> List[Entry]:
+        """특정 스냅샷(또는 시각) 시점의 전체 항목 목록을 다시 만듭니다. 스냅샷이 없으면 빈 목록입니다."""
+        resolved = self.resolve(stream, snapshot_id, at)
+        return [] if resolved is None else list(self.iter_view(stream, resolved))
+
+    def _bodies(self, digests: Iterable[bytes]) -> Dict[bytes, Entry]:
+        digests = list(digests)
+        bodies = {}
+        for start in range(0, len(digests), _CHUNK_SIZE):
+            chunk = digests[start:start + _CHUNK_SIZE]
+            for digest, body in self._conn.execute(
+                f"SELECT hash, body FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall():
+                bodies[digest] = json.loads(body)
+        return bodies
+
+    def diff(self, stream: str, from_id: Optional[int], to_id: int) -> List[Dict[str, Any]]:
+        """
+        두 스냅샷 사이의 변경분을 commit의 changes와 같은 형식으로 반환합니다.
+
+        해시만 비교하므로 본문은 바뀐 항목만 읽습니다. from_id가 None이면 빈 상태와 비교합니다.
+        """
+        with self._lock:
+            before = self._manifest(stream, from_id) if from_id is not None else {}
+            after = self._manifest(stream, to_id)
+            changed = {key: digest for key, digest in after.items() if before.get(key) != digest}
+            bodies = self._bodies(set(changed.values()))
+
+        changes = []
+        for key, digest in changed.items():
+            kind, parent, item = bodies[digest]
+            changes.append({'op': 'modify' if key in before else 'add', 'key': key, 'kind': kind, 'parent': parent, 'item': item})
+        changes.extend({'op': 'remove', 'key': key} for key in before.keys() - after.keys())
+        return sorted(changes, key=lambda change: change['key'])
+
+    def stats(self) -> Dict[str, int]:
+        """저장된 스냅샷/변경분/본문 수와 파일 크기(바이트)"""
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('snapshots', 'deltas', 'blobs')
+            }
+        counts['file_bytes'] = sum(os.path.getsize(path) for path in (self.path, self.path + '-wal') if os.path.exists(path))
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def org_entries(org_structure: Dict[str, Any]) -> Iterator[Entry]:
+    """AWSOrgReader.get_org_structure 결과를 스냅샷 항목으로 펼칩니다. (키는 '종류:ID')"""
+    for root in org_structure.get('roots', []):
+        yield f"root:{root['Id']}", 'root', None, root
+    for kind, key in (('ou', 'ous'), ('account', 'accounts')):
+        for parent_id, items in org_structure.get(key, {}).items():
+            for item in items:
+                yield f"{kind}:{item['Id']}", kind, parent_id, item
+
+def org_structure_from_view(entries: Iterable[Entry]) -> Dict[str, Any]:
+    """스냅샷 항목을 get_org_structure와 같은 형식으로 되돌립니다. (같은 부모 안의 항목은 ID 순)"""
+    org_structure = {'roots': [], 'ous': {}, 'accounts': {}}
+    for _, kind, parent, item in entries:
+        if kind == 'root':
+            org_structure['roots'].append(item)
+        else:
+            org_structure['ous' if kind == 'ou' else 'accounts'].setdefault(parent, []).append(item)
+        if kind != 'account':
+            org_structure['ous'].setdefault(item['Id'], [])
+            org_structure['accounts'].setdefault(item['Id'], [])
+    return org_structure
+
+# budget_entries의 항목 종류 (상세 정보 포함 / 예산 목록만)
+BUDGET_DETAIL_KINDS = ('budget', 'budget_detail')
+BUDGET_KINDS = ('budget',)
+
+def budget_entries(account_id: str, budgets: Iterable[Any], budget_details: Iterable[Dict[str, Any]] = None) -> Iterator[Entry]:
+    """
+    예산 목록(과 get_all_budget_details 결과)을 스냅샷 항목으로 펼칩니다. (키는 '종류:예산 이름')
+
+    상세 정보 없이 기록할 때는 commit(kinds=BUDGET_KINDS)로 기존 budget_detail 항목을 유지합니다.
+    """
+    for budget in budgets:
+        yield f"budget:{budget['BudgetName']}", 'budget', account_id, budget
+    for detail in budget_details or []:
+        yield f"budget_detail:{detail['BudgetName']}", 'budget_detail', account_id, detail
+
+def budgets_from_view(entries: Iterable[Entry]) -> Dict[str, Any]:
+    """스냅샷 항목을 test_budget.py 출력과 같은 형식({'budgets': [...], 'budget_details': [...]})으로 되돌립니다."""
+    result: Dict[str, Any] = {'budgets': []}
+    for _, kind, _, item in entries:
+        if kind == 'budget':
+            result['budgets'].append(item)
+        elif kind == 'budget_detail':
+            result.setdefault('budget_details', []).append(item)
+    return result
+
+def document_from_view(stream: str, entries: Iterable[Entry]) -> Any:
+    """스트림 이름에 맞는 원래 출력 형식으로 되돌립니다. (알 수 없는 스트림은 항목 목록)"""
+    if stream.startswith('org/'):
+        return org_structure_from_view(entries)
+    if stream.startswith('budgets/'):
+        return budgets_from_view(entries)
+    return [{'key': key, 'kind': kind, 'parent': parent, 'item': item} for key, kind, parent, item in entries]
+
+def print_commit_summary(result: Dict[str, Any], file: TextIO = None) -> None:
+    """commit 결과를 한 줄로 출력합니다. (file을 지정하지 않으면 stdout)"""
+    counts = {op: sum(1 for change in result['changes'] if change['op'] == op) for op in ('add', 'modify', 'remove')}
+    if not result['changes']:
+        print(f"스냅샷 {result['snapshot_id']} ({result['stream']}): 변경 없음 (항목 {result['total']}개)", file=file)
+    else:
+        print(f"스냅샷 {result['snapshot_id']} ({result['stream']}): 추가 {counts['add']}개, 변경 {counts['modify']}개, 삭제 {counts['remove']}개 (항목 {result['total']}개)", file=file)
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help=f'스냅샷 저장소 파일 경로 (기본값: {DEFAULT_STORE_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('streams', help='스트림 목록과 저장소 크기')
+
+    list_parser = subparsers.add_parser('list', help='스트림의 스냅샷 목록')
+    list_parser.add_argument('stream', help="스트림 이름 (예: org/123456789012, budgets/123456789012)")
+
+    show_parser = subparsers.add_parser('show', help='특정 시점의 전체 스냅샷을 원래 출력 형식으로 다시 만듦')
+    show_parser.add_argument('stream', help='스트림 이름')
+    show_parser.add_argument('--snapshot', type=int, help='스냅샷 ID (기본값: 마지막 스냅샷)')
+    show_parser.add_argument('--at', help='이 시각 이전의 마지막 스냅샷 (ISO 8601 또는 epoch 초)')
+    show_parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로 (지정하지 않으면 stdout으로 출력)')
+
+    diff_parser = subparsers.add_parser('diff', help='두 스냅샷 사이의 변경분')
+    diff_parser.add_argument('stream', help='스트림 이름')
+    diff_parser.add_argument('--from', dest='from_id', type=int, help='기준 스냅샷 ID (기본값: 대상 직전 스냅샷)')
+    diff_parser.add_argument('--to', dest='to_id', type=int, help='대상 스냅샷 ID (기본값: 마지막 스냅샷)')
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    try:
+        store = SnapshotStore(args.store)
+
+        if args.command == 'streams':
+            result = {'streams': store.streams(), 'stats': store.stats()}
+        elif args.command == 'list':
+            result = store.snapshots(args.stream)
+        elif args.command == 'show':
+            snapshot_id = store.resolve(args.stream, args.snapshot, parse_time(args.at) if args.at else None)
+            if snapshot_id is None:
+                raise ValueError(f"스트림 '{args.stream}'에서 조건에 맞는 스냅샷을 찾을 수 없습니다.")
+            result = document_from_view(args.stream, store.iter_view(args.stream, snapshot_id))
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+                print(f"스냅샷 {snapshot_id}을(를) {args.output}에 저장했습니다.")
+                return
+        else:
+            to_id = store.resolve(args.stream, args.to_id)
+            if to_id is None:
+                raise ValueError(f"스트림 '{args.stream}'에서 스냅샷을 찾을 수 없습니다.")
+            from_id = args.from_id
+            if from_id is None:
+                earlier = [snapshot['snapshot_id'] for snapshot in store.snapshots(args.stream) if snapshot['snapshot_id'] < to_id]
+                from_id = earlier[-1] if earlier else None
+            result = {'from': from_id, 'to': to_id, 'changes': store.diff(args.stream, from_id, to_id)}
+
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser, parser.parse_args())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import threading
+import time
+from typing import Dict, Any
+from aws_budget import AWSBudgetReader
+
+class StubBudgetsClient:
+    """지연 시간을 흉내 내고 API 호출 수를 세는 Budgets 클라이언트 스텁"""
+
+    def __init__(self, budgets: int, notifications_per_budget: int = 2, actions_per_budget: int = 1, latency: float = 0.02):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.budgets = [
+            {
+                'BudgetName': f"budget-{i}",
+                'BudgetType': 'COST',
+                'TimeUnit': 'MONTHLY',
+                'BudgetLimit': {'Amount': '1000', 'Unit': 'USD'},
+                'CalculatedSpend': {'ActualSpend': {'Amount': '120.5', 'Unit': 'USD'}}
+            }
+            for i in range(budgets)
+        ]
+        self.notifications = [
+            {'NotificationType': 'ACTUAL', 'ComparisonOperator': 'GREATER_THAN', 'Threshold': float(80 + n), 'ThresholdType': 'PERCENTAGE'}
+            for n in range(notifications_per_budget)
+        ]
+        self.actions_per_budget = actions_per_budget
+
+    def _wait(self) -> None:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+    def _actions(self, budget_name: str):
+        return [
+            {'ActionId': f"{budget_name}-action-{n}", 'BudgetName': budget_name, 'ActionType': 'APPLY_IAM_POLICY', 'Status': 'STANDBY'}
+            for n in range(self.actions_per_budget)
+        ]
+
+    def describe_budgets(self, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Budgets': self.budgets}
+
+    def describe_budget(self, BudgetName: str, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Budget': next(budget for budget in self.budgets if budget['BudgetName'] == BudgetName)}
+
+    def describe_notifications_for_budget(self, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Notifications': self.notifications}
+
+    def describe_budget_actions_for_budget(self, BudgetName: str, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Actions': self._actions(BudgetName)}
+
+    def describe_budget_notifications_for_account(self, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'BudgetNotificationsForAccount': [
+            {'BudgetName': budget['BudgetName'], 'Notifications': self.notifications} for budget in self.budgets
+        ]}
+
+    def describe_budget_actions_for_account(self, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Actions': [action for budget in self.budgets for action in self._actions(budget['BudgetName'])]}
+
+    def describe_subscribers_for_notification(self, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Subscribers': [{'SubscriptionType': 'EMAIL', 'Address': 'finops@example.com'}]}
+
+class StubSessionManager:
+    def __init__(self, client):
+        self.client = client
+
+    def get_client(self, service_name: str, **kwargs):
+        return self.client
+
+def make_reader(client: StubBudgetsClient) -> AWSBudgetReader:
+    return AWSBudgetReader(
+        role_arn='arn:aws:iam::000000000000:role/stub',
+        session_name='bench',
+        external_id='bench',
+        session_manager=StubSessionManager(client)
+    )
+
+def audit_serial(reader: AWSBudgetReader, account_id: str) -> None:
+    """기존 방식: 예산마다 get_complete_budget_info와 알림별 구독자 조회를 순서대로 실행"""
+    for budget in reader.describe_budgets(account_id):
+        info = reader.get_complete_budget_info(budget['BudgetName'], account_id)
+        for notification in info['notifications']:
+            reader.client.describe_subscribers_for_notification(
+                AccountId=account_id, BudgetName=budget['BudgetName'], Notification=notification
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description='AWSBudgetReader 예산 상세 일괄 조회 벤치마크')
+    parser.add_argument('--budgets', default='10,50,100', help='예산 수 목록 (쉼표 구분)')
+    parser.add_argument('--latency', type=float, default=0.02, help='API 호출당 지연 시간(초)')
+    parser.add_argument('--max-workers', type=int, default=16, help='일괄 조회 시 동시 API 호출 수')
+
+    args = parser.parse_args()
+
+    print(f"{'budgets':>8} {'serial calls':>13} {'serial(s)':>10} {'bulk calls':>11} {'bulk(s)':>8} {'speedup':>8}")
+    for count in [int(b) for b in args.budgets.split(',')]:
+        serial_client = StubBudgetsClient(count, latency=args.latency)
+        started = time.perf_counter()
+        audit_serial(make_reader(serial_client), '000000000000')
+        serial_elapsed = time.perf_counter() - started
+
+        bulk_client = StubBudgetsClient(count, latency=args.latency)
+        started = time.perf_counter()
+        make_reader(bulk_client).get_all_budget_details('000000000000', max_workers=args.max_workers)
+        bulk_elapsed = time.perf_counter() - started
+
+        print(f"{count:>8} {serial_client.calls:>13} {serial_elapsed:>10.3f} {bulk_client.calls:>11} {bulk_elapsed:>8.3f} {serial_elapsed / bulk_elapsed:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
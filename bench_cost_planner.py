@@ -0,0 +1,218 @@
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Any, Tuple
+from aws_cost_explorer import AWSCostExplorer
+from aws_cost_planner import CostQuery, CostQueryPlanner
+
+REGIONS = ['ap-northeast-2', 'us-east-1', 'eu-west-1']
+
+class StubCostExplorerClient:
+    """
+    일 단위 (계정, 서비스, 리전) 비용에서 응답을 합산하여 만드는 get_cost_and_usage 스텁입니다.
+
+    모든 세분화 단위/GroupBy/LINKED_ACCOUNT 필터 조합이 같은 원본 데이터에서 계산되므로
+    플래너의 합산 결과와 직접 조회 결과를 비교할 수 있습니다.
+    """
+
+    def __init__(self, accounts: int, services: int, latency: float = 0.0, page_days: int = 7):
+        self.values = {
+            'LINKED_ACCOUNT': [f"{index:012d}" for index in range(accounts)],
+            'SERVICE': [f"Amazon Service {index:02d}" for index in range(services)],
+            'REGION': REGIONS
+        }
+        self.latency = latency
+        self.page_days = page_days
+        self.calls = 0
+
+    @staticmethod
+    def _amount(day: int, account: int, service: int, region: int) -> float:
+        return ((day * 31 + account * 17 + service * 7 + region * 3) % 997) / 100
+
+    def get_cost_and_usage(self, TimePeriod: Dict[str, str], Granularity: str, Metrics: List[str], GroupBy: List[Dict[str, str]] = None, Filter: Dict[str, Any] = None, NextPageToken: str = None, **params) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency)
+
+        start = date.fromisoformat(TimePeriod['Start'])
+        end = date.fromisoformat(TimePeriod['End'])
+        if Granularity == 'MONTHLY':
+            periods = []
+            current = start
+            while current < end:
+                next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+                periods.append((current, min(next_month, end)))
+                current = next_month
+        else:
+            periods = [(start + timedelta(days=i), start + timedelta(days=i + 1)) for i in range((end - start).days)]
+
+        keys = [group['Key'] for group in GroupBy or []]
+        allowed = set(Filter['Dimensions']['Values']) if Filter else None
+        offset = int(NextPageToken or 0)
+        results = []
+        for period_start, period_end in periods[offset:offset + self.page_days]:
+            sums: Dict[Tuple[str, ...], float] = {}
+            for day in range(period_start.toordinal(), period_end.toordinal()):
+                for account_index, account in enumerate(self.values['LINKED_ACCOUNT']):
+                    if allowed is not None and account not in allowed:
+                        continue
+                    for service_index, service in enumerate(self.values['SERVICE']):
+                        for region_index, region in enumerate(REGIONS):
+                            row = {'LINKED_ACCOUNT': account, 'SERVICE': service, 'REGION': region}
+                            group = tuple(row[key] for key in keys)
+                            sums[group] = sums.get(group, 0.0) + self._amount(day, account_index, service_index, region_index)
+
+            result: Dict[str, Any] = {
+                'TimePeriod': {'Start': period_start.isoformat(), 'End': period_end.isoformat()},
+                'Total': {},
+                'Groups': [],
+                'Estimated': False
+            }
+            amounts = {group: {metric: {'Amount': f"{amount:.10f}", 'Unit': 'USD'} for metric in Metrics} for group, amount in sums.items()}
+            if keys:
+                result['Groups'] = [{'Keys': list(group), 'Metrics': metrics} for group, metrics in amounts.items()]
+            else:
+                result['Total'] = amounts.get((), {metric: {'Amount': '0', 'Unit': 'USD'} for metric in Metrics})
+            results.append(result)
+
+        response: Dict[str, Any] = {
+            'GroupDefinitions': [{'Type': group['Type'], 'Key': group['Key']} for group in GroupBy or []],
+            'ResultsByTime': results,
+            'DimensionValueAttributes': [
+                {'Value': account, 'Attributes': {'description': f"account-{index}"}}
+                for index, account in enumerate(self.values['LINKED_ACCOUNT'])
+                if 'LINKED_ACCOUNT' in keys and (allowed is None or account in allowed)
+            ]
+        }
+        if offset + self.page_days < len(periods):
+            response['NextPageToken'] = str(offset + self.page_days)
+        return response
+
+class StubSessionManager:
+    """항상 같은 스텁 클라이언트를 반환하는 세션 매니저 스텁"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_client(self, service_name: str, **kwargs):
+        return self.client
+
+def make_explorer(client: StubCostExplorerClient) -> AWSCostExplorer:
+    return AWSCostExplorer(
+        role_arn='arn:aws:iam::000000000000:role/stub',
+        session_name='bench',
+        external_id='bench',
+        session_manager=StubSessionManager(client)
+    )
+
+def dashboard_queries(accounts: List[str], start: date, months: int) -> List[CostQuery]:
+    """
+    대시보드가 한 번에 보내는 겹치는 요청들을 만듭니다.
+
+    - 조직 전체 서비스별 DAILY / MONTHLY
+    - 계정별 서비스별 MONTHLY (계정마다 한 번씩)
+    - 계정별 합계 MONTHLY, 조직 합계 MONTHLY (중복 포함)
+    - 일부 계정의 서비스 x 리전 MONTHLY (GroupBy 2개 + 계정 필터)
+    """
+    end = start
+    for _ in range(months):
+        end = (end + timedelta(days=32)).replace(day=1)
+    period = {'start_date': start.isoformat(), 'end_date': end.isoformat()}
+
+    queries = [
+        CostQuery.from_dict(dict(period, granularity='DAILY', group_by=['SERVICE'])),
+        CostQuery.from_dict(dict(period, granularity='MONTHLY', group_by=['SERVICE'])),
+        CostQuery.from_dict(dict(period, granularity='MONTHLY', group_by=['LINKED_ACCOUNT'])),
+        CostQuery.from_dict(dict(period, granularity='MONTHLY')),
+        CostQuery.from_dict(dict(period, granularity='MONTHLY')),
+        CostQuery.from_dict(dict(period, granularity='MONTHLY', group_by=['SERVICE', 'REGION'], accounts=accounts[:3]))
+    ]
+    queries.extend(
+        CostQuery.from_dict(dict(period, granularity='MONTHLY', group_by=['SERVICE'], accounts=[account]))
+        for account in accounts
+    )
+    return queries
+
+def flatten(response: Dict[str, Any]) -> Dict[Tuple[str, ...], float]:
+    """응답을 (기간, 그룹 키, 메트릭) -> 금액으로 펼칩니다."""
+    rows = {}
+    for row in AWSCostExplorer.iter_result_rows(response):
+        for metric, value in row['metrics'].items():
+            rows[(row['period_start'], row['period_end'], row['group_keys'], metric)] = float(value['Amount'])
+    return rows
+
+def same_amounts(expected: Dict[str, Any], actual: Dict[str, Any]) -> bool:
+    expected_rows, actual_rows = flatten(expected), flatten(actual)
+    return expected_rows.keys() == actual_rows.keys() and all(abs(expected_rows[key] - actual_rows[key]) < 1e-6 for key in expected_rows)
+
+def main():
+    parser = argparse.ArgumentParser(description='비용 조회 플래너 벤치마크 (요청별 직접 조회 대비 API 호출 수/소요 시간/결과 일치)')
+    parser.add_argument('--accounts', type=int, default=20, help='계정 수 (기본값: 20, 계정별 요청 수와 같음)')
+    parser.add_argument('--services', type=int, default=8, help='서비스 수 (기본값: 8)')
+    parser.add_argument('--months', type=int, default=3, help='조회 기간(월) (기본값: 3)')
+    parser.add_argument('--latency', type=float, default=0.05, help='API 호출당 지연 시간(초) (기본값: 0.05)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    args = parser.parse_args()
+
+    try:
+        start = (date.today().replace(day=1) - timedelta(days=1)).replace(day=1)
+        for _ in range(args.months - 1):
+            start = (start - timedelta(days=1)).replace(day=1)
+
+        direct_client = StubCostExplorerClient(args.accounts, args.services, latency=args.latency)
+        queries = dashboard_queries(direct_client.values['LINKED_ACCOUNT'], start, args.months)
+
+        direct_explorer = make_explorer(direct_client)
+        started = time.perf_counter()
+        expected = [
+            direct_explorer.get_cost_and_usage(
+                query.start_date,
+                query.end_date,
+                granularity=query.granularity,
+                metrics=list(query.metrics),
+                group_by=query.group_by_params() or None,
+                filter={'Dimensions': {'Key': 'LINKED_ACCOUNT', 'Values': sorted(query.accounts)}} if query.accounts is not None else None
+            )
+            for query in queries
+        ]
+        direct_seconds = time.perf_counter() - started
+
+        planner_client = StubCostExplorerClient(args.accounts, args.services, latency=args.latency)
+        planner = CostQueryPlanner(make_explorer(planner_client))
+        started = time.perf_counter()
+        answers = planner.execute(queries)
+        planner_seconds = time.perf_counter() - started
+
+        mismatched = [index for index, (response, answer) in enumerate(zip(expected, answers)) if not same_amounts(response, answer)]
+
+        result = {
+            'requests': len(queries),
+            'direct': {'api_calls': direct_client.calls, 'seconds': round(direct_seconds, 3)},
+            'planner': {'api_calls': planner_client.calls, 'seconds': round(planner_seconds, 3), 'report': planner.report},
+            'plan': [fetch.to_dict() for fetch in planner.fetched],
+            'mismatched_requests': mismatched
+        }
+
+        print(f"요청 {len(queries)}개")
+        print(f"- 직접 조회: API 호출 {direct_client.calls}회, {direct_seconds:.3f}초")
+        print(f"- 플래너:   API 호출 {planner_client.calls}회, {planner_seconds:.3f}초 (합친 호출 {len(planner.fetched)}건)")
+        for fetch in planner.fetched:
+            print(f"  {fetch.granularity:<8} {fetch.start_date} ~ {fetch.end_date} GroupBy={[key for _, key in fetch.group_by]} 요청 {len(fetch.queries)}개")
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            print(f"결과가 {args.output}에 저장되었습니다.")
+
+        if mismatched:
+            print(f"직접 조회와 결과가 다른 요청: {mismatched}")
+            exit(1)
+        print("모든 요청의 결과가 직접 조회와 같습니다.")
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import threading
+import time
+from typing import Dict, Any
+from aws_fanout import AccountFanout
+
+class StubBudgetsClient:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def describe_budgets(self, AccountId: str, **kwargs) -> Dict[str, Any]:
+        time.sleep(self.latency)
+        return {'Budgets': [{'BudgetName': f"{AccountId}-monthly", 'BudgetType': 'COST', 'TimeUnit': 'MONTHLY'}]}
+
+class StubCostExplorerClient:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def get_cost_and_usage(self, **kwargs) -> Dict[str, Any]:
+        time.sleep(self.latency)
+        return {'ResultsByTime': [{'TimePeriod': kwargs['TimePeriod'], 'Groups': [], 'Estimated': False}]}
+
+class StubSessionManager:
+    """역할별 첫 클라이언트 요청에 AssumeRole 지연을 흉내 내는 세션 매니저 스텁"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._roles = set()
+
+    def get_client(self, service_name: str, role_arn: str, **kwargs):
+        with self._lock:
+            first = role_arn not in self._roles
+            self._roles.add(role_arn)
+        if first:
+            time.sleep(self.latency)
+        if service_name == 'budgets':
+            return StubBudgetsClient(self.latency)
+        return StubCostExplorerClient(self.latency)
+
+def main():
+    parser = argparse.ArgumentParser(description='AccountFanout 처리량(계정/초) 벤치마크')
+    parser.add_argument('--accounts', type=int, default=200, help='계정 수')
+    parser.add_argument('--latency', type=float, default=0.02, help='API 호출당 지연 시간(초)')
+    parser.add_argument('--workers', default='1,8,32,64', help='동시 수집 계정 수 목록 (쉼표 구분)')
+
+    args = parser.parse_args()
+
+    accounts = [{'Id': f"{i:012d}", 'Name': f"account-{i}", 'Status': 'ACTIVE'} for i in range(args.accounts)]
+    cost_params = {'start_date': '2024-01-01', 'end_date': '2024-02-01'}
+
+    print(f"{'workers':>8} {'elapsed(s)':>11} {'accounts/s':>11} {'failed':>7}")
+    for workers in [int(w) for w in args.workers.split(',')]:
+        fanout = AccountFanout(
+            role_arn_template='arn:aws:iam::{account_id}:role/stub',
+            session_name='bench',
+            external_id='bench',
+            session_manager=StubSessionManager(args.latency),
+            max_workers=workers
+        )
+        summary = fanout.run(accounts, cost_params)['summary']
+        print(f"{workers:>8} {summary['elapsed_seconds']:>11.3f} {summary['accounts_per_second']:>11.1f} {summary['failed']:>7}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import time
+from typing import Dict, List, Any
+from aws_org_reader import AWSOrgReader
+
+class StubOrganizationsClient:
+    """지연 시간을 흉내 내는 Organizations 클라이언트 스텁 (width 갈래, depth 단계의 OU 트리)"""
+
+    def __init__(self, width: int, depth: int, accounts_per_ou: int = 2, latency: float = 0.02):
+        self.latency = latency
+        self.calls = 0
+        self.children: Dict[str, List[Dict[str, Any]]] = {}
+        self.accounts: Dict[str, List[Dict[str, Any]]] = {}
+        self._build('r-stub', width, depth, accounts_per_ou)
+
+    def _build(self, parent_id: str, width: int, depth: int, accounts_per_ou: int) -> None:
+        self.accounts[parent_id] = [
+            {'Id': f"{parent_id}-acct-{i}", 'Name': f"{parent_id}-acct-{i}", 'Status': 'ACTIVE'}
+            for i in range(accounts_per_ou)
+        ]
+        if depth == 0:
+            self.children[parent_id] = []
+            return
+        self.children[parent_id] = [
+            {'Id': f"{parent_id}-ou-{i}", 'Name': f"{parent_id}-ou-{i}"} for i in range(width)
+        ]
+        for ou in self.children[parent_id]:
+            self._build(ou['Id'], width, depth - 1, accounts_per_ou)
+
+    def _wait(self) -> None:
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def list_roots(self, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Roots': [{'Id': 'r-stub', 'Name': 'Root'}]}
+
+    def list_organizational_units_for_parent(self, ParentId: str, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'OrganizationalUnits': self.children.get(ParentId, [])}
+
+    def list_accounts_for_parent(self, ParentId: str, **kwargs) -> Dict[str, Any]:
+        self._wait()
+        return {'Accounts': self.accounts.get(ParentId, [])}
+
+class StubSessionManager:
+    """항상 같은 스텁 클라이언트를 반환하는 세션 매니저 스텁"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_client(self, service_name: str, **kwargs):
+        return self.client
+
+def run(width: int, depth: int, max_workers: int, latency: float) -> Dict[str, Any]:
+    client = StubOrganizationsClient(width, depth, latency=latency)
+    reader = AWSOrgReader(
+        role_arn='arn:aws:iam::000000000000:role/stub',
+        session_name='bench',
+        external_id='bench',
+        session_manager=StubSessionManager(client)
+    )
+
+    started = time.perf_counter()
+    org_structure = reader.get_org_structure(max_workers=max_workers)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'parents': len(org_structure['ous']),
+        'calls': client.calls,
+        'elapsed': elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='AWSOrgReader.get_org_structure 순차/병렬 조회 벤치마크')
+    parser.add_argument('--widths', default='2,4,8,16', help='OU 트리 너비 목록 (쉼표 구분)')
+    parser.add_argument('--depth', type=int, default=2, help='OU 트리 깊이')
+    parser.add_argument('--latency', type=float, default=0.02, help='API 호출당 지연 시간(초)')
+    parser.add_argument('--max-workers', type=int, default=16, help='병렬 조회 시 동시 API 호출 수')
+
+    args = parser.parse_args()
+
+    print(f"{'width':>6} {'parents':>8} {'calls':>6} {'serial(s)':>10} {'concurrent(s)':>14} {'speedup':>8}")
+    for width in [int(w) for w in args.widths.split(',')]:
+        serial = run(width, args.depth, 1, args.latency)
+        concurrent = run(width, args.depth, args.max_workers, args.latency)
+        speedup = serial['elapsed'] / concurrent['elapsed'] if concurrent['elapsed'] else 0.0
+        print(f"{width:>6} {serial['parents']:>8} {serial['calls']:>6} {serial['elapsed']:>10.3f} {concurrent['elapsed']:>14.3f} {speedup:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Callable
+from aws_org_reader import DateTimeEncoder
+from aws_records import Account, Budget, to_records
+
+# 프로젝션 측정에 사용할 필드 (list_accounts/예산 분석에 필요한 최소 키)
+ACCOUNT_FIELDS = ('Id', 'Name', 'Status')
+BUDGET_FIELDS = ('BudgetName', 'BudgetType', 'TimeUnit', 'BudgetLimit', 'CalculatedSpend')
+
+def make_account(index: int) -> Dict[str, Any]:
+    """botocore가 파싱한 list_accounts_for_parent 항목과 같은 모양의 dict를 새로 만듭니다."""
+    account_id = f"{index:012d}"
+    return {
+        'Id': account_id,
+        'Arn': f"arn:aws:organizations::000000000000:account/o-bench/{account_id}",
+        'Email': f"account-{index}@example.com",
+        'Name': f"account-{index}",
+        'Status': ''.join(['ACT', 'IVE']),
+        'JoinedMethod': ''.join(['CRE', 'ATED']),
+        'JoinedTimestamp': datetime(2020, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=index)
+    }
+
+def make_budget(index: int) -> Dict[str, Any]:
+    """botocore가 파싱한 describe_budgets 항목과 같은 모양의 dict를 새로 만듭니다."""
+    return {
+        'BudgetName': f"budget-{index}",
+        'BudgetLimit': {'Amount': f"{1000 + index}.0", 'Unit': ''.join(['US', 'D'])},
+        'CostFilters': {},
+        'CostTypes': {
+            'IncludeTax': True, 'IncludeSubscription': True, 'UseBlended': False, 'IncludeRefund': False,
+            'IncludeCredit': False, 'IncludeUpfront': True, 'IncludeRecurring': True, 'IncludeOtherSubscription': True,
+            'IncludeSupport': True, 'IncludeDiscount': True, 'UseAmortized': False
+        },
+        'TimeUnit': ''.join(['MON', 'THLY']),
+        'TimePeriod': {
+            'Start': datetime(2024, 1, 1, tzinfo=timezone.utc),
+            'End': datetime(2087, 6, 15, tzinfo=timezone.utc)
+        },
+        'CalculatedSpend': {
+            'ActualSpend': {'Amount': f"{(index * 37) % 1000}.5", 'Unit': ''.join(['US', 'D'])},
+            'ForecastedSpend': {'Amount': f"{(index * 41) % 1500}.25", 'Unit': ''.join(['US', 'D'])}
+        },
+        'BudgetType': ''.join(['CO', 'ST']),
+        'LastUpdatedTime': datetime(2024, 6, 1, tzinfo=timezone.utc) + timedelta(seconds=index)
+    }
+
+def retained_bytes(build: Callable[[], List[Any]]) -> Dict[str, int]:
+    """build가 만든 목록이 유지하는 메모리와 만드는 동안의 최대 메모리(바이트)를 측정합니다."""
+    gc.collect()
+    tracemalloc.start()
+    items = build()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return {'retained': retained, 'peak': peak}
+
+def same_json(originals: List[Dict[str, Any]], records: List[Any]) -> bool:
+    """레코드의 JSON 직렬화 결과가 원본 dict와 같은지 확인합니다. (시간은 같은 시점을 가리키는지 비교)"""
+    def normalize(value: Any) -> Any:
+        return json.loads(json.dumps(value, cls=DateTimeEncoder, sort_keys=True), object_hook=_normalize_times)
+    return normalize(originals) == normalize(records)
+
+def _normalize_times(obj: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in obj.items():
+        if isinstance(value, str) and len(value) >= 19 and value[10:11] == 'T':
+            try:
+                obj[key] = datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                pass
+    return obj
+
+def main():
+    parser = argparse.ArgumentParser(description='계정/예산 응답 dict와 __slots__ 레코드(Account/Budget)의 메모리 사용량 비교 벤치마크')
+    parser.add_argument('--accounts', type=int, default=5000, help='계정 수 (기본값: 5000)')
+    parser.add_argument('--budgets', type=int, default=20000, help='예산 수 (기본값: 20000)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    args = parser.parse_args()
+
+    cases = {
+        'account': (args.accounts, make_account, Account, ACCOUNT_FIELDS),
+        'budget': (args.budgets, make_budget, Budget, BUDGET_FIELDS)
+    }
+
+    try:
+        results = {}
+        print(f"{'case':<20} {'count':>7} {'retained(MB)':>13} {'bytes/item':>11} {'peak(MB)':>9}")
+        for name, (count, make, record_type, fields) in cases.items():
+            variants = {
+                'dict': lambda: [make(i) for i in range(count)],
+                # 응답 페이지 단위(100개)로 변환하여 원본 dict가 바로 해제되는 실제 수집 경로와 같게 측정
+                'record': lambda: [record for start in range(0, count, 100) for record in to_records(record_type, (make(i) for i in range(start, min(start + 100, count))))],
+                'projected': lambda: [record for start in range(0, count, 100) for record in to_records(record_type, (make(i) for i in range(start, min(start + 100, count))), fields)]
+            }
+            for variant, build in variants.items():
+                measured = retained_bytes(build)
+                case = f"{name}/{variant}"
+                results[case] = {
+                    'count': count,
+                    'retained_bytes': measured['retained'],
+                    'bytes_per_item': round(measured['retained'] / count) if count else 0,
+                    'peak_bytes': measured['peak']
+                }
+                print(f"{case:<20} {count:>7} {measured['retained'] / 1048576:>13.2f} {results[case]['bytes_per_item']:>11} {measured['peak'] / 1048576:>9.2f}")
+
+            sample = [make(i) for i in range(min(count, 1000))]
+            if not same_json(sample, to_records(record_type, sample)):
+                raise RuntimeError(f"{name}: 레코드의 JSON 출력이 원본과 다릅니다.")
+
+        print("레코드의 JSON 출력이 원본 dict와 같습니다.")
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            print(f"결과가 {args.output}에 저장되었습니다.")
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any
+from aws_org_reader import DateTimeEncoder
+from aws_snapshot_store import SnapshotStore, org_entries, budget_entries, org_structure_from_view, budgets_from_view
+
+def make_org(accounts: int, ous: int) -> Dict[str, Any]:
+    """루트 하나, OU ous개, 계정 accounts개로 된 합성 조직 구조를 만듭니다."""
+    root_id = 'r-0000'
+    org = {
+        'roots': [{'Id': root_id, 'Arn': f"arn:aws:organizations::000000000000:root/o-bench/{root_id}", 'Name': 'Root', 'PolicyTypes': []}],
+        'ous': {root_id: []},
+        'accounts': {root_id: []}
+    }
+    for index in range(ous):
+        ou_id = f"ou-0000-{index:08d}"
+        org['ous'][root_id].append({'Id': ou_id, 'Arn': f"arn:aws:organizations::000000000000:ou/o-bench/{ou_id}", 'Name': f"ou-{index}"})
+        org['ous'][ou_id] = []
+        org['accounts'][ou_id] = []
+    parents = [root_id] + [ou['Id'] for ou in org['ous'][root_id]]
+    joined = datetime(2020, 1, 1)
+    for index in range(accounts):
+        account_id = f"{index:012d}"
+        org['accounts'][parents[index % len(parents)]].append({
+            'Id': account_id,
+            'Arn': f"arn:aws:organizations::000000000000:account/o-bench/{account_id}",
+            'Email': f"account-{index}@example.com",
+            'Name': f"account-{index}",
+            'Status': 'ACTIVE',
+            'JoinedMethod': 'CREATED',
+            'JoinedTimestamp': joined + timedelta(hours=index)
+        })
+    return org
+
+def make_budgets(count: int) -> List[Dict[str, Any]]:
+    return [{
+        'BudgetName': f"budget-{index}",
+        'BudgetLimit': {'Amount': f"{1000 + index}.0", 'Unit': 'USD'},
+        'CostFilters': {},
+        'TimeUnit': 'MONTHLY',
+        'TimePeriod': {'Start': datetime(2024, 1, 1), 'End': datetime(2087, 6, 15)},
+        'CalculatedSpend': {
+            'ActualSpend': {'Amount': f"{index % 997}.0", 'Unit': 'USD'},
+            'ForecastedSpend': {'Amount': f"{index % 997 * 1.5}", 'Unit': 'USD'}
+        },
+        'BudgetType': 'COST',
+        'LastUpdatedTime': datetime(2024, 1, 1)
+    } for index in range(count)]
+
+def mutate_org(org: Dict[str, Any], rng: random.Random, changes: int, serial: List[int]) -> None:
+    """계정 이름 변경, OU 간 이동, 계정 추가/삭제를 섞어 changes건 적용합니다."""
+    parents = list(org['accounts'].keys())
+    for _ in range(changes):
+        action = rng.random()
+        parent = rng.choice(parents)
+        accounts = org['accounts'][parent]
+        if action < 0.6 and accounts:
+            account = rng.choice(accounts)
+            account['Name'] = f"{account['Name'].split('#')[0]}#{serial[0]}"
+        elif action < 0.8 and accounts:
+            account = accounts.pop(rng.randrange(len(accounts)))
+            org['accounts'][rng.choice(parents)].append(account)
+        elif action < 0.9 and accounts:
+            accounts.pop(rng.randrange(len(accounts)))
+        else:
+            accounts.append({'Id': f"9{serial[0]:011d}", 'Name': f"new-{serial[0]}", 'Email': f"new-{serial[0]}@example.com", 'Status': 'ACTIVE'})
+        serial[0] += 1
+
+def mutate_budgets(budgets: List[Dict[str, Any]], rng: random.Random, changes: int) -> None:
+    """임의의 예산 changes개의 실제 지출 금액을 갱신합니다."""
+    for budget in rng.sample(budgets, min(changes, len(budgets))):
+        actual = budget['CalculatedSpend']['ActualSpend']
+        actual['Amount'] = f"{float(actual['Amount']) + rng.randint(1, 50):.1f}"
+
+def canonical(document: Any) -> Any:
+    """순서와 무관하게 비교할 수 있도록 목록을 정렬한 JSON 값으로 바꿉니다."""
+    value = json.loads(json.dumps(document, cls=DateTimeEncoder))
+
+    def normalize(node):
+        if isinstance(node, dict):
+            return {key: normalize(child) for key, child in node.items()}
+        if isinstance(node, list):
+            return sorted((normalize(child) for child in node), key=lambda child: json.dumps(child, sort_keys=True))
+        return node
+
+    return normalize(value)
+
+def main():
+    parser = argparse.ArgumentParser(description='스냅샷 저장소 벤치마크 (전체 JSON 저장 대비 크기, 기록/시점 복원 시간, 복원 결과 일치)')
+    parser.add_argument('--accounts', type=int, default=5000, help='계정 수 (기본값: 5000)')
+    parser.add_argument('--ous', type=int, default=50, help='OU 수 (기본값: 50)')
+    parser.add_argument('--budgets', type=int, default=2000, help='예산 수 (기본값: 2000)')
+    parser.add_argument('--snapshots', type=int, default=96, help='스냅샷 횟수 (기본값: 96, 15분 간격 하루)')
+    parser.add_argument('--org-changes', type=int, default=10, help='스냅샷마다 바뀌는 조직 항목 수 (기본값: 10)')
+    parser.add_argument('--budget-changes', type=int, default=40, help='스냅샷마다 바뀌는 예산 수 (기본값: 40)')
+    parser.add_argument('--seed', type=int, default=7, help='난수 시드 (기본값: 7)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    args = parser.parse_args()
+
+    try:
+        rng = random.Random(args.seed)
+        org = make_org(args.accounts, args.ous)
+        budgets = make_budgets(args.budgets)
+        serial = [0]
+        started_at = datetime(2024, 6, 1).timestamp()
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = SnapshotStore(os.path.join(directory, 'snapshots.sqlite3'))
+            full_bytes = 0
+            commit_seconds = 0.0
+            expected: Dict[int, tuple] = {}
+            check_every = max(1, args.snapshots // 8)
+
+            for index in range(args.snapshots):
+                if index:
+                    mutate_org(org, rng, args.org_changes, serial)
+                    mutate_budgets(budgets, rng, args.budget_changes)
+                taken_at = started_at + index * 900
+                document = {'org': org, 'budgets': budgets}
+                full_bytes += len(json.dumps(document, indent=2, ensure_ascii=False, cls=DateTimeEncoder).encode('utf-8'))
+
+                started = time.perf_counter()
+                org_result = store.commit('org/000000000000', org_entries(org), taken_at=taken_at)
+                budget_result = store.commit('budgets/000000000000', budget_entries('000000000000', budgets), taken_at=taken_at)
+                commit_seconds += time.perf_counter() - started
+
+                if index % check_every == 0 or index == args.snapshots - 1:
+                    expected[index] = (org_result['snapshot_id'], budget_result['snapshot_id'], taken_at, canonical(document))
+
+            stats = store.stats()
+
+            rebuild_seconds = []
+            mismatched = []
+            for index, (org_id, budget_id, taken_at, document) in expected.items():
+                started = time.perf_counter()
+                rebuilt = {
+                    'org': org_structure_from_view(store.view('org/000000000000', at=taken_at)),
+                    'budgets': budgets_from_view(store.view('budgets/000000000000', at=taken_at))['budgets']
+                }
+                rebuild_seconds.append(time.perf_counter() - started)
+                resolved = (store.resolve('org/000000000000', at=taken_at), store.resolve('budgets/000000000000', at=taken_at))
+                if resolved != (org_id, budget_id) or canonical(rebuilt) != document:
+                    mismatched.append(index)
+            store.close()
+
+        result = {
+            'snapshots': args.snapshots,
+            'items_per_snapshot': args.accounts + args.ous + 1 + args.budgets,
+            'full_json_bytes': full_bytes,
+            'store': stats,
+            'ratio': round(full_bytes / stats['file_bytes'], 1),
+            'commit_ms_avg': round(commit_seconds / args.snapshots * 1000, 2),
+            'rebuild_ms_avg': round(sum(rebuild_seconds) / len(rebuild_seconds) * 1000, 2),
+            'checked_snapshots': sorted(expected),
+            'mismatched_snapshots': mismatched
+        }
+
+        print(f"스냅샷 {args.snapshots}회 (회당 항목 {result['items_per_snapshot']}개)")
+        print(f"- 전체 JSON 저장: {full_bytes / 1024 / 1024:.1f} MB")
+        print(f"- 스냅샷 저장소:  {stats['file_bytes'] / 1024 / 1024:.1f} MB (변경분 {stats['deltas']}행, 본문 {stats['blobs']}개, {result['ratio']}배 작음)")
+        print(f"- 기록: 평균 {result['commit_ms_avg']}ms, 시점 복원: 평균 {result['rebuild_ms_avg']}ms")
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+            print(f"결과가 {args.output}에 저장되었습니다.")
+
+        if mismatched:
+            print(f"원본과 복원 결과가 다른 스냅샷: {mismatched}")
+            exit(1)
+        print("복원한 모든 시점이 원본과 같습니다.")
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Any
+from aws_cost_cache import CostCache, caller_scope
+from aws_cost_explorer import AWSCostExplorer
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+# 시나리오별로 import되면 안 되는 모듈 (boto3는 botocore를 함께 import함)
+HEAVY_MODULES = ('botocore', 'boto3', 'numpy')
+
+CACHE_HIT_ROLE_ARN = 'arn:aws:iam::123456789012:role/bench'
+CACHE_HIT_EXTERNAL_ID = 'bench'
+
+# 시나리오 -> (CLI 인자, 예상 종료 코드, import되면 안 되는 모듈, 시작 시간 예산(ms, 중앙값))
+SCENARIOS = {
+    'help': (['--help'], 0, HEAVY_MODULES, 100.0),
+    'cost-help': (['cost', '--help'], 0, HEAVY_MODULES, 150.0),
+    'arg-error': (['cost', '--start-date', '2024-01-01'], 2, HEAVY_MODULES, 150.0),
+    'cost-cache-hit': ([
+        'cost', '--role-arn', CACHE_HIT_ROLE_ARN, '--session-name', 'bench', '--external-id', CACHE_HIT_EXTERNAL_ID,
+        '--start-date', '2024-01-01', '--end-date', '2024-02-01', '--output', 'cost.json', '--cache-path', 'ce_cache.sqlite3'
+    ], 0, HEAVY_MODULES, 150.0),
+    # forecast는 실행에 numpy가 필요하므로 numpy import 시간(약 100ms)을 예산에 포함
+    'forecast-help': (['forecast', '--help'], 0, ('botocore', 'boto3'), 300.0)
+}
+
+def prepare_workdir(path: str) -> None:
+    """캐시 적중 시나리오용 더미 자격 증명 파일과 미리 채운 응답 캐시를 만듭니다."""
+    os.makedirs(os.path.join(path, '.aws'), exist_ok=True)
+    with open(os.path.join(path, '.aws', 'credentials'), 'w', encoding='utf-8') as f:
+        f.write('[cmp-sts-user]\naws_access_key_id = AKIABENCH\naws_secret_access_key = bench\n')
+
+    params = AWSCostExplorer._cost_and_usage_params('2024-01-01', '2024-02-01', 'MONTHLY', ['UnblendedCost'], [{'Type': 'DIMENSION', 'Key': 'SERVICE'}])
+    response = {
+        'GroupDefinitions': [{'Type': 'DIMENSION', 'Key': 'SERVICE'}],
+        'ResultsByTime': [{
+            'TimePeriod': {'Start': '2024-01-01', 'End': '2024-02-01'},
+            'Groups': [{'Keys': [f'service-{i}'], 'Metrics': {'UnblendedCost': {'Amount': str(i * 1.5), 'Unit': 'USD'}}} for i in range(30)],
+            'Estimated': False
+        }],
+        'DimensionValueAttributes': []
+    }
+    cache = CostCache(os.path.join(path, 'ce_cache.sqlite3'))
+    # cost-cache-hit 시나리오와 같은 Role ARN/External ID로 저장해야 적중함
+    cache.put(caller_scope(CACHE_HIT_ROLE_ARN, CACHE_HIT_EXTERNAL_ID), 'GetCostAndUsage', params, response)
+    cache.close()
+
+def imported_modules(args: List[str], cwd: str) -> set:
+    """-X importtime 출력에서 실제로 import된 최상위 패키지 이름을 모읍니다."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI_PATH] + args, cwd=cwd, capture_output=True, text=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return modules
+
+def run_scenario(name: str, cwd: str, runs: int) -> Dict[str, Any]:
+    """시나리오를 runs번 새 프로세스로 실행하여 시작부터 종료까지의 시간을 측정합니다."""
+    args, expected_code, forbidden, _ = SCENARIOS[name]
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, CLI_PATH] + args, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+        if completed.returncode != expected_code:
+            raise RuntimeError(f"{name}: 종료 코드 {completed.returncode} (예상: {expected_code})")
+
+    modules = imported_modules(args, cwd)
+    return {
+        'scenario': name,
+        'median_ms': round(statistics.median(timings) * 1000, 1),
+        'min_ms': round(min(timings) * 1000, 1),
+        'unexpected_imports': sorted(module for module in forbidden if module in modules)
+    }
+
+def baseline_ms(statement: str, runs: int) -> float:
+    """비교 기준으로 인터프리터에서 statement만 실행하는 데 걸리는 시간(ms, 중앙값)을 측정합니다."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', statement], check=True)
+        timings.append(time.perf_counter() - started)
+    return round(statistics.median(timings) * 1000, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description='cli.py 시작 시간 벤치마크 (--help, 인자 오류, 캐시 적중)')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"실행할 시나리오 목록 (쉼표 구분, 기본값: {','.join(SCENARIOS)})")
+    parser.add_argument('--runs', type=int, default=10, help='시나리오별 실행 횟수 (기본값: 10)')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='시나리오별 시작 시간 예산에 곱할 배율 (느린 머신용, 기본값: 1.0)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            prepare_workdir(workdir)
+            results = [run_scenario(name, workdir, args.runs) for name in names]
+
+        baselines = {
+            'python': baseline_ms('pass', args.runs),
+            'import boto3': baseline_ms('import boto3', args.runs)
+        }
+
+        print(f"{'scenario':<16} {'median_ms':>10} {'min_ms':>8} {'budget_ms':>10}  unexpected imports")
+        failed = []
+        for result in results:
+            result['budget_ms'] = SCENARIOS[result['scenario']][3] * args.budget_scale
+            over = result['median_ms'] > result['budget_ms']
+            if over or result['unexpected_imports']:
+                failed.append(result['scenario'])
+            print(f"{result['scenario']:<16} {result['median_ms']:>10} {result['min_ms']:>8} {result['budget_ms']:>10}  {', '.join(result['unexpected_imports']) or '-'}{'  (예산 초과)' if over else ''}")
+        print(f"기준: python 시작 {baselines['python']}ms, import boto3 {baselines['import boto3']}ms")
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({'budget_scale': args.budget_scale, 'baselines': baselines, 'results': results}, f, indent=2, ensure_ascii=False)
+            print(f"결과가 {args.output}에 저장되었습니다.")
+
+        if failed:
+            print(f"시작 시간 예산을 넘었거나 불필요한 모듈을 import한 시나리오: {', '.join(failed)}")
+            exit(1)
+
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+if __name__ == '__main__':
+    main()
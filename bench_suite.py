@@ -0,0 +1,468 @@
+import argparse
+import json
+import multiprocessing
+import random
+import resource
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Any, Callable, Tuple
+from botocore.exceptions import ClientError
+from aws_rate_limiter import AdaptiveRateLimiter, RateLimitedClient
+from aws_org_reader import AWSOrgReader
+from aws_budget import AWSBudgetReader
+from aws_cost_explorer import AWSCostExplorer
+
+# 시나리오 이름별 조직 계정 수
+SCENARIOS = {
+    'small': 10,
+    'medium': 500,
+    'large': 5000
+}
+WORKLOADS = ('org', 'budget', 'cost')
+SERVICES = [f"Amazon Service {i:02d}" for i in range(30)]
+
+# 실제 API의 페이지 크기 상한
+PAGE_SIZES = {
+    'list_organizational_units_for_parent': 20,
+    'list_accounts_for_parent': 20,
+    'describe_budgets': 100,
+    'describe_budget_notifications_for_account': 100,
+    'describe_budget_actions_for_account': 100
+}
+
+def _page(items: List[Any], token: str, size: int, result_key: str) -> Dict[str, Any]:
+    """항목 목록에서 NextToken 위치부터 size개를 잘라 페이지 응답을 만듭니다."""
+    start = int(token or 0)
+    response: Dict[str, Any] = {result_key: items[start:start + size]}
+    if start + size < len(items):
+        response['NextToken'] = str(start + size)
+    return response
+
+class SyntheticBackend:
+    """
+    조직/예산/비용 API 응답을 만들어 내는 합성 백엔드입니다.
+
+    accounts개의 계정을 width 갈래, depth 단계(None이면 계정 수에 따라 1~3) OU 트리의 말단 OU에 고르게 배치하고, 계정마다
+    budgets_per_account개의 예산(예산당 알림 2개, 액션 1개)을 가집니다. 비용은 SERVICES 별 일 단위
+    금액을 page_days일 단위 페이지로 반환합니다.
+    """
+
+    def __init__(self, accounts: int, budgets_per_account: int = 100, width: int = 4, depth: int = None, page_days: int = 7):
+        if depth is None:
+            depth = 1 if accounts <= 50 else 2 if accounts <= 1000 else 3
+        self.budgets_per_account = budgets_per_account
+        self.page_days = page_days
+        self.children: Dict[str, List[Dict[str, Any]]] = {}
+        self.accounts: Dict[str, List[Dict[str, Any]]] = {}
+        self.account_ids: List[str] = []
+
+        frontier = ['r-bench']
+        for _ in range(depth):
+            next_frontier = []
+            for parent_id in frontier:
+                self.children[parent_id] = [{'Id': f"{parent_id}-ou{i}", 'Name': f"{parent_id}-ou{i}"} for i in range(width)]
+                next_frontier.extend(ou['Id'] for ou in self.children[parent_id])
+            frontier = next_frontier
+        leaves = frontier or ['r-bench']
+
+        for index in range(accounts):
+            account_id = f"{index:012d}"
+            self.account_ids.append(account_id)
+            self.accounts.setdefault(leaves[index % len(leaves)], []).append(
+                {'Id': account_id, 'Name': f"account-{index}", 'Email': f"account-{index}@example.com", 'Status': 'ACTIVE'}
+            )
+
+        self.notifications = [
+            {'NotificationType': 'ACTUAL', 'ComparisonOperator': 'GREATER_THAN', 'Threshold': 80.0, 'ThresholdType': 'PERCENTAGE'},
+            {'NotificationType': 'FORECASTED', 'ComparisonOperator': 'GREATER_THAN', 'Threshold': 100.0, 'ThresholdType': 'PERCENTAGE'}
+        ]
+
+    def _budgets(self, account_id: str) -> List[Dict[str, Any]]:
+        return [
+            {
+                'BudgetName': f"{account_id}-budget-{i}",
+                'BudgetType': 'COST',
+                'TimeUnit': 'MONTHLY',
+                'TimePeriod': {'Start': '2024-01-01T00:00:00Z', 'End': '2087-06-15T00:00:00Z'},
+                'BudgetLimit': {'Amount': str(1000 + i), 'Unit': 'USD'},
+                'CalculatedSpend': {'ActualSpend': {'Amount': f"{(i * 37) % 1000}.5", 'Unit': 'USD'}}
+            }
+            for i in range(self.budgets_per_account)
+        ]
+
+    def list_roots(self, **params) -> Dict[str, Any]:
+        return {'Roots': [{'Id': 'r-bench', 'Name': 'Root'}]}
+
+    def list_organizational_units_for_parent(self, ParentId: str, NextToken: str = None, **params) -> Dict[str, Any]:
+        return _page(self.children.get(ParentId, []), NextToken, PAGE_SIZES['list_organizational_units_for_parent'], 'OrganizationalUnits')
+
+    def list_accounts_for_parent(self, ParentId: str, NextToken: str = None, **params) -> Dict[str, Any]:
+        return _page(self.accounts.get(ParentId, []), NextToken, PAGE_SIZES['list_accounts_for_parent'], 'Accounts')
+
+    def describe_budgets(self, AccountId: str, NextToken: str = None, **params) -> Dict[str, Any]:
+        return _page(self._budgets(AccountId), NextToken, PAGE_SIZES['describe_budgets'], 'Budgets')
+
+    def describe_budget_notifications_for_account(self, AccountId: str, NextToken: str = None, **params) -> Dict[str, Any]:
+        entries = [{'BudgetName': budget['BudgetName'], 'Notifications': self.notifications} for budget in self._budgets(AccountId)]
+        return _page(entries, NextToken, PAGE_SIZES['describe_budget_notifications_for_account'], 'BudgetNotificationsForAccount')
+
+    def describe_budget_actions_for_account(self, AccountId: str, NextToken: str = None, **params) -> Dict[str, Any]:
+        actions = [
+            {'ActionId': f"{budget['BudgetName']}-action", 'BudgetName': budget['BudgetName'], 'ActionType': 'APPLY_IAM_POLICY',
+             'ActionThreshold': {'ActionThresholdValue': 100.0, 'ActionThresholdType': 'PERCENTAGE'},
+             'NotificationType': 'ACTUAL', 'ApprovalModel': 'MANUAL', 'Status': 'STANDBY'}
+            for budget in self._budgets(AccountId)
+        ]
+        return _page(actions, NextToken, PAGE_SIZES['describe_budget_actions_for_account'], 'Actions')
+
+    def describe_subscribers_for_notification(self, **params) -> Dict[str, Any]:
+        return {'Subscribers': [{'SubscriptionType': 'EMAIL', 'Address': 'finops@example.com'}]}
+
+    def get_cost_and_usage(self, TimePeriod: Dict[str, str], Granularity: str, Metrics: List[str], GroupBy: List[Dict[str, str]] = None, NextPageToken: str = None, **params) -> Dict[str, Any]:
+        start = date.fromisoformat(TimePeriod['Start'][:10])
+        end = date.fromisoformat(TimePeriod['End'][:10])
+        if Granularity == 'MONTHLY':
+            periods = []
+            current = start
+            while current < end:
+                next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+                periods.append((current, min(next_month, end)))
+                current = next_month
+        else:
+            periods = [(start + timedelta(days=i), start + timedelta(days=i + 1)) for i in range((end - start).days)]
+
+        offset = int(NextPageToken or 0)
+        page = periods[offset:offset + self.page_days]
+        results = []
+        for period_start, period_end in page:
+            day = period_start.toordinal()
+            result: Dict[str, Any] = {
+                'TimePeriod': {'Start': period_start.isoformat(), 'End': period_end.isoformat()},
+                'Total': {},
+                'Estimated': False
+            }
+            if GroupBy:
+                result['Groups'] = [
+                    {'Keys': [service], 'Metrics': {metric: {'Amount': f"{(day * 31 + index * 7) % 997 / 10:.4f}", 'Unit': 'USD'} for metric in Metrics}}
+                    for index, service in enumerate(SERVICES)
+                ]
+            else:
+                result['Total'] = {metric: {'Amount': f"{day % 997:.4f}", 'Unit': 'USD'} for metric in Metrics}
+            results.append(result)
+
+        response: Dict[str, Any] = {
+            'GroupDefinitions': [{'Type': group['Type'], 'Key': group['Key']} for group in (GroupBy or [])],
+            'ResultsByTime': results,
+            'DimensionValueAttributes': []
+        }
+        if offset + self.page_days < len(periods):
+            response['NextPageToken'] = str(offset + self.page_days)
+        return response
+
+def _request_key(operation: str, params: Dict[str, Any]) -> str:
+    return operation + ' ' + json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+class RecordedBackend:
+    """
+    RecordingClient로 저장한 응답 파일(NDJSON)을 재생하는 백엔드입니다.
+
+    (작업, 파라미터)가 같은 요청에 저장된 응답을 반환하며, 기록되지 않은 요청은 KeyError를 발생시킵니다.
+    """
+
+    def __init__(self, path: str):
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                self.responses[_request_key(record['operation'], record['params'])] = record['response']
+                self.requests.append((record['operation'], record['params']))
+
+    def respond(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        key = _request_key(operation, params)
+        if key not in self.responses:
+            raise KeyError(f"기록되지 않은 요청입니다: {key}")
+        return self.responses[key]
+
+class RecordingClient:
+    """
+    boto3 클라이언트 호출의 파라미터와 응답을 NDJSON 파일에 기록하는 프록시입니다.
+
+    실제 자격 증명으로 한 번 실행하여 기록한 파일을 --replay로 오프라인 재생할 수 있습니다.
+    (예: reader.client = RecordingClient(reader.client, 'recorded.ndjson'))
+    """
+
+    def __init__(self, client, path: str):
+        from aws_output import dumps
+
+        self._client = client
+        self._dumps = dumps
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr) or name.startswith('_') or name in ('close', 'get_paginator', 'get_waiter', 'can_paginate'):
+            return attr
+
+        def _record(**params):
+            response = attr(**params)
+            line = self._dumps({'operation': name, 'params': params, 'response': {k: v for k, v in response.items() if k != 'ResponseMetadata'}})
+            with self._lock:
+                self._file.write(line + '\n')
+                self._file.flush()
+            return response
+
+        return _record
+
+class ReplayClient:
+    """
+    백엔드 응답을 돌려주는 boto3 클라이언트 대역입니다.
+
+    호출마다 latency초(± jitter 비율) 지연을 주고, throttle_rate 확률로 ThrottlingException을
+    발생시킵니다. RateLimitedClient로 감싸 실제 속도 제한/재시도 경로를 거치게 합니다.
+    """
+
+    def __init__(self, backend, operations: List[str], latency: float = 0.0, jitter: float = 0.0, throttle_rate: float = 0.0, seed: int = 0):
+        self.backend = backend
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.calls = 0
+        self.throttled = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.meta = type('Meta', (), {'method_to_api_mapping': {operation: operation for operation in operations}})()
+
+    def _invoke(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * self._random.uniform(1 - self.jitter, 1 + self.jitter) if self.latency else 0.0
+            throttled = self._random.random() < self.throttle_rate
+            if throttled:
+                self.throttled += 1
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            raise ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, operation)
+        if isinstance(self.backend, RecordedBackend):
+            return self.backend.respond(operation, params)
+        return getattr(self.backend, operation)(**params)
+
+    def __getattr__(self, name: str) -> Callable[..., Dict[str, Any]]:
+        if name not in self.meta.method_to_api_mapping:
+            raise AttributeError(name)
+
+        def _operation(**params):
+            return self._invoke(name, params)
+
+        _operation.__name__ = name
+        return _operation
+
+class BenchSessionManager:
+    """서비스와 관계없이 같은 (속도 제한이 적용된) 재생 클라이언트를 반환하는 세션 매니저 대역입니다."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_client(self, service_name: str, **kwargs):
+        return self.client
+
+OPERATIONS = {
+    'org': ['list_roots', 'list_organizational_units_for_parent', 'list_accounts_for_parent'],
+    'budget': ['describe_budgets', 'describe_budget_notifications_for_account', 'describe_budget_actions_for_account', 'describe_subscribers_for_notification'],
+    'cost': ['get_cost_and_usage']
+}
+
+def _reader_kwargs(client) -> Dict[str, Any]:
+    return {
+        'role_arn': 'arn:aws:iam::000000000000:role/bench',
+        'session_name': 'bench',
+        'external_id': 'bench',
+        'session_manager': BenchSessionManager(client)
+    }
+
+def _cost_window(months: int) -> Tuple[str, str]:
+    end = date(2025, 1, 1)
+    start = end
+    for _ in range(months):
+        start = (start - timedelta(days=1)).replace(day=1)
+    return start.isoformat(), end.isoformat()
+
+def run_workload(workload: str, backend, options: Dict[str, Any]) -> Dict[str, Any]:
+    """워크로드 하나를 실행하고 경과 시간과 API 호출 수를 반환합니다."""
+    replay = ReplayClient(
+        backend,
+        OPERATIONS[workload],
+        latency=options['latency'],
+        jitter=options['jitter'],
+        throttle_rate=options['throttle_rate'],
+        seed=options['seed']
+    )
+    client = RateLimitedClient(replay, AdaptiveRateLimiter(workload, options['rate'], max_retries=10, base_delay=0.01, max_delay=0.2))
+    max_workers = options['max_workers']
+
+    started = time.perf_counter()
+    if workload == 'org':
+        structure = AWSOrgReader(**_reader_kwargs(client)).get_org_structure(max_workers=max_workers)
+        items = sum(len(accounts) for accounts in structure['accounts'].values())
+    elif workload == 'budget':
+        reader = AWSBudgetReader(**_reader_kwargs(client))
+        if isinstance(backend, RecordedBackend):
+            account_ids = sorted({params['AccountId'] for operation, params in backend.requests if operation == 'describe_budgets'})
+        else:
+            account_ids = backend.account_ids[:options['budget_accounts']]
+        items = sum(len(reader.get_all_budget_details(account_id, max_workers=max_workers)) for account_id in account_ids)
+    else:
+        explorer = AWSCostExplorer(**_reader_kwargs(client))
+        if isinstance(backend, RecordedBackend):
+            recorded = [params for operation, params in backend.requests if operation == 'get_cost_and_usage' and 'NextPageToken' not in params]
+            start_date = min(params['TimePeriod']['Start'] for params in recorded)
+            end_date = max(params['TimePeriod']['End'] for params in recorded)
+            granularity, group_by = recorded[0]['Granularity'], recorded[0].get('GroupBy')
+        else:
+            start_date, end_date = _cost_window(options['cost_months'])
+            granularity, group_by = 'DAILY', [{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+        response = explorer.get_cost_and_usage(start_date, end_date, granularity=granularity, group_by=group_by, max_workers=max_workers)
+        items = len(response['ResultsByTime'])
+    elapsed = time.perf_counter() - started
+
+    return {
+        'elapsed_seconds': round(elapsed, 4),
+        'api_calls': replay.calls,
+        'throttled': replay.throttled,
+        'items': items
+    }
+
+def _max_rss_mb() -> float:
+    # Linux의 ru_maxrss 단위는 KB (macOS는 바이트)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 2)
+
+def _run_case(workload: str, scenario: str, options: Dict[str, Any], queue) -> None:
+    """별도 프로세스에서 시나리오를 만들고 워크로드를 실행하여 최대 RSS를 격리합니다."""
+    try:
+        if options.get('replay'):
+            backend = RecordedBackend(options['replay'])
+        else:
+            backend = SyntheticBackend(SCENARIOS[scenario], budgets_per_account=options['budgets_per_account'])
+        fixture_rss = _max_rss_mb()
+        result = run_workload(workload, backend, options)
+        result['fixture_rss_mb'] = fixture_rss
+        result['peak_rss_mb'] = _max_rss_mb()
+        queue.put(result)
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {str(e)}"})
+
+def run_case(workload: str, scenario: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    context = multiprocessing.get_context('fork' if sys.platform != 'win32' else 'spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_case, args=(workload, scenario, options, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+# 짧은 워크로드의 측정 잡음을 회귀로 보지 않기 위한 최소 증가량
+MIN_REGRESSION = {
+    'elapsed_seconds': 0.05,
+    'peak_rss_mb': 5.0
+}
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """
+    기준 결과와 비교하여 나빠진 항목 목록을 반환합니다.
+
+    경과 시간/최대 RSS는 threshold 비율과 MIN_REGRESSION 이상 늘어난 경우, API 호출 수는 1건이라도 늘어난 경우 회귀로 판단합니다.
+    """
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if not base or 'error' in result or 'error' in base:
+            continue
+        for key in ('elapsed_seconds', 'peak_rss_mb'):
+            increase = result[key] - base[key]
+            if base[key] and increase / base[key] > threshold and increase > MIN_REGRESSION[key]:
+                regressions.append(f"{case} {key}: {base[key]} -> {result[key]}")
+        if result['api_calls'] > base['api_calls']:
+            regressions.append(f"{case} api_calls: {base['api_calls']} -> {result['api_calls']}")
+    return regressions
+
+def _delta(value: float, base: float) -> str:
+    if not base:
+        return ''
+    return f"{(value - base) / base * 100:+.0f}%"
+
+def main():
+    parser = argparse.ArgumentParser(description='합성/기록된 API 응답을 재생하는 오프라인 벤치마크 모음')
+    parser.add_argument('--scenarios', default='small,medium', help=f"실행할 시나리오 목록 (쉼표 구분, {', '.join(f'{name}={count}계정' for name, count in SCENARIOS.items())})")
+    parser.add_argument('--workloads', default=','.join(WORKLOADS), help='실행할 워크로드 목록 (org: 조직 구조, budget: 예산 상세, cost: 비용 조회)')
+    parser.add_argument('--replay', help='합성 응답 대신 재생할 기록 파일 (RecordingClient로 저장한 NDJSON)')
+    parser.add_argument('--latency', type=float, default=0.005, help='API 호출당 지연 시간(초) (기본값: 0.005)')
+    parser.add_argument('--jitter', type=float, default=0.5, help='지연 시간 변동 비율 (기본값: 0.5 = ±50%%)')
+    parser.add_argument('--throttle-rate', type=float, default=0.01, help='ThrottlingException을 발생시킬 확률 (기본값: 0.01)')
+    parser.add_argument('--rate', type=float, default=2000.0, help='속도 제한기의 초당 요청 수 (기본값: 2000)')
+    parser.add_argument('--max-workers', type=int, default=16, help='리더의 동시 API 호출 수 (기본값: 16)')
+    parser.add_argument('--budget-accounts', type=int, default=20, help='예산 워크로드에서 조회할 계정 수 (기본값: 20)')
+    parser.add_argument('--budgets-per-account', type=int, default=100, help='계정당 예산 수 (기본값: 100)')
+    parser.add_argument('--cost-months', type=int, default=13, help='비용 워크로드의 조회 기간(월) (기본값: 13, SERVICE별 DAILY)')
+    parser.add_argument('--seed', type=int, default=0, help='지터/스로틀링 난수 시드')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일 경로')
+    parser.add_argument('--threshold', type=float, default=0.2, help='회귀로 판단할 경과 시간/RSS 증가 비율 (기본값: 0.2)')
+
+    args = parser.parse_args()
+
+    options = {
+        'replay': args.replay,
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'throttle_rate': args.throttle_rate,
+        'rate': args.rate,
+        'max_workers': args.max_workers,
+        'budget_accounts': args.budget_accounts,
+        'budgets_per_account': args.budgets_per_account,
+        'cost_months': args.cost_months,
+        'seed': args.seed
+    }
+    scenarios = ['replay'] if args.replay else args.scenarios.split(',')
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'case':<16} {'elapsed(s)':>11} {'Δ':>6} {'calls':>7} {'Δ':>6} {'throttled':>9} {'items':>8} {'peak RSS(MB)':>13} {'Δ':>6}")
+    for scenario in scenarios:
+        for workload in args.workloads.split(','):
+            case = f"{workload}/{scenario}"
+            result = run_case(workload, scenario, options)
+            results[case] = result
+            if 'error' in result:
+                print(f"{case:<16} 오류: {result['error']}")
+                continue
+            base = baseline.get(case, {})
+            print(
+                f"{case:<16} {result['elapsed_seconds']:>11.3f} {_delta(result['elapsed_seconds'], base.get('elapsed_seconds')):>6} "
+                f"{result['api_calls']:>7} {_delta(result['api_calls'], base.get('api_calls')):>6} {result['throttled']:>9} "
+                f"{result['items']:>8} {result['peak_rss_mb']:>13.1f} {_delta(result['peak_rss_mb'], base.get('peak_rss_mb')):>6}"
+            )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'options': options, 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f"결과가 {args.output}에 저장되었습니다.")
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n=== 기준 대비 회귀 ===")
+            for regression in regressions:
+                print(f"- {regression}")
+            exit(1)
+        print("\n기준 대비 회귀가 없습니다.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import importlib
+import sys
+from typing import List
+
+# 하위 명령 -> (인자 정의와 실행 함수가 있는 모듈, 도움말)
+# 모듈은 선택한 하위 명령만 import하므로 --help와 인자 오류는 boto3/numpy를 import하지 않음
+COMMANDS = {
+    'org': ('main', 'AWS Organization 구조 조회'),
+    'budget': ('test_budget', 'AWS Budgets 예산/알림/액션 조회'),
+    'cost': ('aws_cost_explorer', 'AWS Cost Explorer 비용/예측 조회'),
+    'forecast': ('aws_forecast', '계정 x 서비스별 비용 예측 (로컬 모델 / Cost Explorer)'),
+    'plan': ('aws_cost_planner', '겹치는 비용 조회 요청을 합쳐 최소 호출로 조회'),
+    'snapshots': ('aws_snapshot_store', '변경분으로 저장한 조직/예산 스냅샷 조회')
+}
+
+def build_parser(command: str = None) -> argparse.ArgumentParser:
+    """
+    하위 명령 파서를 만듭니다. 인자 정의는 command에 해당하는 모듈만 import하여 추가합니다.
+
+    Args:
+        command (str): 인자를 추가할 하위 명령 (None이면 하위 명령 목록만 등록)
+    """
+    parser = argparse.ArgumentParser(description='AWS Organization/Budgets/Cost Explorer 데이터를 조회하는 통합 명령')
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    subparsers.required = True
+
+    for name, (module_name, help_text) in COMMANDS.items():
+        if name == command:
+            module = importlib.import_module(module_name)
+            subparser = subparsers.add_parser(name, help=help_text, description=module.DESCRIPTION)
+            module.add_arguments(subparser)
+            subparser.set_defaults(run=module.run, command_parser=subparser)
+        else:
+            subparsers.add_parser(name, help=help_text)
+    return parser
+
+def main(argv: List[str] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    # 최상위 파서에는 -h 외의 옵션이 없으므로 첫 번째 위치 인자가 하위 명령
+    command = next((arg for arg in argv if not arg.startswith('-')), None)
+    parser = build_parser(command if command in COMMANDS else None)
+    args = parser.parse_args(argv)
+    args.run(args.command_parser, args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,376 @@
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import random
+import signal
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from aws_session import AWSSessionManager
+from aws_org_reader import AWSOrgReader
+from aws_budget import AWSBudgetReader
+from aws_cost_explorer import AWSCostExplorer, parse_group_by
+from aws_cost_cache import CostCache, DEFAULT_CACHE_PATH
+from aws_output import json_default
+from aws_metrics import get_registry
+
+JOBS = ('org', 'budget', 'cost')
+
+class ResultStore:
+    """
+    작업별 최신 결과를 직렬화된 JSON 바이트로 보관합니다.
+
+    결과는 수집이 끝날 때 한 번만 직렬화하여 통째로 교체하므로, 요청을 처리할 때는 잠금 안에서
+    참조만 읽고 그대로 응답합니다. 수집이 실패하면 이전 결과를 유지하고 오류만 기록합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, Tuple[bytes, str]] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+
+    def put(self, job: str, result: Any, duration: float) -> None:
+        body = json.dumps(result, ensure_ascii=False, separators=(',', ':'), default=json_default).encode('utf-8')
+        # ETag는 본문 해시로 만들어 데몬을 다시 시작해도 내용이 다르면 값이 달라지도록 함
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        updated_at = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            runs = self._status.get(job, {}).get('runs', 0) + 1
+            self._bodies[job] = (body, etag)
+            self._status[job] = {
+                'updated_at': updated_at,
+                'duration_seconds': round(duration, 3),
+                'bytes': len(body),
+                'runs': runs,
+                'error': None
+            }
+
+    def put_error(self, job: str, error: Exception) -> None:
+        with self._lock:
+            status = self._status.setdefault(job, {'updated_at': None, 'duration_seconds': None, 'bytes': 0, 'runs': 0})
+            status['error'] = str(error)
+            status['failed_at'] = datetime.now(timezone.utc).isoformat()
+
+    def get(self, job: str) -> Optional[Tuple[bytes, str]]:
+        """(JSON 바이트, ETag)를 반환합니다. 아직 수집하지 않았으면 None"""
+        with self._lock:
+            return self._bodies.get(job)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {job: dict(status) for job, status in self._status.items()}
+
+class CollectorDaemon:
+    """
+    세션/클라이언트를 유지한 채 조직/예산/비용 수집을 주기적으로 실행하는 데몬입니다.
+
+    리더는 시작할 때 한 번만 생성하므로 이후 수집에서는 boto3 import, 자격 증명 파일 파싱,
+    AssumeRole, 클라이언트 생성 비용이 들지 않습니다. (자격 증명은 만료 전에 자동 갱신)
+    같은 작업은 겹쳐 실행하지 않으며, 실행 간격에 jitter 비율만큼 무작위 변동을 줍니다.
+    """
+
+    def __init__(
+        self,
+        role_arn: str,
+        session_name: str,
+        external_id: str,
+        region: str = 'ap-northeast-2',
+        profile_name: str = 'cmp-sts-user',
+        intervals: Dict[str, float] = None,
+        jitter: float = 0.1,
+        account_id: str = None,
+        cost_days: int = 30,
+        cost_granularity: str = 'DAILY',
+        group_by: List[Dict[str, str]] = None,
+        max_workers: int = 8,
+        cache: CostCache = None,
+        session_manager: AWSSessionManager = None
+    ):
+        """
+        Args:
+            intervals (Dict[str, float]): 작업별 실행 간격(초), 0 또는 누락이면 실행하지 않음 (예: {'org': 3600, 'cost': 900})
+            jitter (float): 실행 간격 변동 비율 (0.1이면 ±10%)
+            account_id (str): 예산을 조회할 계정 ID (기본값: Role ARN의 계정 ID)
+            cost_days (int): 비용 조회 기간(오늘 기준 최근 일수)
+            cost_granularity (str): 비용 데이터 세분화 단위
+            group_by (List[Dict[str, str]]): 비용 그룹화 기준 (기본값: SERVICE)
+            max_workers (int): 수집 작업 안에서 동시에 실행할 API 호출 수
+            cache (CostCache): Cost Explorer 응답 캐시 (확정되지 않은 기간의 TTL이 cost 간격보다 길면
+                이전 수집 결과를 새로 수집한 것처럼 제공하므로 ttl_seconds=0 권장, main은 0 사용)
+            session_manager (AWSSessionManager): 공유할 세션 매니저 (기본값: 새로 생성)
+        """
+        self.intervals = {job: interval for job, interval in (intervals or {}).items() if interval and job in JOBS}
+        self.jitter = jitter
+        self.account_id = account_id or role_arn.split(':')[4]
+        self.cost_days = cost_days
+        self.cost_granularity = cost_granularity
+        self.group_by = group_by or [{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+        self.max_workers = max_workers
+        self.store = ResultStore()
+
+        # 리더(와 클라이언트)를 미리 만들어 두고 모든 수집에서 재사용
+        session_manager = session_manager or AWSSessionManager(region=region, profile_name=profile_name)
+        reader_args = {
+            'role_arn': role_arn,
+            'session_name': session_name,
+            'external_id': external_id,
+            'region': region,
+            'profile_name': profile_name,
+            'session_manager': session_manager
+        }
+        self.session_manager = session_manager
+        self._collectors: Dict[str, Callable[[], Any]] = {}
+        if 'org' in self.intervals:
+            org_reader = AWSOrgReader(**reader_args)
+            # 목록 조회 오류를 빈 목록으로 바꾸면 계정이 빠진 조직 구조가 이전 결과를 덮어쓰므로 오류를 전파
+            self._collectors['org'] = lambda: org_reader.get_org_structure(max_workers=self.max_workers, strict=True)
+        if 'budget' in self.intervals:
+            budget_reader = AWSBudgetReader(**reader_args)
+            self._collectors['budget'] = lambda: budget_reader.get_all_budget_details(self.account_id, max_workers=self.max_workers)
+        if 'cost' in self.intervals:
+            explorer = AWSCostExplorer(cache=cache, **reader_args)
+            self._collectors['cost'] = lambda: self._collect_cost(explorer)
+
+        self._stop = threading.Event()
+        self._wakeup = threading.Condition()
+        # (실행 시각, 순번, 작업, 반복 여부) 힙
+        self._schedule: List[Tuple[float, int, str, bool]] = []
+        self._sequence = 0
+        self._running: set = set()
+        self._scheduler: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self._collectors)), thread_name_prefix='collector')
+
+    def _collect_cost(self, explorer: AWSCostExplorer) -> Dict[str, Any]:
+        end = date.today()
+        start = end - timedelta(days=self.cost_days)
+        return explorer.get_cost_and_usage(
+            start_date=start.isoformat(),
+            end_date=end.isoformat(),
+            granularity=self.cost_granularity,
+            group_by=self.group_by,
+            max_workers=self.max_workers
+        )
+
+    def _next_delay(self, job: str) -> float:
+        interval = self.intervals[job]
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def run_job(self, job: str) -> None:
+        """작업을 한 번 실행하고 결과를 저장합니다. (이미 실행 중이면 건너뜀)"""
+        with self._wakeup:
+            if job in self._running:
+                return
+            self._running.add(job)
+        try:
+            started = time.perf_counter()
+            with get_registry().timed(f'collector.{job}'):
+                result = self._collectors[job]()
+            self.store.put(job, result, time.perf_counter() - started)
+        except Exception as e:
+            print(f"{job} 수집 중 오류 발생: {str(e)}")
+            self.store.put_error(job, e)
+        finally:
+            with self._wakeup:
+                self._running.discard(job)
+
+    def trigger(self, job: str) -> bool:
+        """작업을 즉시 실행하도록 예약합니다. 알 수 없는 작업이면 False"""
+        if job not in self._collectors:
+            return False
+        with self._wakeup:
+            self._push(time.monotonic(), job, recurring=False)
+            self._wakeup.notify()
+        return True
+
+    def _push(self, due: float, job: str, recurring: bool) -> None:
+        self._sequence += 1
+        heapq.heappush(self._schedule, (due, self._sequence, job, recurring))
+
+    def run_scheduler(self) -> None:
+        """stop()이 호출될 때까지 예약된 작업을 실행합니다. (모든 작업은 시작 즉시 한 번 실행)"""
+        now = time.monotonic()
+        with self._wakeup:
+            for job in self._collectors:
+                self._push(now, job, recurring=True)
+
+        while True:
+            with self._wakeup:
+                # 종료 확인과 작업 제출을 같은 잠금 안에서 하여 stop() 이후에 제출하지 않음
+                if self._stop.is_set():
+                    return
+                if not self._schedule:
+                    self._wakeup.wait()
+                    continue
+                delay = self._schedule[0][0] - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                _, _, job, recurring = heapq.heappop(self._schedule)
+                # 수동 실행(trigger)은 다음 실행을 예약하지 않음
+                if recurring:
+                    self._push(time.monotonic() + self._next_delay(job), job, recurring=True)
+                self._executor.submit(self.run_job, job)
+
+    def start(self) -> threading.Thread:
+        """스케줄러를 백그라운드 스레드에서 시작합니다."""
+        self._scheduler = threading.Thread(target=self.run_scheduler, name='collector-scheduler', daemon=True)
+        self._scheduler.start()
+        return self._scheduler
+
+    def stop(self) -> None:
+        """스케줄러를 멈추고(종료를 기다린 뒤) 실행 중인 수집은 기다리지 않고 작업 풀을 닫습니다."""
+        with self._wakeup:
+            self._stop.set()
+            self._wakeup.notify_all()
+        if self._scheduler is not None and self._scheduler is not threading.current_thread():
+            self._scheduler.join()
+        self._executor.shutdown(wait=False)
+
+class CollectorRequestHandler(BaseHTTPRequestHandler):
+    """
+    수집 결과를 제공하는 HTTP 핸들러입니다.
+
+    - GET /org, /budget, /cost: 최신 결과 (If-None-Match가 같으면 304)
+    - GET /status: 작업별 마지막 수집 시각, 소요 시간, 오류
+    - GET /metrics: Prometheus 텍스트 형식 통계
+    - POST /refresh/<job>: 작업 즉시 실행
+    """
+
+    daemon: CollectorDaemon = None
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json', etag: str = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Any) -> None:
+        self._send(status, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def do_GET(self) -> None:
+        path = self.path.split('?', 1)[0].strip('/')
+        if path in JOBS:
+            cached = self.daemon.store.get(path)
+            if cached is None:
+                self._send_json(503, {'error': f"{path} 결과가 아직 수집되지 않았습니다."})
+                return
+            body, etag = cached
+            if self.headers.get('If-None-Match') == etag:
+                self._send(304, b'', etag=etag)
+                return
+            self._send(200, body, etag=etag)
+        elif path == 'status':
+            self._send_json(200, {'jobs': self.daemon.store.status(), 'rate_limits': self.daemon.session_manager.rate_limit_stats()})
+        elif path == 'metrics':
+            self._send(200, get_registry().to_prometheus().encode('utf-8'), content_type='text/plain; version=0.0.4')
+        else:
+            self._send_json(404, {'error': f"알 수 없는 경로입니다: /{path}"})
+
+    do_HEAD = do_GET
+
+    def do_POST(self) -> None:
+        parts = self.path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'refresh' and self.daemon.trigger(parts[1]):
+            self._send_json(202, {'job': parts[1], 'status': 'scheduled'})
+        else:
+            self._send_json(404, {'error': f"알 수 없는 경로입니다: {self.path}"})
+
+    def log_message(self, format: str, *args) -> None:
+        # 요청마다 stderr에 기록하지 않음
+        pass
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler가 client_address[0]을 참조하므로 빈 주소 대신 형식을 맞춤
+        return request, ('unix', 0)
+
+def make_server(daemon: CollectorDaemon, host: str = '127.0.0.1', port: int = 8080, unix_socket: str = None):
+    """데몬 결과를 제공하는 HTTP 서버를 만듭니다. unix_socket을 지정하면 TCP 대신 Unix 소켓을 사용합니다."""
+    # 헤더와 본문을 따로 쓰므로 TCP에서는 Nagle 알고리즘을 꺼서 keep-alive 요청의 지연(delayed ACK)을 막음
+    handler = type('BoundCollectorRequestHandler', (CollectorRequestHandler,), {'daemon': daemon, 'disable_nagle_algorithm': not unix_socket})
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        return ThreadingUnixHTTPServer(unix_socket, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description='조직/예산/비용 수집을 주기적으로 실행하고 결과를 로컬 HTTP API로 제공하는 데몬')
+    parser.add_argument('--role-arn', required=True, help='AWS Role ARN')
+    parser.add_argument('--session-name', required=True, help='Session Name for STS')
+    parser.add_argument('--external-id', required=True, help='External ID for STS')
+    parser.add_argument('--region', default='ap-northeast-2', help='AWS Region (기본값: ap-northeast-2)')
+    parser.add_argument('--profile', default='cmp-sts-user', help='AWS Credentials 프로필 이름 (기본값: cmp-sts-user)')
+    parser.add_argument('--org-interval', type=float, default=3600, help='조직 구조 수집 간격(초), 0이면 수집하지 않음 (기본값: 3600)')
+    parser.add_argument('--budget-interval', type=float, default=900, help='예산 수집 간격(초), 0이면 수집하지 않음 (기본값: 900)')
+    parser.add_argument('--cost-interval', type=float, default=900, help='비용 수집 간격(초), 0이면 수집하지 않음 (기본값: 900)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='수집 간격 변동 비율 (기본값: 0.1 = ±10%%)')
+    parser.add_argument('--account-id', help='예산을 조회할 계정 ID (기본값: Role ARN의 계정 ID)')
+    parser.add_argument('--cost-days', type=int, default=30, help='비용 조회 기간(최근 일수) (기본값: 30)')
+    parser.add_argument('--granularity', default='DAILY', choices=['DAILY', 'MONTHLY'], help='비용 데이터 세분화 단위 (기본값: DAILY)')
+    parser.add_argument('--group-by', action='append', help='비용 그룹화 기준, 최대 2개까지 반복 지정 (기본값: SERVICE)')
+    parser.add_argument('--max-workers', type=int, default=8, help='수집 작업 안에서 동시에 실행할 API 호출 수 (기본값: 8)')
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH, help=f'Cost Explorer 응답 캐시 파일 경로 (기본값: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--no-cache', action='store_true', help='Cost Explorer 응답 캐시를 사용하지 않음')
+    parser.add_argument('--host', default='127.0.0.1', help='HTTP 서버 주소 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='HTTP 서버 포트 (기본값: 8080)')
+    parser.add_argument('--unix-socket', help='TCP 대신 사용할 Unix 소켓 경로')
+
+    args = parser.parse_args()
+
+    try:
+        daemon = CollectorDaemon(
+            role_arn=args.role_arn,
+            session_name=args.session_name,
+            external_id=args.external_id,
+            region=args.region,
+            profile_name=args.profile,
+            intervals={'org': args.org_interval, 'budget': args.budget_interval, 'cost': args.cost_interval},
+            jitter=args.jitter,
+            account_id=args.account_id,
+            cost_days=args.cost_days,
+            cost_granularity=args.granularity,
+            group_by=[parse_group_by(value) for value in (args.group_by or ['SERVICE'])],
+            max_workers=args.max_workers,
+            # 확정되지 않은 기간(이번 달 등)은 캐시하지 않아 수집할 때마다 최신 값을 조회하고, 확정된 과거 달만 캐시에서 읽음
+            cache=None if args.no_cache else CostCache(args.cache_path, ttl_seconds=0)
+        )
+        server = make_server(daemon, args.host, args.port, args.unix_socket)
+    except Exception as e:
+        print(f"오류 발생: {str(e)}")
+        exit(1)
+
+    daemon.start()
+
+    def shutdown(signum, frame):
+        daemon.stop()
+        # serve_forever를 실행 중인 스레드가 아닌 곳에서 종료해야 하므로 별도 스레드 사용
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"수집 데몬이 {args.unix_socket or f'http://{args.host}:{args.port}'}에서 실행 중입니다.")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+
+if __name__ == '__main__':
+    main()
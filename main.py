@@ -1,17 +1,35 @@
 import argparse
 import json
+import sys
 from aws_org_reader import AWSOrgReader, DateTimeEncoder
+from aws_output import NDJSONWriter, COMPRESSIONS
+from aws_metrics import get_registry
 
-def main():
-    parser = argparse.ArgumentParser(description='AWS Organization 구조를 가져오는 스크립트')
+DESCRIPTION = 'AWS Organization 구조를 가져오는 스크립트'
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """명령행 인자를 parser에 추가합니다. (cli.py의 하위 명령과 공유)"""
     parser.add_argument('--role-arn', required=True, help='AWS Role ARN')
     parser.add_argument('--session-name', required=True, help='Session Name for STS')
     parser.add_argument('--external-id', required=True, help='External ID for STS')
     parser.add_argument('--region', default='ap-northeast-2', help='AWS Region (기본값: ap-northeast-2)')
     parser.add_argument('--profile', default='cmp-sts-user', help='AWS Credentials 프로필 이름 (기본값: cmp-sts-user)')
     parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로 (지정하지 않으면 stdout으로 출력)')
-    
-    args = parser.parse_args()
+    parser.add_argument('--format', default='json', choices=['json', 'ndjson'], help='출력 형식 (ndjson은 루트/OU/계정을 조회되는 즉시 한 줄씩 출력)')
+    parser.add_argument('--compress', default='none', choices=COMPRESSIONS, help='ndjson 출력 압축 형식 (기본값: none)')
+    parser.add_argument('--max-workers', type=int, default=8, help='조직 구조 조회 시 동시 API 호출 수 (기본값: 8)')
+    parser.add_argument('--compact', action='store_true', help='조회 결과를 응답 dict 대신 __slots__ 레코드로 보관하여 메모리 사용량을 줄임 (출력 형식은 같음)')
+    parser.add_argument('--fields', help='계정 항목에 남길 키 목록 (쉼표 구분, 예: Id,Name,Status, 지정하면 --compact 사용)')
+    parser.add_argument('--snapshot-store', help='조회 결과를 변경분 스냅샷 저장소(SQLite)에 기록하고, 전체 문서 대신 이전 스냅샷 대비 변경분만 출력')
+    parser.add_argument('--snapshot-stream', help='스냅샷 스트림 이름 (기본값: org/<Role ARN의 계정 ID>)')
+    parser.add_argument('--stats', action='store_true', help='종료 시 API 작업별 호출 수/지연 시간/수신 바이트 통계를 stderr로 출력')
+    parser.add_argument('--metrics-file', help='작업별 통계를 Prometheus 텍스트 형식으로 저장할 파일 경로')
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    metrics = get_registry()
+
+    if args.snapshot_store and args.format != 'json':
+        parser.error('--snapshot-store는 json 형식에서만 사용할 수 있습니다.')
 
     try:
         reader = AWSOrgReader(
@@ -22,18 +40,59 @@ def main():
             profile_name=args.profile
         )
         
-        org_structure = reader.get_org_structure()
+        if args.format == 'ndjson':
+            with NDJSONWriter(args.output, compression=args.compress) as writer:
+                for record_type, parent_id, item in reader.iter_org_structure(max_workers=args.max_workers):
+                    writer.write(record_type, item, parent_id=parent_id)
+            if args.output:
+                print(f"{writer.count}개의 레코드가 {args.output}에 저장되었습니다.")
+            return
+
+        with metrics.timed('org.get_org_structure'):
+            org_structure = reader.get_org_structure(
+                max_workers=args.max_workers,
+                compact=args.compact,
+                account_fields=[field.strip() for field in args.fields.split(',')] if args.fields else None,
+                # 스냅샷 저장소에 기록할 때는 목록 조회 오류를 빈 목록(삭제)으로 기록하지 않도록 오류를 전파
+                strict=bool(args.snapshot_store)
+            )
         
+        document = org_structure
+        if args.snapshot_store:
+            from aws_snapshot_store import SnapshotStore, org_entries, print_commit_summary
+
+            store = SnapshotStore(args.snapshot_store)
+            try:
+                with metrics.timed('snapshot.commit'):
+                    document = store.commit(args.snapshot_stream or f"org/{args.role_arn.split(':')[4]}", org_entries(org_structure))
+            finally:
+                store.close()
+            # stdout으로 JSON을 출력할 때는 파이프(예: jq)가 깨지지 않도록 요약을 stderr로 출력
+            print_commit_summary(document, file=sys.stdout if args.output else sys.stderr)
+
+        # 문자열로 한 번 더 만들지 않고 파일(stdout)에 바로 직렬화
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(org_structure, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+            with open(args.output, 'w', encoding='utf-8') as f, metrics.timed('json.serialize'):
+                json.dump(document, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
             print(f"결과가 {args.output}에 저장되었습니다.")
         else:
-            print(json.dumps(org_structure, indent=2, ensure_ascii=False, cls=DateTimeEncoder))
+            with metrics.timed('json.serialize'):
+                json.dump(document, sys.stdout, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+            print()
             
     except Exception as e:
         print(f"오류 발생: {str(e)}")
         exit(1)
+    finally:
+        if args.stats:
+            metrics.print_summary()
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser, parser.parse_args())
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
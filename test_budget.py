@@ -1,9 +1,33 @@
 import argparse
 import json
+import sys
 from aws_budget import AWSBudgetReader, DateTimeEncoder
+from aws_output import NDJSONWriter, COMPRESSIONS
+from aws_metrics import get_registry
 
-def main():
-    parser = argparse.ArgumentParser(description='AWS Budgets API 테스트 스크립트')
+DESCRIPTION = 'AWS Budgets API 테스트 스크립트'
+
+def stream_budgets(reader: AWSBudgetReader, args) -> None:
+    """예산, 알림 설정, 액션을 조회되는 즉시 NDJSON 레코드로 출력합니다."""
+    with NDJSONWriter(args.output, compression=args.compress) as writer:
+        detail_name = args.budget_name
+        for budget in reader.iter_budgets(args.account_id):
+            writer.write('budget', budget, account_id=args.account_id)
+            if detail_name is None:
+                detail_name = budget.get('BudgetName')
+
+        # 예산 이름이 없으면 첫 번째 예산의 알림 설정과 액션을 출력
+        if detail_name:
+            for notification in reader.iter_budget_notifications(detail_name, args.account_id):
+                writer.write('notification', notification, account_id=args.account_id, budget_name=detail_name)
+            for action in reader.iter_budget_actions(detail_name, args.account_id):
+                writer.write('action', action, account_id=args.account_id, budget_name=detail_name)
+
+    if args.output:
+        print(f"{writer.count}개의 레코드가 {args.output}에 저장되었습니다.")
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """명령행 인자를 parser에 추가합니다. (cli.py의 하위 명령과 공유)"""
     parser.add_argument('--role-arn', required=True, help='AWS Role ARN')
     parser.add_argument('--session-name', required=True, help='Session Name for STS')
     parser.add_argument('--external-id', required=True, help='External ID for STS')
@@ -12,8 +36,21 @@ def main():
     parser.add_argument('--account-id', required=True, help='AWS 계정 ID (필수)')
     parser.add_argument('--budget-name', help='특정 예산 이름 (선택사항)')
     parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로 (지정하지 않으면 stdout으로 출력)')
-    
-    args = parser.parse_args()
+    parser.add_argument('--all-details', action='store_true', help='모든 예산의 알림 설정/구독자/액션을 한 번에 조회')
+    parser.add_argument('--format', default='json', choices=['json', 'ndjson'], help='출력 형식 (ndjson은 예산/알림/액션을 조회되는 즉시 한 줄씩 출력)')
+    parser.add_argument('--compress', default='none', choices=COMPRESSIONS, help='ndjson 출력 압축 형식 (기본값: none)')
+    parser.add_argument('--compact', action='store_true', help='예산 목록을 응답 dict 대신 __slots__ 레코드로 보관하여 메모리 사용량을 줄임 (출력 형식은 같음)')
+    parser.add_argument('--fields', help='예산 항목에 남길 키 목록 (쉼표 구분, 예: BudgetName,BudgetLimit,CalculatedSpend, 지정하면 --compact 사용)')
+    parser.add_argument('--snapshot-store', help='예산 목록(--all-details이면 상세 포함)을 변경분 스냅샷 저장소(SQLite)에 기록하고, 전체 문서 대신 이전 스냅샷 대비 변경분만 출력')
+    parser.add_argument('--snapshot-stream', help='스냅샷 스트림 이름 (기본값: budgets/<계정 ID>)')
+    parser.add_argument('--stats', action='store_true', help='종료 시 API 작업별 호출 수/지연 시간/수신 바이트 통계를 stderr로 출력')
+    parser.add_argument('--metrics-file', help='작업별 통계를 Prometheus 텍스트 형식으로 저장할 파일 경로')
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    metrics = get_registry()
+
+    if args.snapshot_store and args.format != 'json':
+        parser.error('--snapshot-store는 json 형식에서만 사용할 수 있습니다.')
 
     try:
         reader = AWSBudgetReader(
@@ -24,19 +61,37 @@ def main():
             profile_name=args.profile
         )
         
+        if args.format == 'ndjson':
+            stream_budgets(reader, args)
+            return
+
         result = {}
         
         # 1. 예산 목록 조회
         print("=== 예산 목록 조회 중... ===")
-        budgets = reader.describe_budgets(args.account_id)
+        budgets = reader.describe_budgets(
+            args.account_id,
+            compact=args.compact,
+            fields=[field.strip() for field in args.fields.split(',')] if args.fields else None,
+            # 스냅샷 저장소에 기록할 때는 조회 오류를 빈 목록(삭제)으로 기록하지 않도록 오류를 전파
+            strict=bool(args.snapshot_store)
+        )
         result['budgets'] = budgets
         print(f"총 {len(budgets)}개의 예산을 찾았습니다.")
         
         for budget in budgets:
             print(f"- {budget.get('BudgetName', 'N/A')} ({budget.get('BudgetType', 'N/A')})")
         
-        # 2. 특정 예산 상세 정보 조회 (예산 이름이 제공된 경우)
-        if args.budget_name:
+        # 2. 모든 예산의 상세 정보 일괄 조회 (--all-details)
+        if args.all_details:
+            print(f"\n=== 모든 예산의 알림 설정/구독자/액션 조회 중... ===")
+            budget_details = reader.get_all_budget_details(args.account_id, budgets=budgets)
+            result['budget_details'] = budget_details
+            for detail in budget_details:
+                print(f"- {detail['BudgetName']}: 알림 {len(detail['Notifications'])}개, 액션 {len(detail['Actions'])}개")
+
+        # 3. 특정 예산 상세 정보 조회 (예산 이름이 제공된 경우)
+        elif args.budget_name:
             print(f"\n=== 예산 '{args.budget_name}' 상세 정보 조회 중... ===")
             budget_detail = reader.describe_budget(args.budget_name, args.account_id)
             result['budget_detail'] = budget_detail
@@ -60,7 +115,7 @@ def main():
             else:
                 print(f"예산 '{args.budget_name}'을 찾을 수 없습니다.")
         
-        # 3. 첫 번째 예산의 상세 정보 조회 (예산 이름이 제공되지 않은 경우)
+        # 4. 첫 번째 예산의 상세 정보 조회 (예산 이름이 제공되지 않은 경우)
         elif budgets:
             first_budget = budgets[0]
             budget_name = first_budget.get('BudgetName')
@@ -77,18 +132,49 @@ def main():
                 print(f"알림 설정 수: {len(complete_info['notifications'])}")
                 print(f"액션 수: {len(complete_info['actions'])}")
         
+        # 스냅샷 저장소에 변경분 기록 (출력도 변경분으로 대체)
+        if args.snapshot_store:
+            from aws_snapshot_store import SnapshotStore, BUDGET_DETAIL_KINDS, BUDGET_KINDS, budget_entries, print_commit_summary
+
+            store = SnapshotStore(args.snapshot_store)
+            try:
+                with metrics.timed('snapshot.commit'):
+                    result = store.commit(
+                        args.snapshot_stream or f"budgets/{args.account_id}",
+                        budget_entries(args.account_id, budgets, result.get('budget_details')),
+                        # --all-details 없이 실행하면 이전에 기록한 상세 정보는 삭제로 기록하지 않고 유지
+                        kinds=BUDGET_DETAIL_KINDS if args.all_details else BUDGET_KINDS
+                    )
+            finally:
+                store.close()
+            print()
+            print_commit_summary(result)
+
         # 결과 출력
+        # 문자열로 한 번 더 만들지 않고 파일(stdout)에 바로 직렬화
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
+            with open(args.output, 'w', encoding='utf-8') as f, metrics.timed('json.serialize'):
                 json.dump(result, f, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
             print(f"\n결과가 {args.output}에 저장되었습니다.")
         else:
             print(f"\n=== 전체 결과 ===")
-            print(json.dumps(result, indent=2, ensure_ascii=False, cls=DateTimeEncoder))
+            with metrics.timed('json.serialize'):
+                json.dump(result, sys.stdout, indent=2, ensure_ascii=False, cls=DateTimeEncoder)
+            print()
             
     except Exception as e:
         print(f"오류 발생: {str(e)}")
         exit(1)
+    finally:
+        if args.stats:
+            metrics.print_summary()
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser, parser.parse_args())
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from aws_cost_cache import CostCache
+from aws_cost_explorer import AWSCostExplorer
+
+class StubClient:
+    """호출 수를 세고 계정 이름을 금액 단위로 넣어 응답하는 get_cost_and_usage 스텁"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.calls = 0
+
+    def get_cost_and_usage(self, TimePeriod, Granularity, Metrics, **params):
+        self.calls += 1
+        return {
+            'GroupDefinitions': [],
+            'ResultsByTime': [{
+                'TimePeriod': TimePeriod,
+                'Total': {metric: {'Amount': '1', 'Unit': self.label} for metric in Metrics},
+                'Groups': [],
+                'Estimated': False
+            }],
+            'DimensionValueAttributes': []
+        }
+
+def make_explorer(cache: CostCache, role_arn: str, external_id: str = 'ext') -> AWSCostExplorer:
+    explorer = AWSCostExplorer(role_arn=role_arn, session_name='test', external_id=external_id, cache=cache)
+    explorer.client = StubClient(role_arn.split(':')[4] + '/' + external_id)
+    return explorer
+
+class CostCacheScopeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CostCache(os.path.join(self.directory.name, 'ce_cache.sqlite3'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def fetch(self, explorer: AWSCostExplorer):
+        response = explorer.get_cost_and_usage('2024-01-01', '2024-02-01')
+        return response['ResultsByTime'][0]['Total']['UnblendedCost']['Unit']
+
+    def test_same_role_hits_cache(self):
+        first = make_explorer(self.cache, 'arn:aws:iam::111111111111:role/reader')
+        second = make_explorer(self.cache, 'arn:aws:iam::111111111111:role/reader')
+        self.assertEqual(self.fetch(first), '111111111111/ext')
+        self.assertEqual(self.fetch(second), '111111111111/ext')
+        self.assertEqual((first.client.calls, second.client.calls), (1, 0))
+
+    def test_roles_do_not_share_entries(self):
+        role_a = make_explorer(self.cache, 'arn:aws:iam::111111111111:role/reader')
+        role_b = make_explorer(self.cache, 'arn:aws:iam::222222222222:role/reader')
+        self.assertEqual(self.fetch(role_a), '111111111111/ext')
+        self.assertEqual(self.fetch(role_b), '222222222222/ext')
+        self.assertEqual((role_a.client.calls, role_b.client.calls), (1, 1))
+
+    def test_external_ids_do_not_share_entries(self):
+        trusted = make_explorer(self.cache, 'arn:aws:iam::111111111111:role/reader', external_id='ext')
+        other = make_explorer(self.cache, 'arn:aws:iam::111111111111:role/reader', external_id='wrong')
+        self.fetch(trusted)
+        self.assertEqual(self.fetch(other), '111111111111/wrong')
+        self.assertEqual(other.client.calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()
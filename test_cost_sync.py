@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from aws_cost_sync import CostSyncStore, IncrementalCostSync
+
+class StubExplorer:
+    """요청한 지표만 담은 일 단위 응답을 돌려주고 조회 구간을 기록하는 get_cost_and_usage 스텁"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_cost_and_usage(self, start_date, end_date, granularity='DAILY', metrics=['UnblendedCost'], group_by=None):
+        self.calls.append((start_date, end_date, tuple(metrics)))
+        results = []
+        day = date.fromisoformat(start_date)
+        while day < date.fromisoformat(end_date):
+            results.append({
+                'TimePeriod': {'Start': day.isoformat(), 'End': (day + timedelta(days=1)).isoformat()},
+                'Total': {metric: {'Amount': '1', 'Unit': 'USD'} for metric in metrics},
+                'Groups': [],
+                'Estimated': False
+            })
+            day += timedelta(days=1)
+        return {'ResultsByTime': results}
+
+class IncrementalCostSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CostSyncStore(os.path.join(self.directory.name, 'cost_sync.sqlite3'))
+        self.explorer = StubExplorer()
+        self.syncer = IncrementalCostSync(self.explorer, self.store, lookback_days=3)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_same_metrics_fetch_only_lookback(self):
+        self.syncer.sync('111111111111', '2024-01-01', '2024-01-11')
+        result = self.syncer.sync('111111111111', '2024-01-01', '2024-01-11')
+        self.assertEqual((result['fetched_start'], result['fetched_end']), ('2024-01-08', '2024-01-11'))
+
+    def test_changed_metrics_resync_full_range(self):
+        self.syncer.sync('111111111111', '2024-01-01', '2024-01-11', metrics=['UnblendedCost'])
+        result = self.syncer.sync('111111111111', '2024-01-01', '2024-01-11', metrics=['BlendedCost'])
+        self.assertEqual((result['fetched_start'], result['fetched_end']), ('2024-01-01', '2024-01-11'))
+
+        rows = self.store.load(result['dataset'])
+        self.assertEqual(len(rows), 10)
+        self.assertTrue(all(set(row['metrics']) == {'BlendedCost'} for row in rows))
+
+    def test_metric_order_does_not_change_dataset(self):
+        first = self.syncer.sync('111111111111', '2024-01-01', '2024-01-11', metrics=['UnblendedCost', 'BlendedCost'])
+        second = self.syncer.sync('111111111111', '2024-01-01', '2024-01-11', metrics=['BlendedCost', 'UnblendedCost'])
+        self.assertEqual(first['dataset'], second['dataset'])
+        self.assertEqual(second['fetched_start'], '2024-01-08')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+from aws_snapshot_store import SnapshotStore
+
+class SnapshotStoreOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(os.path.join(self.directory.name, 'snapshots.sqlite3'))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_backfilled_commit_is_rejected(self):
+        self.store.commit('org/1', [('account:1', 'account', 'r-1', {'Id': '1', 'Name': 'a'})], taken_at=200.0)
+        with self.assertRaises(ValueError):
+            self.store.commit('org/1', [('account:1', 'account', 'r-1', {'Id': '1', 'Name': 'b'})], taken_at=100.0)
+        self.assertEqual(len(self.store.snapshots('org/1')), 1)
+        self.assertIsNone(self.store.resolve('org/1', at=150.0))
+
+    def test_view_at_time_follows_commit_order(self):
+        first = self.store.commit('org/1', [('account:1', 'account', 'r-1', {'Id': '1', 'Name': 'a'})], taken_at=100.0)
+        self.store.commit('org/1', [('account:1', 'account', 'r-1', {'Id': '1', 'Name': 'b'})], taken_at=200.0)
+        self.assertEqual(self.store.resolve('org/1', at=150.0), first['snapshot_id'])
+        self.assertEqual(self.store.view('org/1', at=150.0)[0][3]['Name'], 'a')
+        # 다른 스트림의 시각과는 무관
+        self.store.commit('budgets/1', [], taken_at=50.0)
+
+if __name__ == '__main__':
+    unittest.main()